@@ -45,6 +45,7 @@ export default defineConfig({
           },
           { text: 'Incremental Loading', link: '/guides/incremental-loading' },
           { text: 'Observability', link: '/guides/observability' },
+          { text: 'Benchmarks', link: '/guides/benchmarks' },
         ]
       },
       {
@@ -71,6 +72,7 @@ export default defineConfig({
             ]
           },
           { text: '/ferry/{id}/observe', link: '/apis/observe' },
+          { text: '/metrics', link: '/apis/metrics' },
         ]
       },
       { text: 'gRPC', link: '/gRPC/getting-started' },
@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Optional
+from typing import List, Optional
 import typer
 import uvicorn
 import yaml
@@ -9,9 +9,10 @@ from rich.theme import Theme
 from rich.panel import Panel
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from ferry.src.data_models.ingest_model import IngestModel, ResourceConfig
+from ferry.src.benchmark_pairs import BENCHMARK_PAIRS, DEFAULT_BASELINE_PATH
+from ferry.src.data_models.ingest_model import IngestModel, ResourceConfig, RunMode
+from ferry.src.data_models.profile_config_model import ProfileConfig, Profiler
 from ferry.src.data_models.response_models import LoadStatus
-from ferry.src.pipeline_builder import PipelineBuilder
 from ferry.src.security import SecretsManager
 import subprocess
 import sys
@@ -40,16 +41,46 @@ app.add_typer(show_app, name="show", help="Show-related commands")
 SECURE_MODE = False
 
 
+def set_scheduler_env(max_workers: int, destination_limits: List[str]) -> None:
+    """Passes run scheduler limits to the server process through the environment."""
+    from ferry.src.run_scheduler import parse_destination_limits
+
+    limits = ",".join(destination_limits)
+    parse_destination_limits(limits)
+    os.environ["FERRY_MAX_WORKERS"] = str(max_workers)
+    os.environ["FERRY_DESTINATION_LIMITS"] = limits
+
+
+def set_pool_env(pool_ttl: float, pool_max_size: int) -> None:
+    """Passes connection pool limits to the server process through the environment."""
+    os.environ["FERRY_POOL_TTL"] = str(pool_ttl)
+    os.environ["FERRY_POOL_MAX_SIZE"] = str(pool_max_size)
+
+
 @app.command()
 def serve(
     host: str = typer.Option("0.0.0.0", help="Host to run the server on"),
     port: int = typer.Option(8001, help="Port to run the server on"),
     reload: bool = typer.Option(True, help="Enable auto-reload for development"),
     secure: bool = typer.Option(False, help="Enable HMAC authentication"),
+    max_workers: int = typer.Option(4, min=1, help="Number of pipelines run at the same time"),
+    max_queued: int = typer.Option(1000, min=1, help="Number of ingest jobs allowed to wait"),
+    destination_limit: List[str] = typer.Option(
+        [], help="Concurrent runs allowed per destination, e.g. snowflake=4. Repeatable"
+    ),
+    pool_ttl: float = typer.Option(
+        300, min=0, help="Seconds an unused source connection stays open for later runs"
+    ),
+    pool_max_size: int = typer.Option(
+        32, min=0, help="Number of unused source connections kept open for later runs"
+    ),
 ):
     """Start the FastAPI server for Ferry"""
     global SECURE_MODE
     SECURE_MODE = secure
+    set_scheduler_env(max_workers, destination_limit)
+    set_pool_env(pool_ttl, pool_max_size)
+    os.environ["FERRY_MAX_QUEUED"] = str(max_queued)
 
     title = "[header]Ferry Server[/header]"
     if secure:
@@ -85,15 +116,43 @@ def serve(
 def serve_grpc(
     port: int = typer.Option(50051, help="Port to run the gRPC server on"),
     secure: bool = typer.Option(False, help="Enable HMAC authentication for gRPC"),
+    max_workers: int = typer.Option(4, min=1, help="Number of pipelines run at the same time"),
+    destination_limit: List[str] = typer.Option(
+        [], help="Concurrent runs allowed per destination, e.g. snowflake=4. Repeatable"
+    ),
+    pool_ttl: float = typer.Option(
+        300, min=0, help="Seconds an unused source connection stays open for later runs"
+    ),
+    pool_max_size: int = typer.Option(
+        32, min=0, help="Number of unused source connections kept open for later runs"
+    ),
+    threads: int = typer.Option(64, min=1, help="Number of gRPC calls served at the same time"),
+    async_mode: bool = typer.Option(False, help="Serve with the asyncio based grpc.aio server"),
+    metrics_port: Optional[int] = typer.Option(
+        None, help="Serve Prometheus metrics over HTTP on this port"
+    ),
 ):
     """Start the gRPC server for Ferry"""
+    set_scheduler_env(max_workers, destination_limit)
+    set_pool_env(pool_ttl, pool_max_size)
 
     # Use the current Python interpreter to ensure virtual environment compatibility
     python_executable = sys.executable
-    cmd = [python_executable, "ferry/src/grpc/grpc_server.py", "--port", str(port)]
+    cmd = [
+        python_executable,
+        "ferry/src/grpc/grpc_server.py",
+        "--port",
+        str(port),
+        "--threads",
+        str(threads),
+    ]
 
     if secure:
         cmd.append("--secure")
+    if async_mode:
+        cmd.append("--async-mode")
+    if metrics_port:
+        cmd.extend(["--metrics-port", str(metrics_port)])
 
     typer.echo(
         f"Starting Ferry gRPC server on port {port} {'with HMAC authentication' if secure else ''}"
@@ -178,8 +237,28 @@ def ingest(
     resources_json: Optional[str] = typer.Option(
         None, "--resources-json", help="JSON string containing the resources array"
     ),
+    run_mode: RunMode = typer.Option(
+        RunMode.SHARED_SOURCE.value,
+        "--run-mode",
+        help="Build one source for all resources or one source per resource",
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Time the run per step and resource and write a report"
+    ),
+    profiler: Optional[Profiler] = typer.Option(
+        None, "--profiler", help="Also profile the resources with cprofile or pyinstrument"
+    ),
+    continuous: bool = typer.Option(
+        False,
+        "--continuous",
+        help="Load Kafka topics in micro-batches until interrupted",
+    ),
 ):
     """Run data ingestion between source and destination databases"""
+    # Imported here so commands that never run a pipeline start without loading dlt
+    from ferry.src.pipeline_builder import PipelineBuilder
+    from ferry.src.run_scheduler import get_run_scheduler
+
     try:
         if not resources_file and not resources_json:
             console.print(
@@ -206,6 +285,9 @@ def ingest(
             destination_uri=destination_uri,
             dataset_name=dataset_name,
             resources=resources,
+            run_mode=run_mode,
+            profile=ProfileConfig(profiler=profiler) if profile or profiler else None,
+            continuous=continuous,
         )
 
         with Progress(
@@ -217,8 +299,9 @@ def ingest(
                 description=f"[info]Starting ingestion with identity: {identity}", total=None
             )
 
-            pipeline = PipelineBuilder(ingest_model).build()
-            pipeline.run()
+            with get_run_scheduler().run_slot(ingest_model):
+                pipeline = PipelineBuilder(ingest_model).build()
+                pipeline.run()
 
         schema_version_hash = None
         pipeline_schema_path = os.path.join(".schemas", f"{ingest_model.identity}.schema.yaml")
@@ -237,6 +320,8 @@ def ingest(
             "pipeline_name": pipeline.get_name(),
             "schema_version_hash": schema_version_hash,
         }
+        if pipeline.profile_report_path:
+            response["profile_report"] = pipeline.profile_report_path
 
         console.print(
             Panel(
@@ -271,6 +356,86 @@ def ingest(
         raise typer.Exit(1)
 
 
+@app.command()
+def bench(
+    pair: List[str] = typer.Option(
+        list(BENCHMARK_PAIRS),
+        "--pair",
+        help=f"Source-destination pair to run, one of {', '.join(BENCHMARK_PAIRS)}. Repeatable",
+    ),
+    rows: int = typer.Option(100000, min=1, help="Rows in the synthetic dataset"),
+    columns: int = typer.Option(10, min=1, help="Columns in the synthetic dataset"),
+    baseline: str = typer.Option(DEFAULT_BASELINE_PATH, help="Baseline file to compare with"),
+    save_baseline: bool = typer.Option(False, help="Store the results as the new baseline"),
+    tolerance: float = typer.Option(
+        10.0, min=0, help="Percent of rows/s a pair may lose before it counts as a regression"
+    ),
+):
+    """Benchmark throughput of local source and destination pairs"""
+    from ferry.src.benchmark import (
+        compare_to_baseline,
+        load_baseline,
+        run_benchmarks,
+        store_baseline,
+    )
+
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            transient=True,
+        ) as progress:
+            progress.add_task(
+                description=f"[info]Benchmarking {len(pair)} pairs with {rows} rows", total=None
+            )
+            results = run_benchmarks(pair, rows, columns)
+    except Exception as e:
+        console.print(
+            Panel(
+                f"[danger]Error: {str(e)}",
+                title="[header]Benchmark Failed[/header]",
+                border_style="danger",
+            )
+        )
+        raise typer.Exit(1)
+
+    stored = load_baseline(baseline) if os.path.exists(baseline) else []
+    comparisons = compare_to_baseline(results, stored, tolerance)
+
+    table = Table(title=f"[header]Benchmark {rows} rows x {columns} columns[/header]")
+    table.add_column("Pair", style="highlight", no_wrap=True)
+    for column in ("Rows/s", "MB/s", "Peak MB", "Extract s", "Normalize s", "Load s"):
+        table.add_column(column, style="info", justify="right")
+    table.add_column("Change", justify="right")
+    for comparison in comparisons:
+        result = comparison.result
+        if comparison.change_percent is None:
+            change = "-"
+        else:
+            style = "danger" if comparison.regressed else "success"
+            change = f"[{style}]{comparison.change_percent:+.1f}%[/{style}]"
+        table.add_row(
+            result.pair,
+            f"{result.rows_per_second:,.0f}",
+            f"{result.mb_per_second:.2f}",
+            "-" if result.peak_rss_mb is None else f"{result.peak_rss_mb:.0f}",
+            *(f"{result.steps.get(step, 0):.2f}" for step in ("extract", "normalize", "load")),
+            change,
+        )
+    console.print(table)
+
+    if save_baseline:
+        store_baseline(results, baseline)
+        console.print(f"[success]Baseline stored in {baseline}[/success]")
+
+    regressed = [c.result.pair for c in comparisons if c.regressed]
+    if regressed:
+        console.print(
+            f"[danger]Slower than the baseline by more than {tolerance}%: {', '.join(regressed)}"
+        )
+        raise typer.Exit(1)
+
+
 @app.command()
 def version():
     """Display the Ferry version"""
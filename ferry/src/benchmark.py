@@ -0,0 +1,193 @@
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from ferry.src.benchmark_pairs import BENCHMARK_PAIRS
+from ferry.src.data_models.benchmark_model import BenchmarkComparison, BenchmarkResult
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_TABLE = "bench"
+
+FILE_EXTENSIONS = {"sqlite": "db", "duckdb": "duckdb"}
+
+
+# Columns cycle through these types, valued from the row number x
+COLUMN_TYPES = (("BIGINT", "x * {n}"), ("DOUBLE", "x / {n}.0"), ("TEXT", "'value_' || x"))
+
+
+def create_dataset(kind: str, path: str, rows: int, columns: int) -> None:
+    """Writes a synthetic table of `rows` rows and `columns` columns besides the id."""
+    column_types = [COLUMN_TYPES[i % len(COLUMN_TYPES)] for i in range(columns)]
+    create = ", ".join(
+        ["id BIGINT"] + [f"col_{i} {sql_type}" for i, (sql_type, _) in enumerate(column_types)]
+    )
+    select = ", ".join(["x"] + [value.format(n=i + 1) for i, (_, value) in enumerate(column_types)])
+    if kind == "sqlite":
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute(f"CREATE TABLE {BENCHMARK_TABLE} ({create})")
+            conn.execute(
+                f"INSERT INTO {BENCHMARK_TABLE} WITH RECURSIVE seq(x) AS "
+                f"(SELECT 0 UNION ALL SELECT x + 1 FROM seq WHERE x < {rows - 1}) "
+                f"SELECT {select} FROM seq"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    elif kind == "duckdb":
+        import duckdb
+
+        with duckdb.connect(path) as conn:
+            conn.execute(f"CREATE TABLE {BENCHMARK_TABLE} ({create})")
+            conn.execute(
+                f"INSERT INTO {BENCHMARK_TABLE} "
+                f"SELECT {select} FROM (SELECT range AS x FROM range({rows}))"
+            )
+    else:
+        raise ValueError(f"Unsupported benchmark database: {kind}")
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(pair: str, rows: int, columns: int, source_uri: str, destination_uri: str) -> dict:
+    """Runs one case through PipelineBuilder and measures it from the dlt trace."""
+    from ferry.src.data_models.ingest_model import IngestModel, ResourceConfig
+    from ferry.src.pipeline_builder import PipelineBuilder
+    from ferry.src.progress_tracker import TRACKED_STEPS, step_tables
+
+    model = IngestModel(
+        identity=f"bench_{pair.replace('-', '_')}",
+        source_uri=source_uri,
+        destination_uri=destination_uri,
+        resources=[ResourceConfig(source_table_name=BENCHMARK_TABLE)],
+    )
+    builder = PipelineBuilder(model).build()
+    builder.run()
+
+    trace = builder.pipeline.last_trace
+    steps = {}
+    written = 0
+    for step in trace.steps:
+        if step.step not in TRACKED_STEPS:
+            continue
+        steps[step.step] = round((step.finished_at - step.started_at).total_seconds(), 3)
+        if step.step == "normalize":
+            written = sum(t.bytes or 0 for t in step_tables("normalize", step.step_info, 0, {}))
+    seconds = (trace.finished_at - trace.started_at).total_seconds()
+    return BenchmarkResult(
+        pair=pair,
+        rows=rows,
+        columns=columns,
+        seconds=round(seconds, 3),
+        rows_per_second=round(rows / seconds, 1),
+        mb_per_second=round(written / seconds / 1_000_000, 2),
+        peak_rss_mb=_peak_rss_mb(),
+        steps=steps,
+    ).model_dump()
+
+
+def _run_isolated(work_dir: str, *args) -> dict:
+    """Runs a case in a fresh process so peak memory and imports are not shared."""
+    # Keeps telemetry requests out of the measurements
+    os.environ["RUNTIME__DLTHUB_TELEMETRY"] = "false"
+    os.environ["DLT_DATA_DIR"] = os.path.join(work_dir, "dlt")
+    os.chdir(work_dir)
+    return run_case(*args)
+
+
+def run_benchmarks(
+    pairs: List[str], rows: int, columns: int, work_dir: Optional[str] = None
+) -> List[BenchmarkResult]:
+    """Runs every pair on a freshly generated dataset and returns the results in order."""
+    unknown = [pair for pair in pairs if pair not in BENCHMARK_PAIRS]
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmark pairs: {', '.join(unknown)}. "
+            f"Choose from {', '.join(BENCHMARK_PAIRS)}"
+        )
+    if rows < 1 or columns < 1:
+        raise ValueError("Benchmarks need at least one row and one column")
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        sources = {}
+        results = []
+        for pair in pairs:
+            source_kind, destination_kind = BENCHMARK_PAIRS[pair]
+            if source_kind not in sources:
+                path = os.path.join(tmp, f"source.{FILE_EXTENSIONS[source_kind]}")
+                create_dataset(source_kind, path, rows, columns)
+                sources[source_kind] = f"{source_kind}:///{path}"
+            case_dir = os.path.join(tmp, pair)
+            os.makedirs(case_dir)
+            destination_uri = (
+                f"{destination_kind}:///"
+                f"{os.path.join(case_dir, f'destination.{FILE_EXTENSIONS[destination_kind]}')}"
+            )
+            logger.info(f"Benchmarking {pair} with {rows} rows and {columns} columns")
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                result = executor.submit(
+                    _run_isolated,
+                    case_dir,
+                    pair,
+                    rows,
+                    columns,
+                    sources[source_kind],
+                    destination_uri,
+                ).result()
+            results.append(BenchmarkResult(**result))
+        return results
+
+
+def load_baseline(path: str) -> List[BenchmarkResult]:
+    with open(path) as f:
+        return [BenchmarkResult(**result) for result in json.load(f)]
+
+
+def store_baseline(results: List[BenchmarkResult], path: str) -> None:
+    """Stores results as the baseline, replacing earlier results of the same cases."""
+    baseline = (
+        {result.key(): result for result in load_baseline(path)} if os.path.exists(path) else {}
+    )
+    baseline.update({result.key(): result for result in results})
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump([result.model_dump() for result in baseline.values()], f, indent=2)
+
+
+def compare_to_baseline(
+    results: List[BenchmarkResult], baseline: List[BenchmarkResult], tolerance: float
+) -> List[BenchmarkComparison]:
+    """Flags results whose rows per second dropped more than `tolerance` percent."""
+    stored = {result.key(): result for result in baseline}
+    comparisons = []
+    for result in results:
+        previous = stored.get(result.key())
+        if previous is None or not previous.rows_per_second:
+            comparisons.append(BenchmarkComparison(result=result, baseline=previous))
+            continue
+        change = (result.rows_per_second / previous.rows_per_second - 1) * 100
+        comparisons.append(
+            BenchmarkComparison(
+                result=result,
+                baseline=previous,
+                change_percent=round(change, 1),
+                regressed=change < -tolerance,
+            )
+        )
+    return comparisons
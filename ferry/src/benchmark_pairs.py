@@ -0,0 +1,13 @@
+import os
+from typing import Dict, Tuple
+
+# Kept apart from the benchmark runner so the CLI reads them without importing it
+DEFAULT_BASELINE_PATH = os.path.join(".benchmarks", "baseline.json")
+
+# pair: (source kind, destination kind)
+BENCHMARK_PAIRS: Dict[str, Tuple[str, str]] = {
+    "sqlite-duckdb": ("sqlite", "duckdb"),
+    "sqlite-sqlite": ("sqlite", "sqlite"),
+    "duckdb-duckdb": ("duckdb", "duckdb"),
+    "duckdb-sqlite": ("duckdb", "sqlite"),
+}
@@ -0,0 +1,200 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_SIZE = 32
+
+Closer = Optional[Callable[[Any], None]]
+
+
+class _Entry:
+    def __init__(self, key: Hashable, resource: Any, close: Closer, shared: bool):
+        self.key = key
+        self.resource = resource
+        self.close = close
+        self.shared = shared
+        self.leases = 0
+        self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """Keeps engines, clients and consumers open across the pipeline runs of a server.
+
+    Entries are keyed by the caller, from the kind of connection and its URI. Shared entries,
+    such as SQLAlchemy engines and Mongo clients, are handed to every run asking for their key.
+    Exclusive entries, such as Kafka consumers, are leased to one run at a time. Entries idle
+    for longer than ttl_seconds are closed, as are the least recently used idle entries once
+    more than max_size are idle.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_size: Optional[int] = None):
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else float(os.getenv("FERRY_POOL_TTL", DEFAULT_TTL_SECONDS))
+        )
+        self.max_size = (
+            max_size
+            if max_size is not None
+            else int(os.getenv("FERRY_POOL_MAX_SIZE", DEFAULT_MAX_SIZE))
+        )
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, List[_Entry]] = {}
+        self._by_resource: Dict[int, _Entry] = {}
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._by_resource)
+
+    @property
+    def idle(self) -> int:
+        return sum(1 for entry in list(self._by_resource.values()) if entry.leases == 0)
+
+    def acquire(
+        self, key: Hashable, create: Callable[[], Any], close: Closer = None, shared: bool = True
+    ) -> Any:
+        """Returns the pooled resource of key, creating it with create() if none is free."""
+        with self._lock:
+            expired = self._evict(time.monotonic())
+            for entry in self._entries.get(key, []):
+                if entry.shared or entry.leases == 0:
+                    entry.leases += 1
+                    entry.last_used = time.monotonic()
+                    self.hits += 1
+                    break
+            else:
+                entry = None
+                self.misses += 1
+        self._close(expired)
+        if entry:
+            return entry.resource
+
+        # Connecting can take seconds, other runs may use the pool meanwhile
+        resource = create()
+        entry = _Entry(key, resource, close, shared)
+        entry.leases = 1
+        with self._lock:
+            if not self._closed:
+                self._entries.setdefault(key, []).append(entry)
+                self._by_resource[id(resource)] = entry
+        return resource
+
+    def release(self, resource: Any) -> bool:
+        """Hands a resource back to the pool, returns False if it was not pooled."""
+        with self._lock:
+            entry = self._by_resource.get(id(resource))
+            if entry is None or entry.resource is not resource:
+                return False
+            entry.leases = max(entry.leases - 1, 0)
+            entry.last_used = time.monotonic()
+            if self._closed and entry.leases == 0:
+                self._remove(entry)
+                expired = [entry]
+            else:
+                expired = self._evict(entry.last_used)
+        self._close(expired)
+        return True
+
+    def prune(self) -> None:
+        """Closes the entries that stayed idle for longer than the TTL."""
+        with self._lock:
+            expired = self._evict(time.monotonic())
+        self._close(expired)
+
+    def close(self) -> None:
+        """Closes idle entries now and leased ones once released. The pool keeps nothing new."""
+        with self._lock:
+            self._closed = True
+            idle = [entry for entry in self._by_resource.values() if entry.leases == 0]
+            for entry in idle:
+                self._remove(entry)
+        self._close(idle)
+
+    def _evict(self, now: float) -> List[_Entry]:
+        idle = [entry for entry in self._by_resource.values() if entry.leases == 0]
+        evicted = [entry for entry in idle if now - entry.last_used > self.ttl_seconds]
+        remaining = sorted(
+            (entry for entry in idle if entry not in evicted), key=lambda entry: entry.last_used
+        )
+        evicted.extend(remaining[: max(len(remaining) - self.max_size, 0)])
+        for entry in evicted:
+            self._remove(entry)
+        return evicted
+
+    def _remove(self, entry: _Entry) -> None:
+        self._by_resource.pop(id(entry.resource), None)
+        entries = self._entries.get(entry.key, [])
+        if entry in entries:
+            entries.remove(entry)
+        if not entries:
+            self._entries.pop(entry.key, None)
+
+    def _close(self, entries: List[_Entry]) -> None:
+        for entry in entries:
+            if entry.close is None:
+                continue
+            try:
+                entry.close(entry.resource)
+            except Exception as e:
+                logger.warning(f"Failed to close pooled {type(entry.resource).__name__}: {e}")
+
+
+class ConnectionLeases:
+    """The connections one pipeline run holds, handed back when the run ends.
+
+    Without a pool every connection is created for the run and closed on release.
+    """
+
+    def __init__(self, pool: Optional[ConnectionPool] = None):
+        self.pool = pool
+        self._lock = threading.Lock()
+        self._resources: List[Tuple[Any, Closer]] = []
+
+    @property
+    def pooled(self) -> bool:
+        return self.pool is not None
+
+    def acquire(
+        self, key: Hashable, create: Callable[[], Any], close: Closer = None, shared: bool = True
+    ) -> Any:
+        if self.pool:
+            resource = self.pool.acquire(key, create, close, shared)
+        else:
+            resource = create()
+        with self._lock:
+            self._resources.append((resource, close))
+        return resource
+
+    def release(self, resource: Any) -> None:
+        """Releases a connection before the run ends, e.g. when its reader is exhausted."""
+        with self._lock:
+            for i, (held, close) in enumerate(self._resources):
+                if held is resource:
+                    del self._resources[i]
+                    break
+            else:
+                return
+        self._release(resource, close)
+
+    def release_all(self) -> None:
+        with self._lock:
+            resources, self._resources = self._resources, []
+        for resource, close in reversed(resources):
+            self._release(resource, close)
+
+    def _release(self, resource: Any, close: Closer) -> None:
+        if self.pool and self.pool.release(resource):
+            return
+        if close:
+            try:
+                close(resource)
+            except Exception as e:
+                logger.warning(f"Failed to close {type(resource).__name__}: {e}")
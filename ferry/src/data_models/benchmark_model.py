@@ -0,0 +1,35 @@
+from typing import Dict, Optional
+from pydantic import BaseModel, Field
+
+
+class BenchmarkResult(BaseModel):
+    """Throughput of one synthetic dataset moved between a source and a destination"""
+
+    pair: str = Field(..., description="Source and destination kinds, e.g. sqlite-duckdb")
+    rows: int = Field(..., description="Rows in the synthetic dataset")
+    columns: int = Field(..., description="Columns in the synthetic dataset besides the id")
+    seconds: float = Field(..., description="Wall time of the pipeline run")
+    rows_per_second: float = Field(..., description="Rows moved per second")
+    mb_per_second: float = Field(..., description="Megabytes written by normalize per second")
+    peak_rss_mb: Optional[float] = Field(
+        None, description="Peak resident memory of the run, not available on Windows"
+    )
+    steps: Dict[str, float] = Field(
+        default_factory=dict, description="Seconds spent in extract, normalize and load"
+    )
+
+    def key(self) -> str:
+        return f"{self.pair}:{self.rows}x{self.columns}"
+
+
+class BenchmarkComparison(BaseModel):
+    """A benchmark result compared with the stored baseline of the same case"""
+
+    result: BenchmarkResult = Field(..., description="Result of this run")
+    baseline: Optional[BenchmarkResult] = Field(
+        None, description="Baseline of the same pair and size, if one was stored"
+    )
+    change_percent: Optional[float] = Field(
+        None, description="Change in rows per second relative to the baseline"
+    )
+    regressed: bool = Field(False, description="Slower than the baseline beyond the tolerance")
@@ -5,6 +5,9 @@ from typing import Dict
 
 from ferry.src.data_models.incremental_config_model import IncrementalConfig
 from ferry.src.data_models.merge_config_model import MergeStrategy
+from ferry.src.data_models.partition_config_model import PartitionConfig
+from ferry.src.data_models.performance_config_model import PerformanceConfig
+from ferry.src.data_models.profile_config_model import ProfileConfig
 from ferry.src.data_models.replace_config_model import ReplaceStrategy
 from ferry.src.uri_validator import URIValidator
 
@@ -20,6 +23,23 @@ class SortOrder(Enum):
     DESC = "desc"
 
 
+class TableBackend(str, Enum):
+    SQLALCHEMY = "sqlalchemy"
+    PYARROW = "pyarrow"
+    PANDAS = "pandas"
+    CONNECTORX = "connectorx"
+
+
+class DataItemFormat(str, Enum):
+    OBJECT = "object"
+    ARROW = "arrow"
+
+
+class RunMode(str, Enum):
+    SHARED_SOURCE = "shared_source"
+    PER_RESOURCE = "per_resource"
+
+
 class WriteDispositionConfig(BaseModel):
     """Configuration and strategy details for different write dispositions."""
 
@@ -68,6 +88,43 @@ class SourceOptions(BaseModel):
         None,
         description='Where to start consuming messages from. Options: "earliest", "latest", or "timestamp:<epoch_ms>".',
     )
+    backend: Optional[TableBackend] = Field(
+        None,
+        description="Backend used to read SQL tables. sqlalchemy yields rows, pyarrow and connectorx yield Arrow tables, pandas yields data frames.",
+    )
+    chunk_size: Optional[int] = Field(
+        None, ge=1, description="Number of rows fetched and yielded per chunk when reading SQL tables."
+    )
+    stream_results: Optional[bool] = Field(
+        None,
+        description="Read SQL tables through a server-side cursor so only one chunk is held in memory. Enabled by default, disable for connection poolers that reject server-side cursors.",
+    )
+    partition: Optional[PartitionConfig] = Field(
+        None, description="Split a SQL table into key ranges read concurrently."
+    )
+    data_item_format: Optional[DataItemFormat] = Field(
+        None,
+        description="Format of the batches read from Kafka topics. object yields lists of rows, arrow yields Arrow tables.",
+    )
+    consumers: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Number of consumers reading the partitions of a Kafka topic in parallel, each on its own thread.",
+    )
+    stop_at_end: Optional[bool] = Field(
+        None,
+        description="Stop reading a Kafka topic at the end offsets its partitions had when the run started. Enabled unless the pipeline runs continuously.",
+    )
+    max_messages: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Max number of messages read from a Kafka topic per run, or per micro-batch of a continuous pipeline.",
+    )
+    max_duration: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Max seconds spent reading a Kafka topic per run, or per micro-batch of a continuous pipeline.",
+    )
 
     @model_validator(mode="after")
     def validate_start_from(self) -> "SourceOptions":
@@ -102,7 +159,7 @@ class ResourceConfig(BaseModel):
         None, description="Write disposition type and configuration for multiple strategies."
     )
     source_options: Optional[SourceOptions] = Field(
-        None, description="Optional Kafka source read config"
+        None, description="Optional source read config"
     )
 
     @field_validator("source_table_name")
@@ -139,6 +196,11 @@ class ResourceConfig(BaseModel):
         else:
             return WriteDispositionType.REPLACE.value
 
+    def get_write_disposition_type(self) -> WriteDispositionType:
+        if self.write_disposition_config is None:
+            return WriteDispositionType.REPLACE
+        return self.write_disposition_config.type
+
     def get_destination_table_name(self) -> str:
         if self.destination_table_name is None:
             return self.source_table_name
@@ -153,6 +215,20 @@ class IngestModel(BaseModel):
     destination_uri: str = Field(..., description="URI of the destination database")
     dataset_name: Optional[str] = Field(None, description="Name of the dataset")
     resources: List[ResourceConfig] = Field(..., description="List of resources to ingest")
+    run_mode: RunMode = Field(
+        RunMode.SHARED_SOURCE,
+        description="Build one source holding all resources or one source per resource",
+    )
+    performance: Optional[PerformanceConfig] = Field(
+        None, description="Extract, normalize and load worker and buffer settings"
+    )
+    profile: Optional[ProfileConfig] = Field(
+        None, description="Time the run per step and resource, reported next to the pipeline"
+    )
+    continuous: bool = Field(
+        False,
+        description="Repeat the run as micro-batches until stopped, each loaded as its own package",
+    )
 
     @field_validator("source_uri", "destination_uri")
     @classmethod
@@ -175,6 +251,24 @@ class IngestModel(BaseModel):
             raise ValueError("At least one resource must be provided")
         return v
 
+    @model_validator(mode="after")
+    def validate_continuous(self) -> "IngestModel":
+        if self.continuous and not self.source_uri.lower().startswith("kafka://"):
+            raise ValueError("Only Kafka sources can run continuously")
+        if self.continuous:
+            # Replace resets the stored offsets, so every micro-batch would re-read the topic
+            replaced = [
+                resource.source_table_name
+                for resource in self.resources
+                if resource.get_write_disposition_type() == WriteDispositionType.REPLACE
+            ]
+            if replaced:
+                raise ValueError(
+                    "Continuous runs need the append or merge write disposition, "
+                    f"not replace: {', '.join(replaced)}"
+                )
+        return self
+
     def get_dataset_name(self, default_schema_name: str) -> str:
         return (
             getattr(self.dataset_name, "dataset_name", self.dataset_name)
@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 from pydantic import BaseModel, Field, field_validator, model_validator
-from dlt.common.typing import TColumnNames
-from dlt.common.schema.typing import TTableSchemaColumns
+
+if TYPE_CHECKING:
+    from dlt.common.typing import TColumnNames
+    from dlt.common.schema.typing import TTableSchemaColumns
 
 class SortOrder(Enum):
     ASC = "asc"
@@ -126,7 +128,7 @@ class MergeConfig(BaseModel):
                 merge_key = self.scd2_config.partition_merge_key  
         return merge_key if merge_key is not None else []
     
-    def build_columns(self) -> TTableSchemaColumns:
+    def build_columns(self) -> "TTableSchemaColumns":
         columns: TTableSchemaColumns = {}
         if self.strategy == MergeStrategy.DELETE_INSERT:
             if self.delete_insert_config.hard_delete_column:
@@ -0,0 +1,35 @@
+from typing import List, Optional, Union
+from pydantic import BaseModel, Field, model_validator
+
+
+class PartitionConfig(BaseModel):
+    """Splits a SQL table into key ranges that are read concurrently"""
+
+    column: str = Field(..., description="Column used to split the table into ranges")
+    partitions: Optional[int] = Field(
+        None,
+        ge=2,
+        description="Number of equal ranges between the minimum and maximum value of the column",
+    )
+    bounds: Optional[List[Union[int, float, str]]] = Field(
+        None,
+        min_length=1,
+        description="Explicit ascending split points. N bounds produce N + 1 ranges",
+    )
+    max_workers: Optional[int] = Field(
+        None, ge=1, description="Number of ranges read at the same time. Defaults to all ranges"
+    )
+
+    @model_validator(mode="after")
+    def validate_ranges(self) -> "PartitionConfig":
+        if (self.partitions is None) == (self.bounds is None):
+            raise ValueError("Exactly one of 'partitions' or 'bounds' must be provided")
+        if self.bounds:
+            if len({isinstance(bound, str) for bound in self.bounds}) > 1:
+                raise ValueError("All 'bounds' must be of the same type")
+            # String bounds are ordered once converted to the type of the column
+            if not isinstance(self.bounds[0], str) and not all(
+                a < b for a, b in zip(self.bounds, self.bounds[1:])
+            ):
+                raise ValueError("'bounds' must be strictly ascending")
+        return self
@@ -0,0 +1,36 @@
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+
+class PerformanceConfig(BaseModel):
+    """Worker and buffer settings applied to a single pipeline run"""
+
+    extract_workers: Optional[int] = Field(
+        None, ge=1, description="Number of threads used to extract parallelized resources"
+    )
+    normalize_workers: Optional[int] = Field(
+        None, ge=1, description="Size of the process pool used to normalize extracted files"
+    )
+    load_workers: Optional[int] = Field(
+        None, ge=1, description="Number of load jobs executed concurrently against the destination"
+    )
+    file_max_items: Optional[int] = Field(
+        None, ge=1, description="Rotate intermediary files after this many items"
+    )
+    file_max_bytes: Optional[int] = Field(
+        None, ge=1, description="Rotate intermediary files after this many bytes"
+    )
+    buffer_max_items: Optional[int] = Field(
+        None, ge=1, description="Number of items buffered in memory before writing to a file"
+    )
+
+    def build_config(self) -> Dict[str, Any]:
+        """Maps the settings to dlt config keys. Unset settings map to None so dlt defaults apply."""
+        return {
+            "extract.workers": self.extract_workers,
+            "normalize.workers": self.normalize_workers,
+            "load.workers": self.load_workers,
+            "data_writer.file_max_items": self.file_max_items,
+            "data_writer.file_max_bytes": self.file_max_bytes,
+            "data_writer.buffer_max_items": self.buffer_max_items,
+        }
@@ -0,0 +1,28 @@
+import importlib.util
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+
+
+class Profiler(str, Enum):
+    CPROFILE = "cprofile"
+    PYINSTRUMENT = "pyinstrument"
+
+
+class ProfileConfig(BaseModel):
+    """Opt-in timing of a pipeline run per dlt step and per resource"""
+
+    profiler: Optional[Profiler] = Field(
+        None,
+        description="Also profile the resource generators with cprofile or pyinstrument. "
+        "Resources are then read one after another so the profiler sees all of them",
+    )
+
+    @field_validator("profiler")
+    @classmethod
+    def validate_profiler_installed(cls, v: Optional[Profiler]) -> Optional[Profiler]:
+        if v == Profiler.PYINSTRUMENT and importlib.util.find_spec("pyinstrument") is None:
+            raise ValueError(
+                "pyinstrument is not installed, install it with 'pip install pyinstrument'"
+            )
+        return v
@@ -0,0 +1,42 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class StepProfile(BaseModel):
+    """Time spent in a dlt step"""
+
+    wall_seconds: float = Field(0.0, description="Elapsed time of the step")
+    cpu_seconds: float = Field(
+        0.0, description="CPU time of this process, worker processes of normalize are not included"
+    )
+
+
+class ResourceProfile(BaseModel):
+    """Time spent producing the items of a resource during extract"""
+
+    items: int = Field(0, description="Items yielded, a row or a batch of rows")
+    rows: int = Field(0, description="Rows yielded")
+    read_wall_seconds: float = Field(0.0, description="Elapsed time reading from the source")
+    read_cpu_seconds: float = Field(0.0, description="CPU time reading from the source")
+    transform_wall_seconds: float = Field(
+        0.0, description="Elapsed time applying column rules and building items"
+    )
+    transform_cpu_seconds: float = Field(
+        0.0, description="CPU time applying column rules and building items"
+    )
+
+
+class ProfileReport(BaseModel):
+    """Timings of a pipeline run, written next to the pipeline when profiling is enabled"""
+
+    pipeline_name: str = Field(..., description="Name of the pipeline")
+    wall_seconds: float = Field(0.0, description="Elapsed time of the run")
+    cpu_seconds: float = Field(0.0, description="CPU time of this process during the run")
+    steps: Dict[str, StepProfile] = Field(default_factory=dict, description="Time per dlt step")
+    resources: Dict[str, ResourceProfile] = Field(
+        default_factory=dict, description="Time per resource"
+    )
+    profiler: Optional[str] = Field(None, description="Profiler used for the resources")
+    profile_files: List[str] = Field(
+        default_factory=list, description="Profiler output written next to the report"
+    )
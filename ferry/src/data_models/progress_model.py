@@ -0,0 +1,25 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from ferry.src.data_models.response_models import JobStatus
+
+
+class TableProgress(BaseModel):
+    """Progress of a single table within a pipeline step"""
+
+    table_name: str = Field(..., description="Name of the table")
+    rows: int = Field(0, description="Rows processed so far")
+    bytes: Optional[int] = Field(None, description="Bytes written, known once the step completes")
+    rows_per_second: float = Field(0.0, description="Rows processed per second")
+
+
+class ProgressEvent(BaseModel):
+    """Progress of an ingest run, emitted while the run is active"""
+
+    identity: str = Field(..., description="Name of the pipeline")
+    step: Optional[str] = Field(
+        None, description="extract, normalize or load. Empty for events about the whole run"
+    )
+    status: JobStatus = Field(..., description="Status of the step or of the run")
+    elapsed_seconds: float = Field(0.0, description="Seconds since the step or run started")
+    tables: List[TableProgress] = Field(default_factory=list, description="Per table progress")
+    message: Optional[str] = Field(None, description="Error or informational message")
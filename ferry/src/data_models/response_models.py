@@ -1,6 +1,5 @@
 from enum import Enum
 from typing import Any, Dict, Optional
-from dlt.common.schema.typing import TStoredSchema
 from pydantic import BaseModel, Field
 
 
@@ -9,12 +8,19 @@ class LoadStatus(Enum):
     PROCESSING = "processing"
     ERROR = "error"
 
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
 class IngestResponse(BaseModel):
     """Response model for data loading operations."""
     status: LoadStatus = Field(..., description="Status of the data load operation")
     message: str = Field(..., description="Message describing the outcome")
     pipeline_name: Optional[str] = Field(None, description="Name of the pipeline")
     schema_version_hash: Optional[str] = Field(None, description="Version hash of the schema")
+    job_id: Optional[str] = Field(None, description="Id of the queued ingest job")
 
 class SchemaResponse(BaseModel):
     """Response model for schema requests."""
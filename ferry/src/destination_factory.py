@@ -1,34 +1,24 @@
+import importlib
 from urllib.parse import urlparse
-from ferry.src.destinations.athena_destination import AthenaDestination
-from ferry.src.destinations.big_query_destination import BigQueryDestination
-from ferry.src.destinations.clickhouse_destination import ClickhouseDestination
-from ferry.src.destinations.databricks_destination import DatabricksDestination
-from ferry.src.destinations.motherduck_destination import MotherduckDestination
-from ferry.src.destinations.mssql_destination import MssqlDestination
-from ferry.src.destinations.postgres_destination import PostgresDestination
 from ferry.src.destinations.destination_base import DestinationBase
-from ferry.src.destinations.redshift_destination import RedshiftDestination
-from ferry.src.destinations.s3_destination import S3Destination
-from ferry.src.destinations.snowflake_destination import SnowflakeDestination
-from ferry.src.destinations.sql_alchemy_destination import SqlAlchemyDestination
-from ferry.src.destinations.syanpse_destination import SynapseDestination
 from ferry.src.exceptions import InvalidDestinationException
-from ferry.src.destinations.duckdb_destination import DuckDBDestination
 
 class DestinationFactory:
+    # scheme: (module, class). Modules are imported on first use so a run only loads the
+    # dlt destination of its own destination
     _items = {
-        "postgres": PostgresDestination,
-        "postgresql": PostgresDestination,
-        "clickhouse": ClickhouseDestination,
-        "duckdb": DuckDBDestination,
-        "snowflake": SnowflakeDestination,
-        "md": MotherduckDestination,
-        "synapse": SynapseDestination,
-        "sqlite": SqlAlchemyDestination,
-        "mysql": SqlAlchemyDestination,
-        "mssql": MssqlDestination,
-        "athena": AthenaDestination,
-        "bigquery": BigQueryDestination
+        "postgres": ("ferry.src.destinations.postgres_destination", "PostgresDestination"),
+        "postgresql": ("ferry.src.destinations.postgres_destination", "PostgresDestination"),
+        "clickhouse": ("ferry.src.destinations.clickhouse_destination", "ClickhouseDestination"),
+        "duckdb": ("ferry.src.destinations.duckdb_destination", "DuckDBDestination"),
+        "snowflake": ("ferry.src.destinations.snowflake_destination", "SnowflakeDestination"),
+        "md": ("ferry.src.destinations.motherduck_destination", "MotherduckDestination"),
+        "synapse": ("ferry.src.destinations.syanpse_destination", "SynapseDestination"),
+        "sqlite": ("ferry.src.destinations.sql_alchemy_destination", "SqlAlchemyDestination"),
+        "mysql": ("ferry.src.destinations.sql_alchemy_destination", "SqlAlchemyDestination"),
+        "mssql": ("ferry.src.destinations.mssql_destination", "MssqlDestination"),
+        "athena": ("ferry.src.destinations.athena_destination", "AthenaDestination"),
+        "bigquery": ("ferry.src.destinations.big_query_destination", "BigQueryDestination"),
     }
 
     @staticmethod
@@ -37,8 +27,11 @@ class DestinationFactory:
         parsed_uri = urlparse(uri)
         
         if parsed_uri.scheme in DestinationFactory._items:
-            # Return the destination class instance based on the scheme
-            class_ = DestinationFactory._items.get(parsed_uri.scheme)
+            # Import the destination module and return an instance of its class
+            module_name, class_name = DestinationFactory._items[parsed_uri.scheme]
+            class_ = getattr(importlib.import_module(module_name), class_name)
             return class_()
         else:
-            raise InvalidDestinationException(f"Invalid destination URI scheme: {parsed_uri.scheme}")
+            raise InvalidDestinationException(
+                f"Invalid destination URI scheme: {parsed_uri.scheme}"
+            )
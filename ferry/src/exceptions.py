@@ -6,4 +6,9 @@ class InvalidSourceException(Exception):
 class InvalidDestinationException(Exception):
     def __init__(self, message="Invalid destination scheme provided"):
         self.message = message
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class JobQueueFullException(Exception):
+    def __init__(self, message="Job queue is full"):
+        self.message = message
+        super().__init__(self.message)
@@ -1,15 +1,31 @@
 import grpc
 import argparse
+import asyncio
 import logging
 import time
 import hmac
 import hashlib
 import json
+import queue
+import threading
 from concurrent import futures
 from ferry.src.grpc.protos import ferry_pb2, ferry_pb2_grpc
+from ferry.src.job_queue import Job, JobQueue
 from ferry.src.pipeline_builder import PipelineBuilder
-from ferry.src.pipeline_metrics import PipelineMetrics
-from ferry.src.data_models.ingest_model import IngestModel, ResourceConfig, WriteDispositionConfig
+from ferry.src.metrics_exporter import start_metrics_server
+from ferry.src.metrics_registry import get_metrics_registry, get_pipeline_metrics
+from ferry.src.run_scheduler import get_run_scheduler
+from ferry.src.data_models.ingest_model import (
+    IngestModel,
+    ResourceConfig,
+    SourceOptions,
+    WriteDispositionConfig,
+)
+from ferry.src.data_models.partition_config_model import PartitionConfig
+from ferry.src.data_models.performance_config_model import PerformanceConfig
+from ferry.src.data_models.progress_model import ProgressEvent
+from ferry.src.data_models.response_models import JobStatus
+from ferry.src.exceptions import JobQueueFullException
 import os
 
 # Global authentication state
@@ -17,6 +33,22 @@ CLIENT_ID = None
 CLIENT_SECRET = None
 SECURE_MODE = False
 
+DEFAULT_SERVER_THREADS = 64
+OBSERVABILITY_RETRIES = 3
+OBSERVABILITY_RETRY_DELAY = 1.5  # seconds
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Returns the queue running streamed ingests, created on first use."""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+        return _job_queue
+
 
 # Load stored client secrets
 def load_client_secrets():
@@ -31,6 +63,128 @@ def load_client_secrets():
         logging.warning("No client secrets found. Authentication disabled.")
 
 
+def build_ingest_model(request) -> IngestModel:
+    """Maps an IngestRequest to the ingest model shared with the REST API and CLI."""
+    return IngestModel(
+        identity=request.identity,
+        source_uri=request.source_uri,
+        destination_uri=request.destination_uri,
+        resources=[
+            ResourceConfig(
+                source_table_name=res.source_table_name,
+                destination_table_name=res.destination_table_name or None,
+                column_rules={
+                    "exclude_columns": list(res.column_rules.exclude_columns),
+                    "pseudonymizing_columns": list(res.column_rules.pseudonymizing_columns),
+                }
+                if res.HasField("column_rules")
+                else None,
+                write_disposition_config=WriteDispositionConfig(
+                    type=res.write_disposition_config.type
+                )
+                if res.HasField("write_disposition_config")
+                else None,
+                source_options=SourceOptions(
+                    batch_size=res.source_options.batch_size or None,
+                    batch_timeout=res.source_options.batch_timeout or None,
+                    start_from=res.source_options.start_from or None,
+                    backend=res.source_options.backend or None,
+                    chunk_size=res.source_options.chunk_size or None,
+                    stream_results=res.source_options.stream_results
+                    if res.source_options.HasField("stream_results")
+                    else None,
+                    partition=PartitionConfig(
+                        column=res.source_options.partition.column,
+                        partitions=res.source_options.partition.partitions or None,
+                        # Bounds travel as strings, the source converts them to the
+                        # type of the partition column
+                        bounds=list(res.source_options.partition.bounds) or None,
+                        max_workers=res.source_options.partition.max_workers or None,
+                    )
+                    if res.source_options.HasField("partition")
+                    else None,
+                )
+                if res.HasField("source_options")
+                else None,
+            )
+            for res in request.resources
+        ],
+        performance=PerformanceConfig(
+            extract_workers=request.performance.extract_workers or None,
+            normalize_workers=request.performance.normalize_workers or None,
+            load_workers=request.performance.load_workers or None,
+            file_max_items=request.performance.file_max_items or None,
+            file_max_bytes=request.performance.file_max_bytes or None,
+            buffer_max_items=request.performance.buffer_max_items or None,
+        )
+        if request.HasField("performance")
+        else None,
+    )
+
+
+def progress_message(event: ProgressEvent, job_id: str) -> ferry_pb2.IngestProgress:
+    return ferry_pb2.IngestProgress(
+        identity=event.identity,
+        job_id=job_id,
+        step=event.step or "",
+        status=event.status.value,
+        elapsed_seconds=event.elapsed_seconds,
+        tables=[
+            ferry_pb2.TableProgress(
+                table_name=table.table_name,
+                rows=table.rows,
+                bytes=table.bytes or 0,
+                rows_per_second=table.rows_per_second,
+            )
+            for table in event.tables
+        ],
+        message=event.message or "",
+    )
+
+
+def finished_event(job: Job) -> ProgressEvent:
+    """Reports the outcome of a finished job."""
+    elapsed = (job.finished_at - job.started_at).total_seconds() if job.started_at else 0.0
+    return ProgressEvent(
+        identity=job.identity,
+        status=job.status,
+        elapsed_seconds=round(elapsed, 2),
+        message=job.error,
+    )
+
+
+def pipeline_not_found(raw_metrics) -> bool:
+    return (
+        raw_metrics["status"] == "error" or "not found" in (raw_metrics.get("error") or "").lower()
+    )
+
+
+def observability_response(raw_metrics) -> ferry_pb2.ObservabilityResponse:
+    # Reorder the metrics section
+    ordered_metrics = {
+        "extract": raw_metrics["metrics"].get("extract"),
+        "normalize": raw_metrics["metrics"].get("normalize"),
+        "load": raw_metrics["metrics"].get("load"),
+    }
+
+    # Rebuild the full metrics dict with ordered metrics
+    ordered_full = {
+        "pipeline_name": raw_metrics.get("pipeline_name"),
+        "start_time": raw_metrics.get("start_time"),
+        "end_time": raw_metrics.get("end_time"),
+        "status": raw_metrics.get("status"),
+        "destination_type": raw_metrics.get("destination_type"),
+        "source_type": raw_metrics.get("source_type"),
+        "error": raw_metrics.get("error"),
+        "metrics": ordered_metrics,
+    }
+
+    return ferry_pb2.ObservabilityResponse(
+        status="SUCCESS",
+        metrics=json.dumps(ordered_full, indent=2, default=str),
+    )
+
+
 def validate_request_metadata(metadata, request_body):
     headers = {key: value for key, value in metadata}
     client_id = headers.get("x-client-id")
@@ -80,31 +234,13 @@ class FerryServiceServicer(ferry_pb2_grpc.FerryServiceServicer):
                 return ferry_pb2.IngestResponse(status="ERROR", message=error_msg)
 
         try:
-            ingest_model = IngestModel(
-                identity=request.identity,
-                source_uri=request.source_uri,
-                destination_uri=request.destination_uri,
-                resources=[
-                    ResourceConfig(
-                        source_table_name=res.source_table_name,
-                        destination_table_name=res.destination_table_name or None,
-                        column_rules={
-                            "exclude_columns": list(res.column_rules.exclude_columns),
-                            "pseudonymizing_columns": list(res.column_rules.pseudonymizing_columns),
-                        }
-                        if res.HasField("column_rules")
-                        else None,
-                        write_disposition_config=WriteDispositionConfig(
-                            type=res.write_disposition_config.type
-                        )
-                        if res.HasField("write_disposition_config")
-                        else None,
-                    )
-                    for res in request.resources
-                ],
-            )
-            pipeline = PipelineBuilder(model=ingest_model).build()
-            pipeline.run()
+            ingest_model = build_ingest_model(request)
+            with get_run_scheduler().run_slot(ingest_model):
+                # Unary runs share the queue's pool, so repeated ingests reuse their engines
+                pipeline = PipelineBuilder(
+                    model=ingest_model, connection_pool=get_job_queue().connection_pool
+                ).build()
+                pipeline.run()
             return ferry_pb2.IngestResponse(
                 status="SUCCESS",
                 message="Data ingestion completed successfully",
@@ -116,6 +252,45 @@ class FerryServiceServicer(ferry_pb2_grpc.FerryServiceServicer):
             context.set_details(str(e))
             return ferry_pb2.IngestResponse(status="ERROR", message=str(e))
 
+    def IngestDataStream(self, request, context):
+        """Queues the ingest and streams its progress until the run finishes."""
+        if SECURE_MODE:
+            status, error_msg = validate_request_metadata(
+                context.invocation_metadata(), request.SerializeToString()
+            )
+            if status:
+                context.abort(status, error_msg)
+
+        try:
+            ingest_model = build_ingest_model(request)
+        except Exception as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        events = queue.Queue()
+        try:
+            job = get_job_queue().submit(ingest_model, progress_listener=events.put)
+        except JobQueueFullException as e:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        # Progress events are all put before the job completes, None marks the end
+        job.future.add_done_callback(lambda _: events.put(None))
+
+        yield progress_message(
+            ProgressEvent(identity=job.identity, status=JobStatus.QUEUED), job.job_id
+        )
+        while True:
+            try:
+                event = events.get(timeout=1.0)
+            except queue.Empty:
+                if not context.is_active():
+                    logging.info(f"Client stopped following job {job.job_id}, the run continues")
+                    return
+                continue
+            if event is None:
+                break
+            yield progress_message(event, job.job_id)
+
+        yield progress_message(finished_event(job), job.job_id)
+
     def GetObservability(self, request, context):
         if SECURE_MODE:
             status, error_msg = validate_request_metadata(
@@ -126,52 +301,135 @@ class FerryServiceServicer(ferry_pb2_grpc.FerryServiceServicer):
                 context.set_details(error_msg)
                 return ferry_pb2.ObservabilityResponse(status="ERROR", metrics="")
 
-        retries = 3
-        delay = 1.5  # seconds
-
-        for attempt in range(retries):
+        for attempt in range(OBSERVABILITY_RETRIES):
             try:
-                raw_metrics = PipelineMetrics(name=request.identity).generate_metrics()
-
-                if (
-                    raw_metrics["status"] == "error"
-                    or "not found" in (raw_metrics.get("error") or "").lower()
-                ):
-                    if attempt < retries - 1:
-                        time.sleep(delay)
+                raw_metrics = get_pipeline_metrics(request.identity)
+
+                if pipeline_not_found(raw_metrics):
+                    if attempt < OBSERVABILITY_RETRIES - 1:
+                        time.sleep(OBSERVABILITY_RETRY_DELAY)
                         continue
                     context.set_code(grpc.StatusCode.NOT_FOUND)
                     context.set_details(f"Pipeline '{request.identity}' not found")
                     return ferry_pb2.ObservabilityResponse(status="ERROR", metrics="")
 
-                # Reorder the metrics section
-                ordered_metrics = {
-                    "extract": raw_metrics["metrics"].get("extract"),
-                    "normalize": raw_metrics["metrics"].get("normalize"),
-                    "load": raw_metrics["metrics"].get("load"),
-                }
+                return observability_response(raw_metrics)
 
-                # Rebuild the full metrics dict with ordered metrics
-                ordered_full = {
-                    "pipeline_name": raw_metrics.get("pipeline_name"),
-                    "start_time": raw_metrics.get("start_time"),
-                    "end_time": raw_metrics.get("end_time"),
-                    "status": raw_metrics.get("status"),
-                    "destination_type": raw_metrics.get("destination_type"),
-                    "source_type": raw_metrics.get("source_type"),
-                    "error": raw_metrics.get("error"),
-                    "metrics": ordered_metrics,
-                }
+            except Exception as e:
+                logging.warning(f"Observability fetch failed on attempt {attempt + 1}: {e}")
+                if attempt < OBSERVABILITY_RETRIES - 1:
+                    time.sleep(OBSERVABILITY_RETRY_DELAY)
+                    continue
+                logging.exception("Error in GetObservability")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                return ferry_pb2.ObservabilityResponse(status="ERROR", metrics="")
 
-                return ferry_pb2.ObservabilityResponse(
-                    status="SUCCESS",
-                    metrics=json.dumps(ordered_full, indent=2, default=str),
-                )
+
+class AsyncFerryServiceServicer(ferry_pb2_grpc.FerryServiceServicer):
+    """Servicer for the grpc.aio server.
+
+    Ingests run on the job queue and are awaited, observability retries sleep on the event
+    loop, so calls waiting for a run or a retry hold no threads.
+    """
+
+    async def IngestData(self, request, context):
+        if SECURE_MODE:
+            status, error_msg = validate_request_metadata(
+                context.invocation_metadata(), request.SerializeToString()
+            )
+            if status:
+                context.set_code(status)
+                context.set_details(error_msg)
+                return ferry_pb2.IngestResponse(status="ERROR", message=error_msg)
+
+        try:
+            job = get_job_queue().submit(build_ingest_model(request))
+        except JobQueueFullException as e:
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            context.set_details(str(e))
+            return ferry_pb2.IngestResponse(status="ERROR", message=str(e))
+        except Exception as e:
+            logging.exception("Error in IngestData")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ferry_pb2.IngestResponse(status="ERROR", message=str(e))
+
+        await asyncio.wrap_future(job.future)
+        if job.status == JobStatus.FAILED:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(job.error)
+            return ferry_pb2.IngestResponse(status="ERROR", message=job.error)
+        return ferry_pb2.IngestResponse(
+            status="SUCCESS",
+            message="Data ingestion completed successfully",
+            pipeline_name=job.identity,
+        )
+
+    async def IngestDataStream(self, request, context):
+        """Queues the ingest and streams its progress until the run finishes."""
+        if SECURE_MODE:
+            status, error_msg = validate_request_metadata(
+                context.invocation_metadata(), request.SerializeToString()
+            )
+            if status:
+                await context.abort(status, error_msg)
+
+        try:
+            ingest_model = build_ingest_model(request)
+        except Exception as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def put(event):
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        try:
+            job = get_job_queue().submit(ingest_model, progress_listener=put)
+        except JobQueueFullException as e:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        # Progress events are all put before the job completes, None marks the end
+        job.future.add_done_callback(lambda _: put(None))
+
+        yield progress_message(
+            ProgressEvent(identity=job.identity, status=JobStatus.QUEUED), job.job_id
+        )
+        while (event := await events.get()) is not None:
+            yield progress_message(event, job.job_id)
+        yield progress_message(finished_event(job), job.job_id)
+
+    async def GetObservability(self, request, context):
+        if SECURE_MODE:
+            status, error_msg = validate_request_metadata(
+                context.invocation_metadata(), request.SerializeToString()
+            )
+            if status:
+                context.set_code(status)
+                context.set_details(error_msg)
+                return ferry_pb2.ObservabilityResponse(status="ERROR", metrics="")
+
+        for attempt in range(OBSERVABILITY_RETRIES):
+            try:
+                raw_metrics = get_metrics_registry().get(request.identity)
+                if raw_metrics is None:
+                    raw_metrics = await asyncio.to_thread(get_pipeline_metrics, request.identity)
+
+                if pipeline_not_found(raw_metrics):
+                    if attempt < OBSERVABILITY_RETRIES - 1:
+                        await asyncio.sleep(OBSERVABILITY_RETRY_DELAY)
+                        continue
+                    context.set_code(grpc.StatusCode.NOT_FOUND)
+                    context.set_details(f"Pipeline '{request.identity}' not found")
+                    return ferry_pb2.ObservabilityResponse(status="ERROR", metrics="")
+
+                return observability_response(raw_metrics)
 
             except Exception as e:
                 logging.warning(f"Observability fetch failed on attempt {attempt + 1}: {e}")
-                if attempt < retries - 1:
-                    time.sleep(delay)
+                if attempt < OBSERVABILITY_RETRIES - 1:
+                    await asyncio.sleep(OBSERVABILITY_RETRY_DELAY)
                     continue
                 logging.exception("Error in GetObservability")
                 context.set_code(grpc.StatusCode.INTERNAL)
@@ -179,12 +437,16 @@ class FerryServiceServicer(ferry_pb2_grpc.FerryServiceServicer):
                 return ferry_pb2.ObservabilityResponse(status="ERROR", metrics="")
 
 
-def serve(port, secure_mode):
+def serve(port, secure_mode, threads=DEFAULT_SERVER_THREADS, metrics_port=None):
     global SECURE_MODE
     SECURE_MODE = secure_mode
     load_client_secrets()
+    if metrics_port:
+        start_metrics_server(metrics_port)
 
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    # Streamed ingests hold a thread while they wait for progress, runs are admitted by the
+    # run scheduler so the pool only bounds the number of open calls
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=threads))
     ferry_pb2_grpc.add_FerryServiceServicer_to_server(FerryServiceServicer(), server)
     server.add_insecure_port(f"[::]:{port}")
 
@@ -193,11 +455,43 @@ def serve(port, secure_mode):
     server.wait_for_termination()
 
 
+async def serve_async(port, secure_mode, metrics_port=None):
+    """Serves on the asyncio event loop, ingests run on the job queue's workers."""
+    global SECURE_MODE
+    SECURE_MODE = secure_mode
+    load_client_secrets()
+    if metrics_port:
+        start_metrics_server(metrics_port)
+
+    server = grpc.aio.server()
+    ferry_pb2_grpc.add_FerryServiceServicer_to_server(AsyncFerryServiceServicer(), server)
+    server.add_insecure_port(f"[::]:{port}")
+
+    logging.info(f"Starting async gRPC server on port {port} with secure mode: {secure_mode}")
+    await server.start()
+    await server.wait_for_termination()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Start the Ferry gRPC server.")
     parser.add_argument("--port", type=int, default=50051, help="Port to run the gRPC server on")
     parser.add_argument("--secure", action="store_true", help="Enable secure authentication mode")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=DEFAULT_SERVER_THREADS,
+        help="Number of gRPC calls served at the same time",
+    )
+    parser.add_argument(
+        "--async-mode", action="store_true", help="Serve with the asyncio based grpc.aio server"
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, help="Serve Prometheus metrics over HTTP on this port"
+    )
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO)
-    serve(args.port, args.secure)
+    if args.async_mode:
+        asyncio.run(serve_async(args.port, args.secure, args.metrics_port))
+    else:
+        serve(args.port, args.secure, args.threads, args.metrics_port)
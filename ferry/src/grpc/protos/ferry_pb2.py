@@ -20,7 +20,7 @@ _sym_db = _symbol_database.Default()
 
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x0b\x66\x65rry.proto\x12\x05\x66\x65rry"r\n\rIngestRequest\x12\x10\n\x08identity\x18\x01 \x01(\t\x12\x12\n\nsource_uri\x18\x02 \x01(\t\x12\x17\n\x0f\x64\x65stination_uri\x18\x03 \x01(\t\x12"\n\tresources\x18\x04 \x03(\x0b\x32\x0f.ferry.Resource"\xde\x01\n\x08Resource\x12\x19\n\x11source_table_name\x18\x01 \x01(\t\x12\x1e\n\x16\x64\x65stination_table_name\x18\x02 \x01(\t\x12(\n\x0c\x63olumn_rules\x18\x03 \x01(\x0b\x32\x12.ferry.ColumnRules\x12?\n\x18write_disposition_config\x18\x04 \x01(\x0b\x32\x1d.ferry.WriteDispositionConfig\x12,\n\x0esource_options\x18\x05 \x01(\x0b\x32\x14.ferry.SourceOptions"F\n\x0b\x43olumnRules\x12\x17\n\x0f\x65xclude_columns\x18\x01 \x03(\t\x12\x1e\n\x16pseudonymizing_columns\x18\x02 \x03(\t"&\n\x16WriteDispositionConfig\x12\x0c\n\x04type\x18\x01 \x01(\t"N\n\rSourceOptions\x12\x12\n\nbatch_size\x18\x01 \x01(\x05\x12\x15\n\rbatch_timeout\x18\x02 \x01(\x05\x12\x12\n\nstart_from\x18\x03 \x01(\t"H\n\x0eIngestResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x15\n\rpipeline_name\x18\x03 \x01(\t"(\n\x14ObservabilityRequest\x12\x10\n\x08identity\x18\x01 \x01(\t"8\n\x15ObservabilityResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07metrics\x18\x02 \x01(\t2\x98\x01\n\x0c\x46\x65rryService\x12\x39\n\nIngestData\x12\x14.ferry.IngestRequest\x1a\x15.ferry.IngestResponse\x12M\n\x10GetObservability\x12\x1b.ferry.ObservabilityRequest\x1a\x1c.ferry.ObservabilityResponseb\x06proto3'
+    b'\n\x0b\x66\x65rry.proto\x12\x05\x66\x65rry"\xa1\x01\n\rIngestRequest\x12\x10\n\x08identity\x18\x01 \x01(\t\x12\x12\n\nsource_uri\x18\x02 \x01(\t\x12\x17\n\x0f\x64\x65stination_uri\x18\x03 \x01(\t\x12"\n\tresources\x18\x04 \x03(\x0b\x32\x0f.ferry.Resource\x12-\n\x0bperformance\x18\x05 \x01(\x0b\x32\x18.ferry.PerformanceConfig"\xde\x01\n\x08Resource\x12\x19\n\x11source_table_name\x18\x01 \x01(\t\x12\x1e\n\x16\x64\x65stination_table_name\x18\x02 \x01(\t\x12(\n\x0c\x63olumn_rules\x18\x03 \x01(\x0b\x32\x12.ferry.ColumnRules\x12?\n\x18write_disposition_config\x18\x04 \x01(\x0b\x32\x1d.ferry.WriteDispositionConfig\x12,\n\x0esource_options\x18\x05 \x01(\x0b\x32\x14.ferry.SourceOptions"F\n\x0b\x43olumnRules\x12\x17\n\x0f\x65xclude_columns\x18\x01 \x03(\t\x12\x1e\n\x16pseudonymizing_columns\x18\x02 \x03(\t"&\n\x16WriteDispositionConfig\x12\x0c\n\x04type\x18\x01 \x01(\t"\xce\x01\n\rSourceOptions\x12\x12\n\nbatch_size\x18\x01 \x01(\x05\x12\x15\n\rbatch_timeout\x18\x02 \x01(\x05\x12\x12\n\nstart_from\x18\x03 \x01(\t\x12\x0f\n\x07\x62\x61\x63kend\x18\x04 \x01(\t\x12\x12\n\nchunk_size\x18\x05 \x01(\x05\x12\x1b\n\x0estream_results\x18\x06 \x01(\x08H\x00\x88\x01\x01\x12)\n\tpartition\x18\x07 \x01(\x0b\x32\x16.ferry.PartitionConfigB\x11\n\x0f_stream_results"Z\n\x0fPartitionConfig\x12\x0e\n\x06\x63olumn\x18\x01 \x01(\t\x12\x12\n\npartitions\x18\x02 \x01(\x05\x12\x0e\n\x06\x62ounds\x18\x03 \x03(\t\x12\x13\n\x0bmax_workers\x18\x04 \x01(\x05"\xa7\x01\n\x11PerformanceConfig\x12\x17\n\x0f\x65xtract_workers\x18\x01 \x01(\x05\x12\x19\n\x11normalize_workers\x18\x02 \x01(\x05\x12\x14\n\x0cload_workers\x18\x03 \x01(\x05\x12\x16\n\x0e\x66ile_max_items\x18\x04 \x01(\x03\x12\x16\n\x0e\x66ile_max_bytes\x18\x05 \x01(\x03\x12\x18\n\x10\x62uffer_max_items\x18\x06 \x01(\x05"H\n\x0eIngestResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x15\n\rpipeline_name\x18\x03 \x01(\t"Y\n\rTableProgress\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x0c\n\x04rows\x18\x02 \x01(\x03\x12\r\n\x05\x62ytes\x18\x03 \x01(\x03\x12\x17\n\x0frows_per_second\x18\x04 \x01(\x01"\xa0\x01\n\x0eIngestProgress\x12\x10\n\x08identity\x18\x01 \x01(\t\x12\x0e\n\x06job_id\x18\x02 \x01(\t\x12\x0c\n\x04step\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x17\n\x0f\x65lapsed_seconds\x18\x05 \x01(\x01\x12$\n\x06tables\x18\x06 \x03(\x0b\x32\x14.ferry.TableProgress\x12\x0f\n\x07message\x18\x07 \x01(\t"(\n\x14ObservabilityRequest\x12\x10\n\x08identity\x18\x01 \x01(\t"8\n\x15ObservabilityResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07metrics\x18\x02 \x01(\t2\xdb\x01\n\x0c\x46\x65rryService\x12\x39\n\nIngestData\x12\x14.ferry.IngestRequest\x1a\x15.ferry.IngestResponse\x12\x41\n\x10IngestDataStream\x12\x14.ferry.IngestRequest\x1a\x15.ferry.IngestProgress0\x01\x12M\n\x10GetObservability\x12\x1b.ferry.ObservabilityRequest\x1a\x1c.ferry.ObservabilityResponseb\x06proto3'
 )
 
 _globals = globals()
@@ -28,22 +28,30 @@ _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, "ferry_pb2", _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
     DESCRIPTOR._loaded_options = None
-    _globals["_INGESTREQUEST"]._serialized_start = 22
-    _globals["_INGESTREQUEST"]._serialized_end = 136
-    _globals["_RESOURCE"]._serialized_start = 139
-    _globals["_RESOURCE"]._serialized_end = 361
-    _globals["_COLUMNRULES"]._serialized_start = 363
-    _globals["_COLUMNRULES"]._serialized_end = 433
-    _globals["_WRITEDISPOSITIONCONFIG"]._serialized_start = 435
-    _globals["_WRITEDISPOSITIONCONFIG"]._serialized_end = 473
-    _globals["_SOURCEOPTIONS"]._serialized_start = 475
-    _globals["_SOURCEOPTIONS"]._serialized_end = 553
-    _globals["_INGESTRESPONSE"]._serialized_start = 555
-    _globals["_INGESTRESPONSE"]._serialized_end = 627
-    _globals["_OBSERVABILITYREQUEST"]._serialized_start = 629
-    _globals["_OBSERVABILITYREQUEST"]._serialized_end = 669
-    _globals["_OBSERVABILITYRESPONSE"]._serialized_start = 671
-    _globals["_OBSERVABILITYRESPONSE"]._serialized_end = 727
-    _globals["_FERRYSERVICE"]._serialized_start = 730
-    _globals["_FERRYSERVICE"]._serialized_end = 882
+    _globals["_INGESTREQUEST"]._serialized_start = 23
+    _globals["_INGESTREQUEST"]._serialized_end = 184
+    _globals["_RESOURCE"]._serialized_start = 187
+    _globals["_RESOURCE"]._serialized_end = 409
+    _globals["_COLUMNRULES"]._serialized_start = 411
+    _globals["_COLUMNRULES"]._serialized_end = 481
+    _globals["_WRITEDISPOSITIONCONFIG"]._serialized_start = 483
+    _globals["_WRITEDISPOSITIONCONFIG"]._serialized_end = 521
+    _globals["_SOURCEOPTIONS"]._serialized_start = 524
+    _globals["_SOURCEOPTIONS"]._serialized_end = 730
+    _globals["_PARTITIONCONFIG"]._serialized_start = 732
+    _globals["_PARTITIONCONFIG"]._serialized_end = 822
+    _globals["_PERFORMANCECONFIG"]._serialized_start = 825
+    _globals["_PERFORMANCECONFIG"]._serialized_end = 992
+    _globals["_INGESTRESPONSE"]._serialized_start = 994
+    _globals["_INGESTRESPONSE"]._serialized_end = 1066
+    _globals["_TABLEPROGRESS"]._serialized_start = 1068
+    _globals["_TABLEPROGRESS"]._serialized_end = 1157
+    _globals["_INGESTPROGRESS"]._serialized_start = 1160
+    _globals["_INGESTPROGRESS"]._serialized_end = 1320
+    _globals["_OBSERVABILITYREQUEST"]._serialized_start = 1322
+    _globals["_OBSERVABILITYREQUEST"]._serialized_end = 1362
+    _globals["_OBSERVABILITYRESPONSE"]._serialized_start = 1364
+    _globals["_OBSERVABILITYRESPONSE"]._serialized_end = 1420
+    _globals["_FERRYSERVICE"]._serialized_start = 1423
+    _globals["_FERRYSERVICE"]._serialized_end = 1642
 # @@protoc_insertion_point(module_scope)
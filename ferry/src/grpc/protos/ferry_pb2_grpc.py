@@ -41,6 +41,12 @@ class FerryServiceStub(object):
             response_deserializer=ferry__pb2.IngestResponse.FromString,
             _registered_method=True,
         )
+        self.IngestDataStream = channel.unary_stream(
+            "/ferry.FerryService/IngestDataStream",
+            request_serializer=ferry__pb2.IngestRequest.SerializeToString,
+            response_deserializer=ferry__pb2.IngestProgress.FromString,
+            _registered_method=True,
+        )
         self.GetObservability = channel.unary_unary(
             "/ferry.FerryService/GetObservability",
             request_serializer=ferry__pb2.ObservabilityRequest.SerializeToString,
@@ -58,6 +64,12 @@ class FerryServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def IngestDataStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
     def GetObservability(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -72,6 +84,11 @@ def add_FerryServiceServicer_to_server(servicer, server):
             request_deserializer=ferry__pb2.IngestRequest.FromString,
             response_serializer=ferry__pb2.IngestResponse.SerializeToString,
         ),
+        "IngestDataStream": grpc.unary_stream_rpc_method_handler(
+            servicer.IngestDataStream,
+            request_deserializer=ferry__pb2.IngestRequest.FromString,
+            response_serializer=ferry__pb2.IngestProgress.SerializeToString,
+        ),
         "GetObservability": grpc.unary_unary_rpc_method_handler(
             servicer.GetObservability,
             request_deserializer=ferry__pb2.ObservabilityRequest.FromString,
@@ -119,6 +136,36 @@ class FerryService(object):
             _registered_method=True,
         )
 
+    @staticmethod
+    def IngestDataStream(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/ferry.FerryService/IngestDataStream",
+            ferry__pb2.IngestRequest.SerializeToString,
+            ferry__pb2.IngestProgress.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
     @staticmethod
     def GetObservability(
         request,
@@ -0,0 +1,170 @@
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from ferry.src.connection_pool import ConnectionPool
+from ferry.src.data_models.ingest_model import IngestModel
+from ferry.src.data_models.response_models import JobStatus
+from ferry.src.exceptions import JobQueueFullException
+from ferry.src.pipeline_builder import PipelineBuilder
+from ferry.src.progress_tracker import ProgressListener
+from ferry.src.run_scheduler import RunScheduler, RunSlot, get_run_scheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUED = 1000
+
+
+class Job:
+    """A single pipeline run submitted to the job queue"""
+
+    def __init__(self, model: IngestModel, progress_listener: Optional[ProgressListener] = None):
+        self.job_id = uuid.uuid4().hex
+        self.model = model
+        self.progress_listener = progress_listener
+        self.identity = model.identity
+        self.status = JobStatus.QUEUED
+        self.error: Optional[str] = None
+        self.submitted_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.future: Future = Future()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "error": self.error,
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobQueue:
+    """Runs ingest pipelines on worker threads as the run scheduler admits them.
+
+    Submissions return immediately. A dispatcher starts queued jobs in submission order
+    once the scheduler grants them a slot, so jobs of a busy pipeline or destination do not
+    hold up the others. At most max_queued jobs wait, further submissions are rejected.
+    """
+
+    def __init__(
+        self,
+        max_queued: Optional[int] = None,
+        scheduler: Optional[RunScheduler] = None,
+        connection_pool: Optional[ConnectionPool] = None,
+    ):
+        self.max_queued = max_queued or int(os.getenv("FERRY_MAX_QUEUED", DEFAULT_MAX_QUEUED))
+        self.scheduler = scheduler or get_run_scheduler()
+        # Runs of the server reuse source connections, idle ones are closed by the dispatcher
+        self.connection_pool = connection_pool or ConnectionPool()
+        # Every running job holds a scheduler slot, so workers are never the bottleneck
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.scheduler.max_concurrent_runs, thread_name_prefix="ferry-job"
+        )
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._latest: Dict[str, Job] = {}
+        self._pending: deque = deque()
+        # Builders of the running jobs, continuous ones only end when stopped
+        self._running: Dict[str, PipelineBuilder] = {}
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self.scheduler.add_release_listener(self._wakeup.set)
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="ferry-job-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+
+    def submit(
+        self, model: IngestModel, progress_listener: Optional[ProgressListener] = None
+    ) -> Job:
+        """Queues a run. progress_listener receives the progress events of the run."""
+        job = Job(model, progress_listener)
+        with self._lock:
+            if len(self._pending) >= self.max_queued:
+                raise JobQueueFullException(
+                    f"Job queue is full ({self.max_queued} jobs waiting), retry later"
+                )
+            previous = self._latest.get(job.identity)
+            if previous and previous.finished_at:
+                self._jobs.pop(previous.job_id, None)
+            self._jobs[job.job_id] = job
+            self._latest[job.identity] = job
+            self._pending.append(job)
+        self._wakeup.set()
+        logger.info(f"Queued job {job.job_id} for pipeline {job.identity}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def latest(self, identity: str) -> Optional[Job]:
+        """Returns the most recent job submitted for a pipeline identity."""
+        return self._latest.get(identity)
+
+    def count(self, status: JobStatus) -> int:
+        return sum(1 for job in list(self._jobs.values()) if job.status == status)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        self._dispatcher.join()
+        with self._lock:
+            for builder in self._running.values():
+                builder.stop()
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        self.connection_pool.close()
+
+    def _dispatch_loop(self) -> None:
+        while not self._stopped.is_set():
+            # Releases wake the dispatcher, the timeout covers locks held by other processes
+            self._wakeup.wait(1.0)
+            self._wakeup.clear()
+            if not self._stopped.is_set():
+                self._dispatch()
+                self.connection_pool.prune()
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            for job in list(self._pending):
+                slot = self.scheduler.try_acquire(job.model)
+                if slot:
+                    self._pending.remove(job)
+                    self._executor.submit(self._run, job, slot)
+
+    def _run(self, job: Job, slot: RunSlot) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        job.future.set_running_or_notify_cancel()
+        try:
+            builder = PipelineBuilder(
+                model=job.model,
+                progress_listener=job.progress_listener,
+                connection_pool=self.connection_pool,
+            ).build()
+            with self._lock:
+                self._running[job.job_id] = builder
+            if self._stopped.is_set():
+                builder.stop()
+            builder.run()
+            job.status = JobStatus.COMPLETED
+            logger.info(f"Job {job.job_id} for pipeline {job.identity} completed")
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            logger.exception(f"Job {job.job_id} for pipeline {job.identity} failed: {e}")
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            with self._lock:
+                self._running.pop(job.job_id, None)
+                # Only the latest job of each pipeline is kept once finished
+                if self._latest.get(job.identity) is not job:
+                    self._jobs.pop(job.job_id, None)
+            self.scheduler.release(slot)
+            job.future.set_result(job.status)
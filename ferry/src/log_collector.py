@@ -1,27 +1,59 @@
 # Final
 from collections import defaultdict
 import logging
-import shutil
 import sys
-import tempfile
 from dlt.common.runtime.collector import Collector
 import time
 import json
 import os
 from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
     NamedTuple,
     Optional,
     TextIO,
     Union,
 )
 import importlib.util
-from filelock import FileLock
+from ferry.src.data_models.progress_model import ProgressEvent, TableProgress
+from ferry.src.data_models.response_models import JobStatus
 import threading
 
+if TYPE_CHECKING:
+    from ferry.src.metrics_registry import MetricsRegistry
+
+# Enough to hold the last line of the log, which is a single compact JSON snapshot
+LAST_LOG_READ_SIZE = 64 * 1024
+
+
+def read_last_log(log_file: str) -> Optional[Dict[str, Any]]:
+    """Returns the latest snapshot appended to a collector log, None if there is none.
+
+    A line still being written has no trailing newline yet and is skipped.
+    """
+    with open(log_file, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(size - LAST_LOG_READ_SIZE, 0))
+        lines = f.read().split(b"\n")
+    for line in reversed(lines[:-1]):
+        try:
+            return json.loads(line)
+        except ValueError:
+            continue
+    return None
+
 
 # logger = logging.getLogger(__name__)
 class FerryLogCollector(Collector):
-    """A Collector that shows progress by writing to a Python logger or a console"""
+    """A Collector that aggregates counters in memory and appends snapshots to a log file.
+
+    Snapshots are written at most once per log_period and whenever a step starts or ends,
+    one compact JSON object per line. The log is truncated when the first snapshot of a
+    run is written.
+    """
 
     logger: Union[logging.Logger, TextIO]
     log_level: int
@@ -40,8 +72,13 @@ class FerryLogCollector(Collector):
         logger: Union[logging.Logger, TextIO] = sys.stdout,
         log_level: int = logging.INFO,
         dump_system_stats: bool = True,
+        progress_listener: Optional[Callable[[ProgressEvent], None]] = None,
+        metrics_registry: Optional["MetricsRegistry"] = None,
     ) -> None:
         self.identity = identity
+        self.progress_listener = progress_listener
+        self.metrics_registry = metrics_registry
+        self.step_start_time = None
         self.log_period = log_period
         self.logger = logger
         self.log_level = log_level
@@ -56,6 +93,9 @@ class FerryLogCollector(Collector):
         self.counter_info = {}
         self.messages = {}
         self.last_log_time = None
+        self.log_started = False
+        # Step the collector last left, a later extract starts the next run of the pipeline
+        self.finished_step = None
         self.last_in_process = {}
         self.completed_logs = {}
         self.normalized_file_stats = defaultdict(int)
@@ -110,8 +150,6 @@ class FerryLogCollector(Collector):
             )
             self.messages[counter_key] = None
 
-        print(f"Logging update for {name}: {inc}, total count: {self.counters.get(name, 0)}")
-
         self.counters[counter_key] += inc
         if hasattr(self, "step") and isinstance(self.step, str):
             current_step = self.step.lower()
@@ -127,14 +165,39 @@ class FerryLogCollector(Collector):
         if message:
             self.messages[counter_key] = message
 
-        self.dump_counters()
+        self.maybe_log()
+
+    def _emit_progress(self, current_time: float) -> None:
+        """Reports rows extracted per table to the progress listener"""
+        if not self.table_stats["extract"]:
+            return
+        elapsed_time = current_time - (self.step_start_time or current_time)
+        tables = [
+            TableProgress(
+                table_name=name,
+                rows=rows,
+                rows_per_second=round(rows / elapsed_time, 2) if elapsed_time > 0 else 0.0,
+            )
+            for name, rows in self.table_stats["extract"].items()
+        ]
+        self.progress_listener(
+            ProgressEvent(
+                identity=self.identity,
+                step="extract",
+                status=JobStatus.RUNNING,
+                elapsed_seconds=round(elapsed_time, 2),
+                tables=tables,
+            )
+        )
 
     def maybe_log(self) -> None:
-        """Force logging on every update to get real-time row-level details."""
-        self.dump_counters()
+        """Writes a snapshot once log_period has passed since the last one."""
+        if self.last_log_time is None or time.time() - self.last_log_time >= self.log_period:
+            self.dump_counters()
 
     def dump_counters(self) -> None:
         current_time = time.time()
+        self.last_log_time = current_time
         log_data = {
             "extract": self.last_in_process.get("extract", {"status": "pending"}).copy(),
             "normalize": self.last_in_process.get("normalize", {"status": "pending"}).copy(),
@@ -206,48 +269,43 @@ class FerryLogCollector(Collector):
                     log_data["load"] = log_entry.copy()
 
         self._log(log_data)
-
-    # def _log(self, log_message: dict) -> None:
-    #     """Overwrite the log file with a single latest JSON object."""
-    #     log_message["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-    #     with open(self.log_file, "w", encoding="utf-8") as log_file:
-    #         log_file.write(json.dumps(log_message, indent=2))  # Optional pretty-print
+        step = self._current_step()
+        if step and self.metrics_registry:
+            self.metrics_registry.publish_live(self.identity, step, dict(self.table_stats[step]))
+        if step == "extract" and self.progress_listener:
+            self._emit_progress(current_time)
+
+    def _current_step(self) -> Optional[str]:
+        if not isinstance(getattr(self, "step", None), str):
+            return None
+        step_lower = self.step.lower()
+        return next((step for step in self.table_stats if step in step_lower), None)
 
     def _log(self, log_message: dict) -> None:
-        if "_dlt_pipeline_state" in json.dumps(log_message):
-            print("[DEBUG] _dlt_pipeline_state made it to log!")
-        """Safely write JSON log with locking to avoid access conflicts (cross-platform safe)."""
+        """Appends the snapshot as a single compact JSON line."""
         log_message["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+        line = json.dumps(log_message, separators=(",", ":"), default=str) + "\n"
 
-        dir_name = os.path.dirname(self.log_file)
-        temp_log_fd, temp_log_path = tempfile.mkstemp(dir=dir_name, suffix=".jsonl")
-
-        try:
-            # Write the log message to a temp file
-            with os.fdopen(temp_log_fd, "w", encoding="utf-8") as tmp_file:
-                json.dump(log_message, tmp_file, indent=2)
-
-            # Lock the main file to avoid race conditions
-            lock_path = f"{self.log_file}.lock"
-            with FileLock(lock_path, timeout=5):
-                shutil.move(temp_log_path, self.log_file)
-
-        except Exception as e:
-            # Clean up temp file on failure
-            if os.path.exists(temp_log_path):
-                os.remove(temp_log_path)
-            raise e
+        with self.log_lock:
+            with open(self.log_file, "a" if self.log_started else "w", encoding="utf-8") as f:
+                f.write(line)
+        self.log_started = True
 
     def _start(self, step: str) -> None:
+        # Continuous runs reuse the collector, each micro-batch truncates the log like a new run
+        if "extract" in step.lower() and self.finished_step not in (None, "extract"):
+            self.log_started = False
         if not self.counters:  # Don't reset if already initialized
             self.counters = defaultdict(int)
             self.counter_info = {}
             self.messages = {}
-        self.last_log_time = time.time()
+        self.step_start_time = time.time()
+        self.dump_counters()
 
     def _stop(self) -> None:
         """Ensures the latest in-process metrics are logged before shutting down."""
         self.dump_counters()  # Log the last recorded metrics
+        self.finished_step = self._current_step()
 
         # Reset internal states
         self.counters = None
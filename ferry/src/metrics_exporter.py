@@ -0,0 +1,191 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from dlt.common.time import ensure_pendulum_datetime
+from dlt.pipeline import trace as dlt_trace
+from ferry.src.metrics_registry import get_metrics_registry
+from ferry.src.progress_tracker import TRACKED_STEPS, step_tables
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# name: (type, help)
+METRICS = {
+    "ferry_rows_total": ("counter", "Rows processed per pipeline, step and table"),
+    "ferry_bytes_total": ("counter", "Bytes written per pipeline, step and table"),
+    "ferry_files_total": ("counter", "Load jobs completed per pipeline and table"),
+    "ferry_runs_total": ("counter", "Pipeline runs finished per pipeline and status"),
+    "ferry_load_job_duration_seconds": ("summary", "Duration of load jobs per pipeline and table"),
+    "ferry_step_duration_seconds": ("gauge", "Duration of the latest step per pipeline"),
+    "ferry_rows_per_second": ("gauge", "Throughput of the latest step per pipeline and table"),
+    "ferry_run_duration_seconds": ("gauge", "Duration of the latest run per pipeline"),
+    "ferry_last_run_timestamp_seconds": ("gauge", "Unix time the latest run finished"),
+    "ferry_rows_in_progress": ("gauge", "Rows processed so far by the running step"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class PrometheusExporter:
+    """dlt tracking module turning step and run outcomes into Prometheus metrics.
+
+    Counters accumulate over all runs of this process, gauges hold the latest step or run.
+    Rows of running steps are read from the metrics registry when rendering.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Dict[Labels, float]] = {name: {} for name in METRICS}
+        self._normalized_rows: Dict[str, Dict[str, int]] = {}
+
+    def render(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            samples = {name: dict(values) for name, values in self._samples.items()}
+        samples["ferry_rows_in_progress"] = self._rows_in_progress()
+
+        lines = []
+        for name, (metric_type, description) in METRICS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if metric_type == "summary":
+                for suffix in ("_sum", "_count"):
+                    for labels, value in samples.get(name + suffix, {}).items():
+                        lines.append(f"{name}{suffix}{_format_labels(labels)} {value}")
+            else:
+                for labels, value in samples[name].items():
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def on_start_trace(self, trace: Any, step: str, pipeline: Any) -> None:
+        pass
+
+    def on_start_trace_step(self, trace: Any, step: str, pipeline: Any) -> None:
+        pass
+
+    def on_end_trace_step(
+        self, trace: Any, step: Any, pipeline: Any, step_info: Any, send_state: bool
+    ) -> None:
+        if step.step not in TRACKED_STEPS or not step_info:
+            return
+        name = pipeline.pipeline_name
+        elapsed = (step.finished_at - step.started_at).total_seconds()
+        with self._lock:
+            tables = step_tables(step.step, step_info, elapsed, self._normalized_rows.get(name, {}))
+            if step.step == "normalize":
+                self._normalized_rows[name] = {table.table_name: table.rows for table in tables}
+            self._set("ferry_step_duration_seconds", elapsed, pipeline=name, step=step.step)
+            for table in tables:
+                labels = {"pipeline": name, "step": step.step, "table": table.table_name}
+                self._inc("ferry_rows_total", table.rows, **labels)
+                self._inc("ferry_bytes_total", table.bytes or 0, **labels)
+                self._set("ferry_rows_per_second", table.rows_per_second, **labels)
+            if step.step == "load":
+                self._add_load_jobs(name, step_info)
+
+    def on_end_trace(self, trace: Any, pipeline: Any, send_state: bool) -> None:
+        name = pipeline.pipeline_name
+        failed = any(step.step_exception for step in trace.steps)
+        finished_at = ensure_pendulum_datetime(trace.finished_at)
+        duration = (finished_at - ensure_pendulum_datetime(trace.started_at)).total_seconds()
+        with self._lock:
+            status = "failed" if failed else "completed"
+            self._inc("ferry_runs_total", 1, pipeline=name, status=status)
+            self._set("ferry_run_duration_seconds", duration, pipeline=name)
+            self._set("ferry_last_run_timestamp_seconds", finished_at.timestamp(), pipeline=name)
+            self._normalized_rows.pop(name, None)
+
+    def _add_load_jobs(self, name: str, step_info: Any) -> None:
+        for metrics_list in getattr(step_info, "metrics", {}).values():
+            for metrics in metrics_list:
+                for job in metrics.get("job_metrics", {}).values():
+                    if job.table_name.startswith("_dlt") or job.state != "completed":
+                        continue
+                    duration = (
+                        ensure_pendulum_datetime(job.finished_at)
+                        - ensure_pendulum_datetime(job.started_at)
+                    ).total_seconds()
+                    self._inc("ferry_files_total", 1, pipeline=name, table=job.table_name)
+                    self._inc(
+                        "ferry_load_job_duration_seconds_sum",
+                        duration,
+                        pipeline=name,
+                        table=job.table_name,
+                    )
+                    self._inc(
+                        "ferry_load_job_duration_seconds_count",
+                        1,
+                        pipeline=name,
+                        table=job.table_name,
+                    )
+
+    def _rows_in_progress(self) -> Dict[Labels, float]:
+        registry = get_metrics_registry()
+        samples = {}
+        for name in registry.pipelines():
+            metrics = registry.get(name)
+            for step, step_metrics in (metrics or {}).get("metrics", {}).items():
+                if step_metrics["status"] != "processing":
+                    continue
+                for resource in step_metrics["resource_metrics"]:
+                    labels = (("pipeline", name), ("step", step), ("table", resource["name"]))
+                    samples[labels] = resource.get("row_count", 0)
+        return samples
+
+    def _inc(self, name: str, value: float, **labels: str) -> None:
+        samples = self._samples.setdefault(name, {})
+        key = tuple(labels.items())
+        samples[key] = samples.get(key, 0) + value
+
+    def _set(self, name: str, value: float, **labels: str) -> None:
+        self._samples[name][tuple(labels.items())] = value
+
+
+_prometheus_exporter: Optional[PrometheusExporter] = None
+_prometheus_exporter_lock = threading.Lock()
+
+
+def get_prometheus_exporter() -> PrometheusExporter:
+    """Returns the exporter of this process, registering it with dlt on first use."""
+    global _prometheus_exporter
+    with _prometheus_exporter_lock:
+        if _prometheus_exporter is None:
+            _prometheus_exporter = PrometheusExporter()
+            dlt_trace.TRACKING_MODULES.append(_prometheus_exporter)
+        return _prometheus_exporter
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = get_prometheus_exporter().render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def start_metrics_server(port: int) -> ThreadingHTTPServer:
+    """Serves /metrics on a background thread, for servers without an HTTP endpoint."""
+    server = ThreadingHTTPServer(("", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="ferry-metrics", daemon=True).start()
+    logger.info(f"Serving Prometheus metrics on port {port}")
+    return server
@@ -0,0 +1,97 @@
+import copy
+import threading
+from typing import Any, Dict, List, Optional
+import pendulum
+from dlt.pipeline import trace as dlt_trace
+from ferry.src.pipeline_metrics import PipelineMetrics
+
+STEPS = ("extract", "normalize", "load")
+
+
+class MetricsRegistry:
+    """Live metrics of the pipelines run by this process, kept in memory.
+
+    Registered as a dlt tracking module, it rebuilds a pipeline's metrics from the trace
+    whenever a run starts or a step ends. FerryLogCollector publishes row counts of the
+    running step in between. Readers get a copy without touching the pipeline on disk.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, identity: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            metrics = self._metrics.get(identity)
+            return copy.deepcopy(metrics) if metrics else None
+
+    def pipelines(self) -> List[str]:
+        with self._lock:
+            return list(self._metrics)
+
+    def publish_live(self, identity: str, step: str, table_stats: Dict[str, int]) -> None:
+        """Sets the rows processed so far by the running step of a pipeline."""
+        with self._lock:
+            metrics = self._metrics.get(identity)
+            if not metrics or metrics["metrics"][step]["status"] != "processing":
+                return
+            metrics["metrics"][step]["resource_metrics"] = [
+                {"name": name, "row_count": count} for name, count in table_stats.items()
+            ]
+
+    def on_start_trace(self, trace: Any, step: str, pipeline: Any) -> None:
+        metrics = PipelineMetrics.metrics_from_trace(
+            pipeline.pipeline_name, _destination_type(pipeline), trace
+        )
+        with self._lock:
+            self._metrics[pipeline.pipeline_name] = metrics
+
+    def on_start_trace_step(self, trace: Any, step: str, pipeline: Any) -> None:
+        if step not in STEPS:
+            return
+        with self._lock:
+            metrics = self._metrics.get(pipeline.pipeline_name)
+            if metrics:
+                metrics["metrics"][step]["status"] = "processing"
+                metrics["metrics"][step]["start_time"] = pendulum.now()
+
+    def on_end_trace_step(
+        self, trace: Any, step: Any, pipeline: Any, step_info: Any, send_state: bool
+    ) -> None:
+        self._update(trace, pipeline)
+
+    def on_end_trace(self, trace: Any, pipeline: Any, send_state: bool) -> None:
+        self._update(trace, pipeline)
+
+    def _update(self, trace: Any, pipeline: Any) -> None:
+        metrics = PipelineMetrics.metrics_from_trace(
+            pipeline.pipeline_name, _destination_type(pipeline), trace
+        )
+        with self._lock:
+            self._metrics[pipeline.pipeline_name] = metrics
+
+
+def _destination_type(pipeline: Any) -> Optional[str]:
+    return pipeline.destination.destination_name if pipeline.destination else None
+
+
+_metrics_registry: Optional[MetricsRegistry] = None
+_metrics_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Returns the registry of this process, registering it with dlt on first use."""
+    global _metrics_registry
+    with _metrics_registry_lock:
+        if _metrics_registry is None:
+            _metrics_registry = MetricsRegistry()
+            dlt_trace.TRACKING_MODULES.append(_metrics_registry)
+        return _metrics_registry
+
+
+def get_pipeline_metrics(identity: str) -> Dict[str, Any]:
+    """Metrics of a pipeline, read from disk only when this process has not run it."""
+    metrics = get_metrics_registry().get(identity)
+    if metrics is not None:
+        return metrics
+    return PipelineMetrics(name=identity).generate_metrics()
@@ -1,35 +1,75 @@
+import os
+import threading
+from typing import Optional
 import dlt
 import logging
 import dlt.cli
-from ferry.src.data_models.ingest_model import IngestModel
+from dlt.common.configuration.providers import EnvironProvider
+from dlt.extract.source import DltSource
+from ferry.src.connection_pool import ConnectionLeases, ConnectionPool
+from ferry.src.data_models.ingest_model import IngestModel, RunMode
+from ferry.src.data_models.performance_config_model import PerformanceConfig
 from ferry.src.destination_factory import DestinationFactory
 from ferry.src.source_factory import SourceFactory
 from ferry.src.log_collector import FerryLogCollector
+from ferry.src.metrics_exporter import get_prometheus_exporter
+from ferry.src.metrics_registry import get_metrics_registry
+from ferry.src.profiler import RunProfiler
+from ferry.src.progress_tracker import ProgressListener, get_progress_tracker
 
 logger = logging.getLogger(__name__)
 
+PROFILE_DIR = "profile"
+
 
 class PipelineBuilder:
     @classmethod
     def get_pipeline(cls, name: str):
         return dlt.pipeline(pipeline_name=name)
 
-    def __init__(self, model: IngestModel):
+    def __init__(
+        self,
+        model: IngestModel,
+        progress_listener: Optional[ProgressListener] = None,
+        connection_pool: Optional[ConnectionPool] = None,
+    ):
         self.model = model
+        self.progress_listener = progress_listener
         self.destination = DestinationFactory.get(self.model.destination_uri)
         self.source = SourceFactory.get(self.model.source_uri)
+        self.source.continuous = self.model.continuous
+        # Micro-batches of a continuous run reuse their connections even outside the servers
+        self._own_pool = None
+        if connection_pool is None and self.model.continuous:
+            connection_pool = self._own_pool = ConnectionPool()
+        # Connections of the run are handed back to the pool, or closed without one
+        self.connections = ConnectionLeases(connection_pool)
+        self.source.connections = self.connections
+        self._stopped = threading.Event()
         self.source_resources = []
+        self.profiler = None
+        self.profile_report_path = None
+        if self.model.profile:
+            self.profiler = RunProfiler(self.model.identity, self.model.profile.profiler)
+            self.source.profiler = self.profiler
 
     def build(self):
         """Builds the pipeline with multiple resources."""
         try:
             destination = self.destination.dlt_target_system(self.model.destination_uri)
+            self._apply_performance_config()
+            # Registers the exporter with dlt so the run's steps are counted
+            get_prometheus_exporter()
 
             self.pipeline = dlt.pipeline(
                 pipeline_name=self.model.identity,
                 dataset_name=self.model.get_dataset_name(self.destination.default_schema_name()),
                 destination=destination,
-                progress=FerryLogCollector(identity=self.model.identity),
+                progress=FerryLogCollector(
+                    identity=self.model.identity,
+                    progress_listener=self.progress_listener,
+                    metrics_registry=get_metrics_registry(),
+                ),
                 # export_schema_path="schemas",
                 # refresh="drop_resources",
             )
@@ -40,28 +80,100 @@ class PipelineBuilder:
 
     def run(self):
         """Runs the pipeline with multiple resources."""
+        if self.profiler:
+            self.profiler.start()
+        step_listener = self._step_listener()
+        if step_listener:
+            get_progress_tracker().subscribe(self.model.identity, step_listener)
         try:
-            source_resources = []
-
-            for resource_config in self.model.resources:
-                source_resource = self.source.dlt_source_system(
-                    uri=self.model.source_uri,
-                    resources=[resource_config],
-                    identity=self.model.identity,
-                )
-                source_resources.append(source_resource)
-
-            run_info = self.pipeline.run(data=source_resources)
-            logger.info(run_info.metrics)
-            logger.info(run_info.load_packages)
-            logger.info(run_info.writer_metrics_asdict)
+            while True:
+                self._run_once()
+                # Continuous runs load one package per micro-batch until stopped
+                if not self.model.continuous or self._stopped.is_set():
+                    break
+                self.connections.release_all()
 
         except Exception as e:
             logger.exception(f"Unexpected error in full load: {e}")
             raise e
+        finally:
+            self.connections.release_all()
+            if self._own_pool:
+                self._own_pool.close()
+            if step_listener:
+                get_progress_tracker().unsubscribe(self.model.identity)
+            if self.profiler:
+                self._write_profile_report()
+
+    def stop(self):
+        """Ends a continuous run once its current micro-batch is loaded."""
+        self._stopped.set()
+
+    def _run_once(self):
+        if self.model.run_mode == RunMode.PER_RESOURCE:
+            source_resources = self._build_per_resource_sources()
+        else:
+            source = self._build_source_resources()
+            # Profilers only see the thread they run in, so profiled resources are read
+            # one after another in the pipeline's thread
+            profiled = self.profiler and self.profiler.profiler
+            if isinstance(source, DltSource) and not profiled:
+                # Lets dlt extract all resources of the shared source concurrently
+                source.parallelize()
+            source_resources = [source]
+
+        run_info = self.pipeline.run(data=source_resources)
+        self.source.on_load_completed()
+        logger.info(run_info.metrics)
+        logger.info(run_info.load_packages)
+        logger.info(run_info.writer_metrics_asdict)
+
+    def _step_listener(self) -> Optional[ProgressListener]:
+        """Combines the progress listener with the profiler's, both follow the run's steps"""
+        if not self.profiler:
+            return self.progress_listener
+        if not self.progress_listener:
+            return self.profiler.on_progress
+
+        def listener(event):
+            self.profiler.on_progress(event)
+            self.progress_listener(event)
+
+        return listener
+
+    def _write_profile_report(self):
+        self.profiler.finish()
+        try:
+            directory = os.path.join(self.pipeline.working_dir, PROFILE_DIR)
+            self.profile_report_path = self.profiler.write_report(directory)
+            logger.info(f"Profile report written to {self.profile_report_path}")
+        except Exception as e:
+            logger.exception(f"Failed to write profile report: {e}")
+
+    def _apply_performance_config(self):
+        """Scopes worker and buffer settings to this pipeline's config section"""
+        performance = self.model.performance or PerformanceConfig()
+        for path, value in performance.build_config().items():
+            *sections, key = path.split(".")
+            env_key = EnvironProvider.get_key_name(key, self.model.identity, *sections)
+            if value is None:
+                os.environ.pop(env_key, None)
+            else:
+                os.environ[env_key] = str(value)
+
+    def _build_per_resource_sources(self):
+        """Builds one dlt source per resource"""
+        return [
+            self.source.dlt_source_system(
+                uri=self.model.source_uri,
+                resources=[resource_config],
+                identity=self.model.identity,
+            )
+            for resource_config in self.model.resources
+        ]
 
     def _build_source_resources(self):
-        """Builds a list of dlt resources"""
+        """Builds a single dlt source holding all resources"""
         self.source_resources = self.source.dlt_source_system(
             identity=self.model.identity,
             uri=self.model.source_uri,
@@ -1,10 +1,10 @@
-import json
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 import dlt
 from dlt.common.pipeline import LoadInfo, NormalizeInfo, ExtractInfo
 from dlt.common.time import ensure_pendulum_datetime
 import os
 import logging
+from ferry.src.log_collector import read_last_log
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,8 +19,7 @@ class PipelineMetrics:
 
     def _load_live_metrics_from_log(self, metrics: Dict[str, Any]) -> None:
         try:
-            with open(f"logs/{self.pipeline_name}.jsonl", "r", encoding="utf-8") as f:
-                log_data = json.load(f)
+            log_data = read_last_log(f"logs/{self.pipeline_name}.jsonl") or {}
 
             metrics["status"] = "processing"
             for step in ["extract", "normalize", "load"]:
@@ -62,22 +61,7 @@ class PipelineMetrics:
             return self._default_metrics(error=error_msg)
             # return self._default_metrics(error=str(e))
 
-        metrics = {
-            "pipeline_name": self.pipeline_name,
-            "source_type": None,
-            "destination_type": self.pipeline.destination.destination_name
-            if self.pipeline.destination
-            else None,
-            "start_time": None,
-            "end_time": None,
-            "status": "unknown",
-            "error": None,
-            "metrics": {
-                "extract": self._get_step_metrics("extract"),
-                "normalize": self._get_step_metrics("normalize"),
-                "load": self._get_step_metrics("load"),
-            },
-        }
+        metrics = self._default_metrics()
 
         current_trace = self.pipeline._trace
         if current_trace:
@@ -95,7 +79,17 @@ class PipelineMetrics:
             metrics["error"] = f"Pipeline '{self.pipeline_name}' not found"
         return metrics
 
-    def _update_metrics_from_trace(self, metrics: Dict[str, Any], trace: Any) -> None:
+    @classmethod
+    def metrics_from_trace(
+        cls, pipeline_name: str, destination_type: Optional[str], trace: Any
+    ) -> Dict[str, Any]:
+        """Builds the metrics of a run from its trace, without attaching to the pipeline."""
+        metrics = cls.empty_metrics(pipeline_name, destination_type)
+        cls._update_metrics_from_trace(metrics, trace)
+        return metrics
+
+    @classmethod
+    def _update_metrics_from_trace(cls, metrics: Dict[str, Any], trace: Any) -> None:
         """Update metrics from pipeline trace data"""
         metrics["start_time"] = ensure_pendulum_datetime(trace.started_at)
         metrics["end_time"] = (
@@ -128,27 +122,36 @@ class PipelineMetrics:
                 step_metrics["error"] = step.step_exception
 
                 if step.step_info:
-                    self._update_step_info_metrics(step_name, step.step_info, step_metrics)
+                    cls._update_step_info_metrics(step_name, step.step_info, step_metrics)
 
     def _default_metrics(self, error: str = None) -> Dict[str, Any]:
+        return self.empty_metrics(
+            self.pipeline_name,
+            self.pipeline.destination.destination_name if self.pipeline.destination else None,
+            error,
+        )
+
+    @classmethod
+    def empty_metrics(
+        cls, pipeline_name: str, destination_type: Optional[str], error: str = None
+    ) -> Dict[str, Any]:
         return {
-            "pipeline_name": self.pipeline_name,
+            "pipeline_name": pipeline_name,
             "source_type": None,
-            "destination_type": self.pipeline.destination.destination_name
-            if self.pipeline.destination
-            else None,
+            "destination_type": destination_type,
             "start_time": None,
             "end_time": None,
             "status": "error" if error else "unknown",
             "error": error,
             "metrics": {
-                "extract": self._get_step_metrics("extract"),
-                "normalize": self._get_step_metrics("normalize"),
-                "load": self._get_step_metrics("load"),
+                "extract": cls._get_step_metrics("extract"),
+                "normalize": cls._get_step_metrics("normalize"),
+                "load": cls._get_step_metrics("load"),
             },
         }
 
-    def _get_step_metrics(self, step_name: str) -> Dict[str, Any]:
+    @staticmethod
+    def _get_step_metrics(step_name: str) -> Dict[str, Any]:
         return {
             "start_time": None,
             "end_time": None,
@@ -157,19 +160,19 @@ class PipelineMetrics:
             "resource_metrics": [],
         }
 
+    @classmethod
     def _update_step_info_metrics(
-        self, step_name: str, step_info: Any, metrics_dict: Dict[str, Any]
+        cls, step_name: str, step_info: Any, metrics_dict: Dict[str, Any]
     ) -> None:
         if step_name == "extract" and isinstance(step_info, ExtractInfo):
-            self._add_extract_metrics(step_info, metrics_dict)
+            cls._add_extract_metrics(step_info, metrics_dict)
         elif step_name == "normalize" and isinstance(step_info, NormalizeInfo):
-            self._add_normalize_metrics(step_info, metrics_dict)
+            cls._add_normalize_metrics(step_info, metrics_dict)
         elif step_name == "load" and isinstance(step_info, LoadInfo):
-            self._add_load_metrics(step_info, metrics_dict)
+            cls._add_load_metrics(step_info, metrics_dict)
 
-    def _add_extract_metrics(
-        self, step_info: ExtractInfo | Any, metrics_dict: Dict[str, Any]
-    ) -> None:
+    @staticmethod
+    def _add_extract_metrics(step_info: ExtractInfo | Any, metrics_dict: Dict[str, Any]) -> None:
         for load_id, metrics_list in step_info.metrics.items():
             for metrics in metrics_list:
                 if "resource_metrics" in metrics:
@@ -192,8 +195,9 @@ class PipelineMetrics:
                         f"No resource_metrics found in extract metrics for load_id '{load_id}'"
                     )
 
+    @staticmethod
     def _add_normalize_metrics(
-        self, step_info: NormalizeInfo | Any, metrics_dict: Dict[str, Any]
+        step_info: NormalizeInfo | Any, metrics_dict: Dict[str, Any]
     ) -> None:
         for load_id, metrics_list in step_info.metrics.items():
             for metrics in metrics_list:
@@ -209,7 +213,8 @@ class PipelineMetrics:
                             }
                         )
 
-    def _add_load_metrics(self, step_info: LoadInfo | Any, metrics_dict: Dict[str, Any]) -> None:
+    @staticmethod
+    def _add_load_metrics(step_info: LoadInfo | Any, metrics_dict: Dict[str, Any]) -> None:
         for load_id, metrics_list in step_info.metrics.items():
             for metrics in metrics_list:
                 if "job_metrics" in metrics:
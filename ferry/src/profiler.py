@@ -0,0 +1,186 @@
+import cProfile
+import io
+import os
+import pstats
+import shutil
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from ferry.src.data_models.profile_config_model import Profiler
+from ferry.src.data_models.profile_model import ProfileReport, ResourceProfile, StepProfile
+from ferry.src.data_models.progress_model import ProgressEvent
+from ferry.src.data_models.response_models import JobStatus
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+REPORT_FILE = "report.json"
+
+
+def _item_rows(item: Any) -> int:
+    if isinstance(item, dict):
+        return 1
+    if pa is not None and isinstance(item, (pa.Table, pa.RecordBatch)):
+        return item.num_rows
+    try:
+        return len(item)
+    except TypeError:
+        return 1
+
+
+class RunProfiler:
+    """Times a pipeline run per dlt step and per resource, optionally under a profiler.
+
+    Resources are timed around every item their generator yields. Reads are the time spent
+    in the source iterator, transforms the remaining time of the generator.
+    """
+
+    def __init__(self, identity: str, profiler: Optional[Profiler] = None):
+        self.identity = identity
+        self.profiler = profiler
+        self._lock = threading.Lock()
+        self._started = (time.perf_counter(), time.process_time())
+        self._finished: Optional[Tuple[float, float]] = None
+        self._step_starts: Dict[str, Tuple[float, float]] = {}
+        self._steps: Dict[str, StepProfile] = {}
+        # resource: [items, rows, wall, cpu, read wall, read cpu]
+        self._resources: Dict[str, List[float]] = {}
+        self._session: Any = None
+        if profiler == Profiler.CPROFILE:
+            self._session = cProfile.Profile()
+            self._start_session, self._stop_session = self._session.enable, self._session.disable
+        elif profiler == Profiler.PYINSTRUMENT:
+            if pyinstrument is None:
+                raise RuntimeError("pyinstrument is not installed")
+            self._session = pyinstrument.Profiler(async_mode="disabled")
+            self._start_session, self._stop_session = self._session.start, self._session.stop
+
+    def on_progress(self, event: ProgressEvent) -> None:
+        """Progress listener recording when dlt steps start and finish."""
+        if not event.step:
+            return
+        now = (time.perf_counter(), time.process_time())
+        with self._lock:
+            if event.status == JobStatus.RUNNING:
+                self._step_starts.setdefault(event.step, now)
+            elif event.step in self._step_starts:
+                wall, cpu = self._step_starts.pop(event.step)
+                self._steps[event.step] = StepProfile(
+                    wall_seconds=round(now[0] - wall, 3), cpu_seconds=round(now[1] - cpu, 3)
+                )
+
+    def track_reads(self, resource: str, items: Iterable[Any]) -> Iterator[Any]:
+        """Yields the items of a source iterator, timing how long each read takes."""
+        times = self._resource_times(resource)
+        iterator = iter(items)
+        try:
+            while True:
+                wall, cpu = time.perf_counter(), time.thread_time()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    times[4] += time.perf_counter() - wall
+                    times[5] += time.thread_time() - cpu
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+
+    def track_resource(self, resource: str, items: Iterator[Any]) -> Iterator[Any]:
+        """Yields the items of a resource generator, timing and profiling each step of it."""
+        times = self._resource_times(resource)
+        profiled = self._session is not None
+        try:
+            while True:
+                wall, cpu = time.perf_counter(), time.thread_time()
+                if profiled:
+                    self._start_session()
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+                finally:
+                    if profiled:
+                        self._stop_session()
+                    times[2] += time.perf_counter() - wall
+                    times[3] += time.thread_time() - cpu
+                times[0] += 1
+                times[1] += _item_rows(item)
+                yield item
+        finally:
+            items.close()
+
+    def _resource_times(self, resource: str) -> List[float]:
+        with self._lock:
+            return self._resources.setdefault(resource, [0, 0, 0.0, 0.0, 0.0, 0.0])
+
+    def start(self) -> None:
+        self._started = (time.perf_counter(), time.process_time())
+
+    def finish(self) -> None:
+        self._finished = (time.perf_counter(), time.process_time())
+
+    def report(self) -> ProfileReport:
+        finished = self._finished or (time.perf_counter(), time.process_time())
+        resources = {}
+        with self._lock:
+            for name, (items, rows, wall, cpu, read_wall, read_cpu) in self._resources.items():
+                resources[name] = ResourceProfile(
+                    items=items,
+                    rows=rows,
+                    read_wall_seconds=round(read_wall, 3),
+                    read_cpu_seconds=round(read_cpu, 3),
+                    transform_wall_seconds=round(max(wall - read_wall, 0.0), 3),
+                    transform_cpu_seconds=round(max(cpu - read_cpu, 0.0), 3),
+                )
+            steps = dict(self._steps)
+        return ProfileReport(
+            pipeline_name=self.identity,
+            wall_seconds=round(finished[0] - self._started[0], 3),
+            cpu_seconds=round(finished[1] - self._started[1], 3),
+            steps=steps,
+            resources=resources,
+            profiler=self.profiler.value if self.profiler else None,
+        )
+
+    def write_report(self, directory: str) -> str:
+        """Replaces the report and profiler output in directory, returns the report path."""
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        report = self.report()
+        report.profile_files = self._write_profile(directory)
+        path = os.path.join(directory, REPORT_FILE)
+        with open(path, "w") as f:
+            f.write(report.model_dump_json(indent=2))
+        return path
+
+    def _write_profile(self, directory: str) -> List[str]:
+        if self.profiler == Profiler.CPROFILE:
+            stream = io.StringIO()
+            try:
+                stats = pstats.Stats(self._session, stream=stream)
+            except TypeError:
+                # Nothing was profiled, the run failed before extracting
+                return []
+            stats.dump_stats(os.path.join(directory, "resources.prof"))
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+            with open(os.path.join(directory, "resources.txt"), "w") as f:
+                f.write(stream.getvalue())
+            return ["resources.prof", "resources.txt"]
+        if self.profiler == Profiler.PYINSTRUMENT and self._session.last_session:
+            with open(os.path.join(directory, "resources.html"), "w") as f:
+                f.write(self._session.output_html())
+            with open(os.path.join(directory, "resources.txt"), "w") as f:
+                f.write(self._session.output_text())
+            return ["resources.html", "resources.txt"]
+        return []
@@ -0,0 +1,122 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from dlt.pipeline import trace as dlt_trace
+from ferry.src.data_models.progress_model import ProgressEvent, TableProgress
+from ferry.src.data_models.response_models import JobStatus
+
+ProgressListener = Callable[[ProgressEvent], None]
+
+TRACKED_STEPS = ("extract", "normalize", "load")
+
+
+def _rate(rows: int, elapsed: float) -> float:
+    return round(rows / elapsed, 2) if elapsed > 0 else 0.0
+
+
+def step_tables(
+    step: str, step_info: Any, elapsed: float, rows: Dict[str, int]
+) -> List[TableProgress]:
+    """Collects rows and bytes per table from the info dlt returns for a completed step.
+
+    Load jobs do not report row counts, so loaded rows are taken from `rows`, the counts
+    of the normalize step.
+    """
+    table_rows: Dict[str, int] = {}
+    table_bytes: Dict[str, int] = {}
+    if step in ("extract", "normalize"):
+        for step_metrics in getattr(step_info, "metrics", {}).values():
+            for metrics in step_metrics:
+                for table_name, writer in metrics["table_metrics"].items():
+                    table_rows[table_name] = table_rows.get(table_name, 0) + writer.items_count
+                    table_bytes[table_name] = table_bytes.get(table_name, 0) + writer.file_size
+    elif step == "load":
+        for package in getattr(step_info, "load_packages", []):
+            for job in package.jobs.get("completed_jobs", []):
+                table_name = job.job_file_info.table_name
+                table_rows[table_name] = rows.get(table_name, 0)
+                table_bytes[table_name] = table_bytes.get(table_name, 0) + job.file_size
+
+    return [
+        TableProgress(
+            table_name=table_name,
+            rows=count,
+            bytes=table_bytes.get(table_name),
+            rows_per_second=_rate(count, elapsed),
+        )
+        for table_name, count in table_rows.items()
+        if not table_name.startswith("_dlt")
+    ]
+
+
+class ProgressTracker:
+    """dlt tracking module reporting step starts and completions of subscribed pipelines.
+
+    Pipelines are subscribed by name for the duration of a run. Completion events carry
+    the rows and bytes dlt recorded per table in the step.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listeners: Dict[str, ProgressListener] = {}
+        self._normalized_rows: Dict[str, Dict[str, int]] = {}
+
+    def subscribe(self, identity: str, listener: ProgressListener) -> None:
+        with self._lock:
+            self._listeners[identity] = listener
+
+    def unsubscribe(self, identity: str) -> None:
+        with self._lock:
+            self._listeners.pop(identity, None)
+            self._normalized_rows.pop(identity, None)
+
+    def on_start_trace(self, trace: Any, step: str, pipeline: Any) -> None:
+        pass
+
+    def on_start_trace_step(self, trace: Any, step: str, pipeline: Any) -> None:
+        if step in TRACKED_STEPS:
+            self._notify(
+                ProgressEvent(identity=pipeline.pipeline_name, step=step, status=JobStatus.RUNNING)
+            )
+
+    def on_end_trace_step(
+        self, trace: Any, step: Any, pipeline: Any, step_info: Any, send_state: bool
+    ) -> None:
+        if step.step not in TRACKED_STEPS or pipeline.pipeline_name not in self._listeners:
+            return
+        elapsed = (step.finished_at - step.started_at).total_seconds()
+        rows = self._normalized_rows.get(pipeline.pipeline_name, {})
+        tables = step_tables(step.step, step_info, elapsed, rows) if step_info else []
+        if step.step == "normalize":
+            self._normalized_rows[pipeline.pipeline_name] = {t.table_name: t.rows for t in tables}
+        self._notify(
+            ProgressEvent(
+                identity=pipeline.pipeline_name,
+                step=step.step,
+                status=JobStatus.FAILED if step.step_exception else JobStatus.COMPLETED,
+                elapsed_seconds=round(elapsed, 2),
+                tables=tables,
+                message=step.step_exception,
+            )
+        )
+
+    def on_end_trace(self, trace: Any, pipeline: Any, send_state: bool) -> None:
+        pass
+
+    def _notify(self, event: ProgressEvent) -> None:
+        listener = self._listeners.get(event.identity)
+        if listener:
+            listener(event)
+
+
+_progress_tracker: Optional[ProgressTracker] = None
+_progress_tracker_lock = threading.Lock()
+
+
+def get_progress_tracker() -> ProgressTracker:
+    """Returns the tracker of this process, registering it with dlt on first use."""
+    global _progress_tracker
+    with _progress_tracker_lock:
+        if _progress_tracker is None:
+            _progress_tracker = ProgressTracker()
+            dlt_trace.TRACKING_MODULES.append(_progress_tracker)
+        return _progress_tracker
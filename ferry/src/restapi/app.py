@@ -1,25 +1,43 @@
+import asyncio
 import logging
 import os
 import dlt
 import yaml
 import time
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, Query, HTTPException
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from ferry.src.data_models.ingest_model import IngestModel
-from ferry.src.data_models.response_models import IngestResponse, LoadStatus, SchemaResponse
-from ferry.src.pipeline_builder import PipelineBuilder
-
-from ferry.src.pipeline_metrics import PipelineMetrics
+from ferry.src.data_models.response_models import (
+    IngestResponse,
+    JobStatus,
+    LoadStatus,
+    SchemaResponse,
+)
+from ferry.src.exceptions import JobQueueFullException
+from ferry.src.job_queue import JobQueue
+
+from ferry.src.metrics_exporter import CONTENT_TYPE, get_prometheus_exporter
+from ferry.src.metrics_registry import get_pipeline_metrics
 from ferry.src.security import SecretsManager
 from ferry.main import SECURE_MODE
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+job_queue = JobQueue()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    job_queue.shutdown(wait=False)
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.exception_handler(RequestValidationError)
@@ -34,34 +52,54 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     return JSONResponse(status_code=422, content={"errors": error_dict})
 
 
-@app.post("/ferry", response_model=IngestResponse)
-def ingest(ingest_model: IngestModel):
-    """API endpoint to ferry data from source to destination"""
-    try:
-        pipeline = PipelineBuilder(model=ingest_model).build()
-        pipeline.run()
-        time.sleep(1.5)  # Allow logs and pipeline registration to settle
-        pipeline_schema_path = os.path.join(".schemas", f"{ingest_model.identity}.schema.yaml")
-        schema_version_hash = None
+@app.post("/ferry", response_model=IngestResponse, status_code=202)
+async def ingest(
+    ingest_model: IngestModel,
+    wait: bool = Query(False, description="Wait for the pipeline run to finish"),
+):
+    """API endpoint to ferry data from source to destination.
 
-        if os.path.exists(pipeline_schema_path):
-            with open(pipeline_schema_path, "r") as f:
-                schema_data = yaml.safe_load(f)
-            schema_version_hash = schema_data.get("version_hash", "")
+    The run is queued and the job id is returned right away, progress is reported by
+    GET /ferry/{identity}/observe. With wait=true the response is sent once the run finished.
+    """
+    try:
+        job = job_queue.submit(ingest_model)
+    except JobQueueFullException as e:
+        return JSONResponse(status_code=429, content={"status": "error", "message": e.message})
 
+    if not wait:
         return IngestResponse(
-            status=LoadStatus.SUCCESS.value,
-            message="Data Ingestion is completed successfully",
-            pipeline_name=pipeline.get_name(),
-            schema_version_hash=schema_version_hash,
+            status=LoadStatus.PROCESSING.value,
+            message="Data Ingestion is queued",
+            pipeline_name=ingest_model.identity,
+            job_id=job.job_id,
         )
-    except Exception as e:
-        logger.exception(f"Error processing: {e}")
+
+    await asyncio.wrap_future(job.future)
+    if job.status == JobStatus.FAILED:
         return JSONResponse(
             status_code=500,
             content={"status": "error", "message": "An internal server error occurred"},
         )
 
+    pipeline_schema_path = os.path.join(".schemas", f"{ingest_model.identity}.schema.yaml")
+    schema_version_hash = None
+    if os.path.exists(pipeline_schema_path):
+        with open(pipeline_schema_path, "r") as f:
+            schema_data = yaml.safe_load(f)
+        schema_version_hash = schema_data.get("version_hash", "")
+
+    return JSONResponse(
+        status_code=200,
+        content=IngestResponse(
+            status=LoadStatus.SUCCESS.value,
+            message="Data Ingestion is completed successfully",
+            pipeline_name=ingest_model.identity,
+            schema_version_hash=schema_version_hash,
+            job_id=job.job_id,
+        ).model_dump(mode="json"),
+    )
+
 
 @app.get("/schema", response_model=SchemaResponse)
 def get_schema(pipeline_name: str = Query(..., description="The name of the pipeline")):
@@ -82,19 +120,35 @@ def get_schema(pipeline_name: str = Query(..., description="The name of the pipe
 @app.get("/ferry/{identity}/observe")
 def observe(identity: str):
     """API endpoint to observe a ferry pipeline"""
-    retries = 3
+    job = job_queue.latest(identity)
+    if job and job.status == JobStatus.QUEUED:
+        return {"pipeline_name": identity, "status": job.status.value, "job": job.to_dict()}
+
+    retries = 1 if job else 3
     delay = 3  # seconds
 
     for attempt in range(retries):
         try:
-            result = PipelineMetrics(name=identity).generate_metrics()
+            result = get_pipeline_metrics(identity)
 
             if result["status"] == "error" or "not found" in (result.get("error") or "").lower():
+                if job:
+                    # The run has not registered the pipeline yet or failed before it could
+                    return {
+                        "pipeline_name": identity,
+                        "status": job.status.value,
+                        "error": job.error,
+                        "job": job.to_dict(),
+                    }
                 if attempt < retries - 1:
                     time.sleep(delay)
                     continue
                 raise HTTPException(status_code=404, detail=f"Pipeline '{identity}' not found")
 
+            if job:
+                result["status"] = job.status.value
+                result["error"] = job.error or result.get("error")
+                result["job"] = job.to_dict()
             return result
 
         except HTTPException as e:
@@ -112,6 +166,12 @@ def observe(identity: str):
             )
 
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics of all pipelines run by this server"""
+    return Response(content=get_prometheus_exporter().render(), media_type=CONTENT_TYPE)
+
+
 @app.middleware("http")
 async def auth_middleware(request: Request, call_next):
     if SECURE_MODE:
@@ -0,0 +1,174 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, IO, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from dlt.common.pipeline import get_dlt_pipelines_dir
+from ferry.src.data_models.ingest_model import IngestModel
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_RUNS = 4
+POLL_INTERVAL = 1.0
+
+
+def destination_key(uri: str) -> str:
+    """Identifies a destination instance without credentials.
+
+    e.g. snowflake://account/db?warehouse=wh
+    """
+    parsed = urlparse(uri)
+    key = f"{parsed.scheme}://{parsed.hostname or ''}"
+    if parsed.port:
+        key += f":{parsed.port}"
+    key += parsed.path
+    warehouse = parse_qs(parsed.query).get("warehouse")
+    if warehouse:
+        key += f"?warehouse={warehouse[0]}"
+    return key
+
+
+def parse_destination_limits(value: Optional[str]) -> Dict[str, int]:
+    """Parses limits such as "snowflake=4,clickhouse=8" keyed by destination scheme."""
+    limits = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        scheme, _, limit = item.partition("=")
+        try:
+            limits[scheme.strip()] = int(limit)
+        except ValueError:
+            raise ValueError(f"Invalid destination limit '{item}', expected <scheme>=<limit>")
+        if limits[scheme.strip()] < 1:
+            raise ValueError(f"Invalid destination limit '{item}', limit must be at least 1")
+    return limits
+
+
+class RunSlot:
+    """Admission held by a pipeline run until it is released"""
+
+    def __init__(self, identity: str, destination: str, lock_file: Optional[IO] = None):
+        self.identity = identity
+        self.destination = destination
+        self.lock_file = lock_file
+
+
+class RunScheduler:
+    """Admission control for pipeline runs started by the REST app, gRPC server and CLI.
+
+    A run is admitted when no other run of the same identity is active, fewer than
+    max_concurrent_runs runs are active and its destination is below its limit. Runs of one
+    identity are also serialized across processes with a lock file next to the pipeline
+    working directories. The global and destination limits apply within this process.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_runs: Optional[int] = None,
+        destination_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.max_concurrent_runs = max_concurrent_runs or int(
+            os.getenv("FERRY_MAX_WORKERS", DEFAULT_MAX_CONCURRENT_RUNS)
+        )
+        self.destination_limits = (
+            destination_limits
+            if destination_limits is not None
+            else parse_destination_limits(os.getenv("FERRY_DESTINATION_LIMITS"))
+        )
+        self._condition = threading.Condition()
+        self._identities: set = set()
+        self._destinations: Dict[str, int] = {}
+        self._listeners: List[Callable[[], None]] = []
+
+    @property
+    def running(self) -> int:
+        return len(self._identities)
+
+    def add_release_listener(self, listener: Callable[[], None]) -> None:
+        """Registers a callback invoked whenever a slot is released."""
+        self._listeners.append(listener)
+
+    def try_acquire(self, model: IngestModel) -> Optional[RunSlot]:
+        """Admits the run if all limits allow it, without waiting."""
+        destination = destination_key(model.destination_uri)
+        with self._condition:
+            if model.identity in self._identities:
+                return None
+            if self.running >= self.max_concurrent_runs:
+                return None
+            limit = self.destination_limits.get(urlparse(model.destination_uri).scheme)
+            if limit is not None and self._destinations.get(destination, 0) >= limit:
+                return None
+            locked, lock_file = self._lock_identity(model.identity)
+            if not locked:
+                return None
+            self._identities.add(model.identity)
+            self._destinations[destination] = self._destinations.get(destination, 0) + 1
+        return RunSlot(model.identity, destination, lock_file)
+
+    def acquire(self, model: IngestModel) -> RunSlot:
+        """Waits until the run is admitted."""
+        logged = False
+        with self._condition:
+            while True:
+                slot = self.try_acquire(model)
+                if slot:
+                    return slot
+                if not logged:
+                    logger.info(f"Run of pipeline {model.identity} is waiting for a slot")
+                    logged = True
+                # Woken up by releases in this process, polls for locks held by other processes
+                self._condition.wait(POLL_INTERVAL)
+
+    def release(self, slot: RunSlot) -> None:
+        with self._condition:
+            self._identities.discard(slot.identity)
+            self._destinations[slot.destination] -= 1
+            if not self._destinations[slot.destination]:
+                del self._destinations[slot.destination]
+            if slot.lock_file:
+                slot.lock_file.close()
+            self._condition.notify_all()
+        for listener in self._listeners:
+            listener()
+
+    @contextmanager
+    def run_slot(self, model: IngestModel) -> Iterator[RunSlot]:
+        slot = self.acquire(model)
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+    def _lock_identity(self, identity: str) -> Tuple[bool, Optional[IO]]:
+        """Takes the cross-process lock of an identity unless another process holds it."""
+        if fcntl is None:
+            return True, None
+        lock_dir = os.path.join(get_dlt_pipelines_dir(), ".locks")
+        os.makedirs(lock_dir, exist_ok=True)
+        lock_file = open(os.path.join(lock_dir, f"{identity}.lock"), "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False, None
+        return True, lock_file
+
+
+_run_scheduler: Optional[RunScheduler] = None
+_run_scheduler_lock = threading.Lock()
+
+
+def get_run_scheduler() -> RunScheduler:
+    """Returns the scheduler shared by all runs of this process, configured from the environment."""
+    global _run_scheduler
+    with _run_scheduler_lock:
+        if _run_scheduler is None:
+            _run_scheduler = RunScheduler()
+        return _run_scheduler
@@ -4,7 +4,6 @@ from pathlib import Path
 import hmac
 import hashlib
 import time
-from fastapi import HTTPException
 from pydantic import BaseModel
 
 class ClientSecret(BaseModel):
@@ -47,6 +46,9 @@ class SecretsManager:
     @classmethod
     def verify_request(cls, client_id: str, timestamp: str, signature: str, body: bytes):
         """Verify HMAC signature of incoming request."""
+        # The CLI uses SecretsManager too, only the servers need fastapi loaded
+        from fastapi import HTTPException
+
         creds = cls.get_credentials()
         if creds.client_id != client_id:
             raise HTTPException(401, "Unknown client ID")
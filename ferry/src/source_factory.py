@@ -1,33 +1,28 @@
+import importlib
 from urllib.parse import urlparse
-from ferry.src.sources.azure_storage_source import AzureStorageSource
-from ferry.src.sources.clickhouse_source import ClickhouseSource
-from ferry.src.sources.gcs_source import GCSSource
-from ferry.src.sources.local_file_source import LocalFileSource
-from ferry.src.sources.mongodb_source import MongoDbSource
 from ferry.src.sources.source_base import SourceBase
 from ferry.src.exceptions import InvalidSourceException
-from ferry.src.sources.s3_source import S3Source  # Import S3Source
-from ferry.src.sources.confluent_kafka_source import KafkaSource
-from ferry.src.sources.sql_db_source import SqlDbSource  # Import S3Source
 
 
 class SourceFactory:
+    # scheme: (module, class). Modules are imported on first use so a run only loads the
+    # drivers of its own source
     _items = {
-        "postgres": SqlDbSource,
-        "postgresql": SqlDbSource,
-        "duckdb": SqlDbSource,
-        "s3": S3Source,
-        "sqlite": SqlDbSource,
-        "clickhouse": ClickhouseSource,
-        "mysql": SqlDbSource,
-        "mssql": SqlDbSource,
-        "mariadb": SqlDbSource,
-        "snowflake": SqlDbSource,
-        "mongodb": MongoDbSource,
-        "az": AzureStorageSource,
-        "gs": GCSSource,
-        "file": LocalFileSource,
-        "kafka": KafkaSource,
+        "postgres": ("ferry.src.sources.sql_db_source", "SqlDbSource"),
+        "postgresql": ("ferry.src.sources.sql_db_source", "SqlDbSource"),
+        "duckdb": ("ferry.src.sources.sql_db_source", "SqlDbSource"),
+        "s3": ("ferry.src.sources.s3_source", "S3Source"),
+        "sqlite": ("ferry.src.sources.sql_db_source", "SqlDbSource"),
+        "clickhouse": ("ferry.src.sources.clickhouse_source", "ClickhouseSource"),
+        "mysql": ("ferry.src.sources.sql_db_source", "SqlDbSource"),
+        "mssql": ("ferry.src.sources.sql_db_source", "SqlDbSource"),
+        "mariadb": ("ferry.src.sources.sql_db_source", "SqlDbSource"),
+        "snowflake": ("ferry.src.sources.sql_db_source", "SqlDbSource"),
+        "mongodb": ("ferry.src.sources.mongodb_source", "MongoDbSource"),
+        "az": ("ferry.src.sources.azure_storage_source", "AzureStorageSource"),
+        "gs": ("ferry.src.sources.gcs_source", "GCSSource"),
+        "file": ("ferry.src.sources.local_file_source", "LocalFileSource"),
+        "kafka": ("ferry.src.sources.confluent_kafka_source", "KafkaSource"),
     }
 
     @staticmethod
@@ -35,7 +30,8 @@ class SourceFactory:
         """Get the appropriate source object based on the URI"""
         parsed_uri = urlparse(uri)
         if parsed_uri.scheme in SourceFactory._items:
-            class_ = SourceFactory._items.get(parsed_uri.scheme)
-            return class_()  # Pass the URI to the class constructor
+            module_name, class_name = SourceFactory._items[parsed_uri.scheme]
+            class_ = getattr(importlib.import_module(module_name), class_name)
+            return class_()
         else:
             raise InvalidSourceException(f"Invalid source URI scheme: {parsed_uri.scheme}")
@@ -2,6 +2,7 @@
 Example URI:
 
 kafka://localhost:9092?group_id=mygroup&security_protocol=PLAINTEXT&use_avro=true&schema_registry=http://localhost:8081
+kafka://localhost:9092?group_id=mygroup&security_protocol=PLAINTEXT&value_format=protobuf&schema_registry=http://localhost:8081
 
 Input:
 {
@@ -27,28 +28,136 @@ Input:
 
 """
 
+import io
+import queue
+import threading
 import time
 import dlt
 import logging
-from typing import Iterator, List, Dict, Any
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from dlt.extract.source import DltSource
 from ferry.src.sources.source_base import SourceBase
-from ferry.src.data_models.ingest_model import ResourceConfig
+from ferry.src.data_models.ingest_model import (
+    DataItemFormat,
+    ResourceConfig,
+    WriteDispositionType,
+)
 from urllib.parse import urlparse, parse_qs
-from confluent_kafka import Consumer, TopicPartition
-from dlt.extract.incremental import Incremental
-from confluent_kafka.serialization import SerializationContext, MessageField
+from confluent_kafka import (
+    OFFSET_BEGINNING,
+    OFFSET_END,
+    Consumer,
+    KafkaError,
+    Message,
+    TopicPartition,
+)
 from confluent_kafka.schema_registry import SchemaRegistryClient
-from confluent_kafka.schema_registry.avro import AvroDeserializer
-import json
+from ferry.src.sources.kafka_decoders import REGISTRY_DECODERS, RegistryDecoder
+
+try:
+    import pyarrow as pa
+    import pyarrow.json as pa_json
+except ImportError:
+    pa = None
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BATCH_TIMEOUT = 5.0
+# Seconds consume() waits for messages
+POLL_TIMEOUT = 1.0
+# Resource state key holding {topic: {partition: next offset to read}}
+STATE_OFFSETS_KEY = "kafka_offsets"
+
+
+class RunBounds:
+    """Where a run stops reading a topic, shared by the consumers of its partitions.
+
+    A run stops at the end offsets its partitions had when it started, after max_messages
+    messages or after max_duration seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        stop_at_end: bool = False,
+        max_messages: Optional[int] = None,
+        max_duration: Optional[float] = None,
+    ):
+        self.stop_at_end = stop_at_end
+        self.max_messages = max_messages
+        self.max_duration = max_duration
+        # partition: offset the run stops at, only partitions with messages left to read
+        self.end_offsets: Optional[Dict[int, int]] = None
+        self._messages_left = max_messages
+        self._deadline: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def bounded(self) -> bool:
+        return self.stop_at_end or self.max_messages is not None or self.max_duration is not None
+
+    def start(self, end_offsets: Optional[Dict[int, int]] = None) -> None:
+        self.end_offsets = end_offsets
+        if self.max_duration is not None:
+            self._deadline = time.monotonic() + self.max_duration
+
+    def time_left(self) -> Optional[float]:
+        return None if self._deadline is None else self._deadline - time.monotonic()
+
+    def take(self, count: int) -> int:
+        """Reserves up to count messages of the run, returns how many may be read."""
+        if self._messages_left is None:
+            return count
+        with self._lock:
+            taken = min(count, self._messages_left)
+            self._messages_left -= taken
+            return taken
+
+    def give_back(self, count: int) -> None:
+        if self._messages_left is not None and count:
+            with self._lock:
+                self._messages_left += count
+
 
 class KafkaSource(SourceBase):
     def __init__(self):
         """Initialize Kafka source without needing the URI at instantiation."""
         super().__init__()
+        # topic: {partition: next offset to read}, filled as batches are read
+        self.offsets: Dict[str, Dict[int, int]] = {}
+        self._consumer_confs: Dict[str, Dict[str, Any]] = {}
+        # topic: consumers that read it, held until the run's offsets are committed
+        self._readers: Dict[str, List[Consumer]] = {}
+        # Topics of appending and merging resources, which resume from their stored offsets
+        self._resumed_topics: set = set()
+
+    def on_load_completed(self) -> None:
+        """Commits the offsets read by the run to the consumer group once they are loaded.
+
+        Runs resume from the offsets in the resource state, the committed offsets let Kafka
+        tooling report the group's lag. Topics loaded with the replace disposition are read
+        from start_from again by every run, so their offsets are not committed.
+        """
+        for topic, offsets in self.offsets.items():
+            readers = self._readers.pop(topic, [])
+            try:
+                if not offsets or topic not in self._resumed_topics:
+                    continue
+                # Committed by a consumer that read the topic, it is already in the group
+                consumer = readers[0] if readers else self._consumer(self._consumer_confs[topic])
+                if not readers:
+                    readers.append(consumer)
+                consumer.commit(
+                    offsets=[TopicPartition(topic, p, o) for p, o in sorted(offsets.items())],
+                    asynchronous=False,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to commit offsets of topic {topic}: {e}")
+            finally:
+                for consumer in readers:
+                    self.connections.release(consumer)
 
     def dlt_source_system(
         self, uri: str, resources: List[ResourceConfig], identity: str
@@ -62,45 +171,85 @@ class KafkaSource(SourceBase):
             batch_size = (
                 source_options.batch_size
                 if source_options and source_options.batch_size is not None
-                else 100
+                else DEFAULT_BATCH_SIZE
             )
             batch_timeout = (
                 source_options.batch_timeout
                 if source_options and source_options.batch_timeout is not None
-                else 5.0
+                else DEFAULT_BATCH_TIMEOUT
+            )
+            data_item_format = (
+                source_options.data_item_format
+                if source_options and source_options.data_item_format is not None
+                else DataItemFormat.OBJECT
             )
+            if data_item_format == DataItemFormat.ARROW and pa is None:
+                raise ValueError("The arrow data_item_format requires pyarrow to be installed")
             start_from = (
                 source_options.start_from
                 if source_options and source_options.start_from is not None
                 else "earliest"
             )
+            bounds = RunBounds(
+                # Continuous runs wait for new messages until their micro-batch is full
+                stop_at_end=(
+                    source_options.stop_at_end
+                    if source_options and source_options.stop_at_end is not None
+                    else not self.continuous
+                ),
+                max_messages=source_options.max_messages if source_options else None,
+                max_duration=source_options.max_duration if source_options else None,
+            )
+            if not bounds.bounded:
+                raise ValueError(
+                    f"Reading Kafka topic {resource_config.source_table_name} would never end, "
+                    "set stop_at_end, max_messages or max_duration"
+                )
 
             topic_name = resource_config.source_table_name
             logger.info(f"Processing Kafka topic: {topic_name}")
+            # Replace resets the resource state, so its runs never resume from stored offsets
+            resume = resource_config.get_write_disposition_type() != WriteDispositionType.REPLACE
+            if resume:
+                self._resumed_topics.add(topic_name)
+            else:
+                logger.info(
+                    f"Kafka topic {topic_name} is read from start_from on every run, "
+                    "use the append or merge write disposition to resume from its offsets"
+                )
 
-            consumer, avro_deserializer = self._create_kafka_consumer(
-                kafka_broker, topic_name, kafka_config, start_from
-            )
-
-            incremental_key = (
-                Incremental(resource_config.incremental_config.incremental_key)
-                if resource_config.incremental_config
-                else None
+            consumer, decoder = self._create_kafka_consumer(kafka_broker, topic_name, kafka_config)
+            partitions = self._list_partitions(consumer, topic_name)
+            consumer_count = min(
+                source_options.consumers if source_options and source_options.consumers else 1,
+                len(partitions),
             )
-
-            kafka_resource = dlt.resource(
-                self._consume_messages(
-                    consumer, topic_name, avro_deserializer, batch_size, batch_timeout
-                ),
-                name=resource_config.destination_table_name,
-                write_disposition="append",
-                primary_key="offset",
-                incremental=incremental_key,
+            # Partitions are dealt round-robin between the consumers
+            groups = [partitions[i::consumer_count] for i in range(consumer_count)]
+            consumers = [consumer] + [
+                self._create_kafka_consumer(kafka_broker, topic_name, kafka_config)[0]
+                for _ in groups[1:]
+            ]
+            self._readers[topic_name] = consumers
+
+            data_iterator = self._read_topic(
+                resource_config.get_destination_table_name(),
+                topic_name,
+                consumers,
+                groups,
+                start_from,
+                decoder,
+                batch_size,
+                batch_timeout,
+                data_item_format,
+                bounds,
+                resume,
             )
-            data_iterator = self._consume_messages(
-                consumer, topic_name, avro_deserializer, batch_size, batch_timeout
+            # Types of the latest registered value schema, under the default subject naming
+            declared_columns = decoder.subject_columns(f"{topic_name}-value") if decoder else None
+            kafka_resource = self._create_dlt_resource(
+                resource_config, data_iterator, declared_columns
             )
-            kafka_resource = self._create_dlt_resource(resource_config, data_iterator)
             resources_list.append(kafka_resource)
 
         return DltSource(
@@ -119,6 +268,9 @@ class KafkaSource(SourceBase):
         if not broker:
             raise ValueError("Missing Kafka broker.")
 
+        # use_avro=true predates value_format and stands for value_format=avro
+        use_avro = query_params.get("use_avro", ["false"])[0].lower() == "true"
+        value_format = query_params.get("value_format", ["avro" if use_avro else "json"])[0]
         kafka_config = {
             "group_id": query_params.get("group_id", [None])[0],
             "security_protocol": query_params.get("security_protocol", ["PLAINTEXT"])[0],
@@ -126,168 +278,494 @@ class KafkaSource(SourceBase):
             "sasl_username": query_params.get("sasl_username", [None])[0],
             "sasl_password": query_params.get("sasl_password", [None])[0],
             "schema_registry": registry_url,
-            "use_avro": query_params.get("use_avro", ["false"])[0].lower() == "true",
+            "value_format": value_format.lower(),
         }
 
         return broker, kafka_config
 
-    def _create_kafka_consumer(
-        self, broker: str, topic: str, config: Dict[str, Any], start_from: str
-    ):
-        avro_deserializer = None
-        if config.get("use_avro"):
+    def _create_kafka_consumer(self, broker: str, topic: str, config: Dict[str, Any]):
+        """Returns an unassigned consumer of topic and the decoder of its values."""
+        decoder = None
+        value_format = config.get("value_format", "json")
+        if value_format != "json":
+            if value_format not in REGISTRY_DECODERS:
+                raise ValueError(
+                    f"Unsupported value_format {value_format}, choose from json, "
+                    f"{', '.join(REGISTRY_DECODERS)}"
+                )
             if not config.get("schema_registry"):
                 raise ValueError(
-                    "Avro deserialization requested but schema_registry URL not provided."
+                    f"{value_format} deserialization requested but schema_registry URL "
+                    "not provided."
                 )
 
             schema_registry_conf = {"url": config["schema_registry"]}
-            schema_registry_client = SchemaRegistryClient(schema_registry_conf)
-            avro_deserializer = AvroDeserializer(
-                schema_registry_client=schema_registry_client, from_dict=lambda obj, ctx: obj
+            decoder_class = REGISTRY_DECODERS[value_format]
+            # Shared so schemas decoded by earlier runs stay cached
+            decoder = self._connection(
+                (f"{value_format}_decoder", config["schema_registry"]),
+                lambda: decoder_class(SchemaRegistryClient(schema_registry_conf)),
             )
 
-        consumer = Consumer(
-            {
-                "bootstrap.servers": broker,
-                "auto.offset.reset": "earliest",
-                "enable.auto.commit": False,
-                "group.id": config.get("group_id", "default_group"),
-                **(
-                    {
-                        "security.protocol": config["security_protocol"],
-                        "sasl.mechanism": config["sasl_mechanisms"],
-                        "sasl.username": config["sasl_username"],
-                        "sasl.password": config["sasl_password"],
-                    }
-                    if config["security_protocol"] != "PLAINTEXT"
-                    else {}
-                ),
-            }
+        consumer_conf = {
+            "bootstrap.servers": broker,
+            "auto.offset.reset": "earliest",
+            "enable.auto.commit": False,
+            # Tells when a partition is read up to its end offset
+            "enable.partition.eof": True,
+            "group.id": config.get("group_id", "default_group"),
+            **(
+                {
+                    "security.protocol": config["security_protocol"],
+                    "sasl.mechanism": config["sasl_mechanisms"],
+                    "sasl.username": config["sasl_username"],
+                    "sasl.password": config["sasl_password"],
+                }
+                if config["security_protocol"] != "PLAINTEXT"
+                else {}
+            ),
+        }
+        self._consumer_confs[topic] = consumer_conf
+        return self._consumer(consumer_conf), decoder
+
+    def _consumer(self, consumer_conf: Dict[str, Any]) -> Consumer:
+        # A consumer serves one run at a time, its partitions are assigned on every run
+        return self._connection(
+            ("kafka", tuple(sorted(consumer_conf.items()))),
+            lambda: Consumer(consumer_conf),
+            close=lambda consumer: consumer.close(),
+            shared=False,
         )
 
+    def _list_partitions(self, consumer: Consumer, topic: str) -> List[int]:
         md = consumer.list_topics(timeout=10)
         if topic not in md.topics:
             raise ValueError(f"Topic '{topic}' not found in Kafka.")
+        return sorted(md.topics[topic].partitions)
 
-        partitions = md.topics[topic].partitions
-        topic_partitions = [TopicPartition(topic, p) for p in partitions]
-        consumer.assign(topic_partitions)
-
-        if start_from == "earliest":
-            for tp in topic_partitions:
-                low, _ = consumer.get_watermark_offsets(tp, timeout=10)
-                tp.offset = low
-                consumer.seek(tp)
-
+    def _assign_partitions(
+        self,
+        consumer: Consumer,
+        topic: str,
+        partitions: List[int],
+        start_from: str,
+        stored_offsets: Optional[Dict[int, int]] = None,
+    ) -> List[TopicPartition]:
+        """Assigns partitions to the consumer, positioned at their stored offsets.
+
+        Partitions without a stored offset are positioned where start_from points. Returns the
+        assigned partitions.
+        """
+        stored_offsets = stored_offsets or {}
+        resumed = [
+            TopicPartition(topic, p, stored_offsets[p]) for p in partitions if p in stored_offsets
+        ]
+        partitions = [p for p in partitions if p not in stored_offsets]
+        if not partitions:
+            topic_partitions = []
         elif start_from == "latest":
-            for tp in topic_partitions:
-                _, high = consumer.get_watermark_offsets(tp, timeout=10)
-                tp.offset = high
-                consumer.seek(tp)
-
+            topic_partitions = [TopicPartition(topic, p, OFFSET_END) for p in partitions]
         elif start_from.startswith("timestamp:"):
             try:
                 ts = int(start_from.split("timestamp:")[1])
-                timestamps = [TopicPartition(topic, p, ts) for p in partitions]
-                offsets = consumer.offsets_for_times(timestamps, timeout=10)
-                for tp in offsets:
-                    if tp.offset != -1:
-                        consumer.seek(tp)
+                topic_partitions = consumer.offsets_for_times(
+                    [TopicPartition(topic, p, ts) for p in partitions], timeout=10
+                )
             except Exception as e:
                 raise ValueError(f"Failed to interpret timestamp in start_from: {e}")
+            # Partitions without messages after the timestamp start at their end
+            for tp in topic_partitions:
+                if tp.offset < 0:
+                    tp.offset = OFFSET_END
         else:
-            consumer.assign(topic_partitions)  # default
+            topic_partitions = [TopicPartition(topic, p, OFFSET_BEGINNING) for p in partitions]
+        consumer.assign(resumed + topic_partitions)
+        return resumed + topic_partitions
+
+    def _end_offsets(
+        self, consumer: Consumer, topic_partitions: List[TopicPartition]
+    ) -> Dict[int, int]:
+        """Returns the high watermarks of the partitions with messages past their start."""
+        end_offsets = {}
+        for tp in topic_partitions:
+            low, high = consumer.get_watermark_offsets(
+                TopicPartition(tp.topic, tp.partition), timeout=10
+            )
+            # Stored offsets may predate the retention of the partition
+            start = high if tp.offset == OFFSET_END else max(tp.offset, low)
+            if start < high:
+                end_offsets[tp.partition] = high
+        return end_offsets
 
-        return consumer, avro_deserializer
+    def _read_topic(
+        self,
+        resource_name: str,
+        topic: str,
+        consumers: List[Consumer],
+        groups: List[List[int]],
+        start_from: str,
+        decoder,
+        batch_size: int,
+        batch_timeout: float,
+        data_item_format: DataItemFormat,
+        bounds: RunBounds,
+        resume: bool = True,
+    ) -> Iterator[Any]:
+        """Reads the topic from the offsets stored in the resource state, keeping them current.
+
+        dlt stores the state in the load package of the batches it covers. A run failing while
+        reading keeps the previous offsets, and a package that failed to load is loaded by the
+        next run before it reads on, so messages are neither skipped nor loaded twice. Without
+        resume the topic is read from start_from and no offsets are stored.
+        """
+        if resume:
+            state = dlt.current.resource_state(resource_name)
+            # State keys are strings once loaded from JSON
+            stored = state.setdefault(STATE_OFFSETS_KEY, {}).setdefault(topic, {})
+        else:
+            stored = {}
+        stored_offsets = {int(partition): offset for partition, offset in stored.items()}
+        end_offsets = {} if bounds.stop_at_end else None
+        for consumer, group in zip(consumers, groups):
+            assigned = self._assign_partitions(consumer, topic, group, start_from, stored_offsets)
+            if bounds.stop_at_end:
+                end_offsets.update(self._end_offsets(consumer, assigned))
+        if end_offsets is not None:
+            logger.info(f"Reading topic {topic} up to offsets {end_offsets}")
+        bounds.start(end_offsets)
+
+        offsets = self.offsets.setdefault(topic, {})
+        if len(consumers) > 1:
+            logger.info(
+                f"Reading {sum(len(group) for group in groups)} partitions of topic {topic} "
+                f"with {len(consumers)} consumers"
+            )
+            batches = self._consume_partitioned(
+                consumers,
+                topic,
+                decoder,
+                batch_size,
+                batch_timeout,
+                data_item_format,
+                offsets,
+                bounds,
+            )
+        else:
+            batches = self._consume_messages(
+                consumers[0],
+                topic,
+                decoder,
+                batch_size,
+                batch_timeout,
+                data_item_format,
+                offsets,
+                bounds,
+            )
+        try:
+            for batch in batches:
+                stored.update((str(partition), offset) for partition, offset in offsets.items())
+                yield batch
+            # Skipped messages at the end of a partition are not read again either
+            stored.update((str(partition), offset) for partition, offset in offsets.items())
+        finally:
+            batches.close()
 
     def _consume_messages(
         self,
         consumer: Consumer,
         topic: str,
-        avro_deserializer,
-        batch_size: int = 100,
-        batch_timeout: float = 5.0,
-    ) -> Iterator[Dict[str, Any]]:
+        decoder,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_timeout: float = DEFAULT_BATCH_TIMEOUT,
+        data_item_format: DataItemFormat = DataItemFormat.OBJECT,
+        offsets: Optional[Dict[int, int]] = None,
+        bounds: Optional[RunBounds] = None,
+    ) -> Iterator[Any]:
+        """Yields batches of up to batch_size messages as lists of rows or Arrow tables.
+
+        Messages are fetched with consume() so librdkafka hands over many at a time. A partial
+        batch is yielded once batch_timeout passes. Reading ends once the consumer's partitions
+        reach their end offsets, the run's messages are read or its time is up. Without bounds
+        it goes on until the generator is closed. offsets receives the next offset to read of
+        every partition.
+        """
+        if offsets is None:
+            offsets = {}
+        if bounds is None:
+            bounds = RunBounds()
+            bounds.start()
+        end_offsets = bounds.end_offsets
+        # Partitions of this consumer with messages left before their end offset
+        remaining = (
+            {tp.partition for tp in consumer.assignment()} & set(end_offsets)
+            if end_offsets is not None
+            else None
+        )
+        pending: List[Message] = []
         try:
-            batch = []
-            start_time = time.time()
-            idle_poll_seconds = 10
-            empty_polls = 0
-            while True:
-                message = consumer.poll(timeout=1.0)
-
-                if message is None:
-                    empty_polls += 1
-                    if empty_polls >= idle_poll_seconds:
-                        break  # Exit after N consecutive empty polls
-                    if batch and (time.time() - start_time) >= batch_timeout:
-                        for record in batch:
-                            yield record
-                        batch = []
-                        start_time = time.time()
-                    continue
-                empty_polls = 0
-
-                if message.error():
-                    logger.warning(f"Kafka message error: {message.error()}")
-                    continue
+            try:
+                batch_started = time.monotonic()
+                while remaining is None or remaining:
+                    time_left = bounds.time_left()
+                    if time_left is not None and time_left <= 0:
+                        break
+                    requested = bounds.take(batch_size - len(pending))
+                    if not requested:
+                        break
+                    timeout = POLL_TIMEOUT if time_left is None else min(POLL_TIMEOUT, time_left)
+                    if pending:
+                        batch_left = batch_started + batch_timeout - time.monotonic()
+                        timeout = min(timeout, max(batch_left, 0))
+                    messages = consumer.consume(num_messages=requested, timeout=timeout)
+                    now = time.monotonic()
+                    accepted = 0
+                    for message in messages:
+                        partition = message.partition()
+                        if message.error():
+                            if message.error().code() != KafkaError._PARTITION_EOF:
+                                logger.warning(f"Kafka message error: {message.error()}")
+                            elif remaining is not None:
+                                remaining.discard(partition)
+                            continue
+                        if end_offsets is not None:
+                            if message.offset() >= end_offsets.get(partition, 0):
+                                # Produced after the run started, left to the next run
+                                continue
+                            if message.offset() + 1 >= end_offsets[partition]:
+                                remaining.discard(partition)
+                        if not pending:
+                            batch_started = now
+                        pending.append(message)
+                        accepted += 1
+                    bounds.give_back(requested - accepted)
+
+                    if len(pending) >= batch_size or (
+                        pending and now - batch_started >= batch_timeout
+                    ):
+                        batch, pending = pending, []
+                        self._track_offsets(batch, offsets)
+                        yield from self._decode_batch(batch, decoder, data_item_format)
+            except Exception as e:
+                # Fails the extract, so the offsets of unread batches never reach the state
+                logger.error(f"Kafka consumption error: {e}")
+                raise
+            if pending:
+                self._track_offsets(pending, offsets)
+                yield from self._decode_batch(pending, decoder, data_item_format)
+        finally:
+            # Stops fetching while the consumer waits for the load to commit its offsets,
+            # it is released once they are committed or with the run's other connections
+            consumer.unassign()
+
+    def _track_offsets(self, messages: List[Message], offsets: Dict[int, int]) -> None:
+        for message in messages:
+            offsets[message.partition()] = max(
+                offsets.get(message.partition(), 0), message.offset() + 1
+            )
 
-                try:
-                    raw_value = message.value()
-                    logger.debug(f"Raw bytes: {raw_value}")
+    def _consume_partitioned(
+        self,
+        consumers: List[Consumer],
+        topic: str,
+        decoder,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_timeout: float = DEFAULT_BATCH_TIMEOUT,
+        data_item_format: DataItemFormat = DataItemFormat.OBJECT,
+        offsets: Optional[Dict[int, int]] = None,
+        bounds: Optional[RunBounds] = None,
+    ) -> Iterator[Any]:
+        """Reads each consumer's partitions on its own thread and merges their batches.
+
+        librdkafka fetches outside the GIL, so consumers wait on the brokers in parallel. The
+        queue holds at most one batch per consumer so memory stays bounded while dlt catches up.
+        offsets only moves past a batch once the batch is yielded.
+        """
+        if offsets is None:
+            offsets = {}
+        batches: queue.Queue = queue.Queue(maxsize=len(consumers))
+        stop = threading.Event()
+        consumer_offsets: List[Dict[int, int]] = [{} for _ in consumers]
+
+        def read_partitions(consumer, read_offsets):
+            consumed = self._consume_messages(
+                consumer,
+                topic,
+                decoder,
+                batch_size,
+                batch_timeout,
+                data_item_format,
+                read_offsets,
+                bounds,
+            )
+            try:
+                for batch in consumed:
+                    while not stop.is_set():
+                        try:
+                            batches.put((batch, dict(read_offsets)), timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+            finally:
+                consumed.close()
+
+        with ThreadPoolExecutor(
+            max_workers=len(consumers), thread_name_prefix="ferry-kafka"
+        ) as executor:
+            futures = [
+                executor.submit(read_partitions, consumer, read_offsets)
+                for consumer, read_offsets in zip(consumers, consumer_offsets)
+            ]
+            try:
+                while True:
+                    for future in futures:
+                        if future.done() and future.exception():
+                            raise future.exception()
+                    try:
+                        batch, batch_offsets = batches.get(timeout=0.1)
+                    except queue.Empty:
+                        if all(future.done() for future in futures) and batches.empty():
+                            break
+                        continue
+                    offsets.update(batch_offsets)
+                    yield batch
+                # Covers the messages of trailing batches that decoded to nothing
+                for read_offsets in consumer_offsets:
+                    offsets.update(read_offsets)
+            finally:
+                stop.set()
+
+    def _decode_batch(
+        self,
+        messages: List[Message],
+        decoder: Optional[RegistryDecoder],
+        data_item_format: DataItemFormat,
+    ) -> Iterator[Any]:
+        """Decodes a batch of messages, yielding nothing if none of them could be decoded."""
+        # Tombstones carry no value
+        messages = [message for message in messages if message.value() is not None]
+        if decoder:
+            for schema_key, values, decoded in decoder.decode(messages):
+                arrow_schema = (
+                    decoder.arrow_schema(schema_key)
+                    if data_item_format == DataItemFormat.ARROW
+                    else None
+                )
+                if arrow_schema is not None:
+                    try:
+                        # Typed by the writer schema, dlt takes the column types as they are
+                        table = pa.Table.from_pylist(values, schema=arrow_schema)
+                        yield self._add_metadata_columns(table, decoded)
+                        continue
+                    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                        logger.debug(f"Batch does not convert to its schema's Arrow types: {e}")
+                yield from self._yield_values(values, decoded, data_item_format)
+            return
+
+        if data_item_format == DataItemFormat.ARROW:
+            table = self._read_json_table(messages)
+            if table is not None:
+                yield self._add_metadata_columns(table, messages)
+                return
+        values, messages = self._decode_values(messages)
+        yield from self._yield_values(values, messages, data_item_format)
+
+    def _yield_values(
+        self,
+        values: List[Dict[str, Any]],
+        messages: List[Message],
+        data_item_format: DataItemFormat,
+    ) -> Iterator[Any]:
+        if not values:
+            return
+        if data_item_format == DataItemFormat.ARROW:
+            try:
+                table = pa.Table.from_batches([pa.RecordBatch.from_struct_array(pa.array(values))])
+                yield self._add_metadata_columns(table, messages)
+                return
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                # Values whose fields change type are left to dlt's schema inference
+                logger.debug(f"Yielding the batch as rows, it does not convert to Arrow: {e}")
+        for value, message in zip(values, messages):
+            value.update(self._metadata(message))
+        yield values
+
+    def _read_json_table(self, messages: List[Message]) -> Optional["pa.Table"]:
+        """Parses the batch as newline delimited JSON in one pass.
+
+        Returns None when a message is not a JSON object, its batch is then decoded per
+        message.
+        """
+        if not messages:
+            return None
+        try:
+            table = pa_json.read_json(
+                io.BytesIO(b"\n".join(message.value() for message in messages)),
+                parse_options=pa_json.ParseOptions(newlines_in_values=True),
+            )
+        except pa.ArrowInvalid:
+            return None
+        return table if table.num_rows == len(messages) else None
+
+    def _decode_values(self, messages: List[Message]) -> Tuple[List[Dict[str, Any]], List[Message]]:
+        """Decodes each JSON message, returns the values and the messages they were decoded from."""
+        values, decoded = [], []
+        for message in messages:
+            try:
+                value = self._decode_json(message)
+            except Exception as e:
+                logger.error(f"Failed to deserialize or process message: {e}")
+                continue
+            if not isinstance(value, dict):
+                logger.warning(
+                    f"Skipping message at offset {message.offset()} of partition "
+                    f"{message.partition()}, its value is not an object"
+                )
+                continue
+            values.append(value)
+            decoded.append(message)
+        return values, decoded
 
-                    parsed_value = None
+    def _decode_json(self, message: Message) -> Any:
+        raw_value = message.value()
+        try:
+            return orjson.loads(raw_value)
+        except orjson.JSONDecodeError:
+            pass
+        decoded_str = raw_value.decode("utf-8", errors="replace")
+        values = decoded_str.strip().split(",")
+        key_str = message.key().decode("utf-8", errors="replace") if message.key() else None
+        if key_str and key_str.startswith("header:"):
+            headers = key_str.replace("header:", "").split(",")
+            if len(headers) == len(values):
+                return dict(zip(headers, values))
+        return {"raw": decoded_str}
+
+    def _metadata(self, message: Message) -> Dict[str, Any]:
+        return {
+            "offset": message.offset(),
+            "partition": message.partition(),
+            "timestamp": message.timestamp()[1],
+            "key": message.key().decode("utf-8", errors="replace") if message.key() else None,
+        }
 
-                    if avro_deserializer:
-                        parsed_value = avro_deserializer(
-                            raw_value, SerializationContext(topic, MessageField.VALUE)
-                        )
-                    else:
-                        decoded_str = raw_value.decode("utf-8", errors="replace")
-                        try:
-                            parsed_value = json.loads(decoded_str)
-                        except json.JSONDecodeError:
-                            values = decoded_str.strip().split(",")
-                            key_str = (
-                                message.key().decode("utf-8", errors="replace")
-                                if message.key()
-                                else None
-                            )
-                            if key_str and key_str.startswith("header:"):
-                                headers = key_str.replace("header:", "").split(",")
-                                if len(headers) == len(values):
-                                    parsed_value = dict(zip(headers, values))
-                                else:
-                                    parsed_value = {"raw": decoded_str}
-                            else:
-                                parsed_value = {"raw": decoded_str}
-
-                    record = {
-                        **parsed_value,
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "timestamp": message.timestamp()[1],
-                        "key": message.key().decode("utf-8", errors="replace")
-                        if message.key()
-                        else None,
-                    }
-
-                    batch.append(record)
-
-                    if len(batch) >= batch_size:
-                        for r in batch:
-                            yield r
-                        batch = []
-                        start_time = time.time()
-
-                except Exception as e:
-                    logger.error(f"Failed to deserialize or process message: {e}")
-
-        except Exception as e:
-            logger.error(f"Kafka consumption error: {e}")
-        finally:
-            if batch:
-                for r in batch:
-                    yield r
-            consumer.close()
+    def _add_metadata_columns(self, table: "pa.Table", messages: List[Message]) -> "pa.Table":
+        """Appends the message metadata as columns, replacing value fields of the same name."""
+        columns = {
+            "offset": pa.array([message.offset() for message in messages], pa.int64()),
+            "partition": pa.array([message.partition() for message in messages], pa.int32()),
+            "timestamp": pa.array([message.timestamp()[1] for message in messages], pa.int64()),
+            "key": pa.array(
+                [
+                    message.key().decode("utf-8", errors="replace") if message.key() else None
+                    for message in messages
+                ],
+                pa.string(),
+            ),
+        }
+        for name, column in columns.items():
+            if name in table.column_names:
+                table = table.drop_columns([name])
+            table = table.append_column(name, column)
+        return table
@@ -0,0 +1,587 @@
+import base64
+import io
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import timezone
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+import fastavro
+import orjson
+from confluent_kafka import Message
+from confluent_kafka.schema_registry import SchemaRegistryClient
+
+try:
+    import pyarrow as pa
+    from dlt.common.libs.pyarrow import get_column_type_from_py_arrow
+except ImportError:
+    pa = None
+
+try:
+    from google.protobuf import (
+        any_pb2,
+        api_pb2,
+        descriptor_pb2,
+        duration_pb2,
+        empty_pb2,
+        field_mask_pb2,
+        source_context_pb2,
+        struct_pb2,
+        timestamp_pb2,
+        type_pb2,
+        wrappers_pb2,
+    )
+    from google.protobuf.descriptor import Descriptor, FieldDescriptor
+    from google.protobuf.descriptor_pool import DescriptorPool
+    from google.protobuf.message_factory import GetMessageClass
+except ImportError:
+    descriptor_pb2 = None
+
+logger = logging.getLogger(__name__)
+
+# Confluent wire format: magic byte, 4 byte big-endian schema id, then the payload
+MAGIC_BYTE = 0
+HEADER_SIZE = 5
+
+PROTOBUF_TIMESTAMP = "google.protobuf.Timestamp"
+
+if pa is not None:
+    AVRO_PRIMITIVES = {
+        "null": pa.null(),
+        "boolean": pa.bool_(),
+        "int": pa.int32(),
+        "long": pa.int64(),
+        "float": pa.float32(),
+        "double": pa.float64(),
+        "bytes": pa.binary(),
+        "string": pa.string(),
+    }
+    AVRO_LOGICAL_TYPES = {
+        "timestamp-millis": pa.timestamp("ms", tz="UTC"),
+        "timestamp-micros": pa.timestamp("us", tz="UTC"),
+        "local-timestamp-millis": pa.timestamp("ms"),
+        "local-timestamp-micros": pa.timestamp("us"),
+        "date": pa.date32(),
+        "time-millis": pa.time32("ms"),
+        "time-micros": pa.time64("us"),
+        "uuid": pa.string(),
+    }
+    JSON_SCHEMA_TYPES = {
+        "boolean": pa.bool_(),
+        "integer": pa.int64(),
+        "number": pa.float64(),
+        "string": pa.string(),
+    }
+
+if pa is not None and descriptor_pb2 is not None:
+    PROTOBUF_SCALARS = {
+        FieldDescriptor.TYPE_DOUBLE: pa.float64(),
+        FieldDescriptor.TYPE_FLOAT: pa.float32(),
+        FieldDescriptor.TYPE_INT64: pa.int64(),
+        FieldDescriptor.TYPE_SINT64: pa.int64(),
+        FieldDescriptor.TYPE_SFIXED64: pa.int64(),
+        FieldDescriptor.TYPE_UINT64: pa.uint64(),
+        FieldDescriptor.TYPE_FIXED64: pa.uint64(),
+        FieldDescriptor.TYPE_INT32: pa.int32(),
+        FieldDescriptor.TYPE_SINT32: pa.int32(),
+        FieldDescriptor.TYPE_SFIXED32: pa.int32(),
+        FieldDescriptor.TYPE_UINT32: pa.uint32(),
+        FieldDescriptor.TYPE_FIXED32: pa.uint32(),
+        FieldDescriptor.TYPE_BOOL: pa.bool_(),
+        FieldDescriptor.TYPE_STRING: pa.string(),
+        FieldDescriptor.TYPE_BYTES: pa.binary(),
+        FieldDescriptor.TYPE_ENUM: pa.string(),
+    }
+
+# (schema key, decoded values, the messages they were decoded from)
+DecodedBatch = Tuple[Hashable, List[Dict[str, Any]], List[Message]]
+
+
+class _UnsupportedType(Exception):
+    pass
+
+
+class WriterSchema(NamedTuple):
+    """A registry schema ready to decode payloads, along with the types it declares."""
+
+    read: Callable[[bytes], Any]
+    # None when some field has no Arrow equivalent
+    arrow_schema: Optional["pa.Schema"]
+    # dlt hints of the top level scalar fields, nested ones are left to the normalizer
+    columns: Dict[str, Dict[str, Any]]
+
+
+def read_schema_id(payload: bytes) -> int:
+    """Returns the registry id of the schema a message was written with."""
+    if len(payload) < HEADER_SIZE or payload[0] != MAGIC_BYTE:
+        raise ValueError("Message is not in the schema registry wire format")
+    return int.from_bytes(payload[1:HEADER_SIZE], "big")
+
+
+def _declared_types(
+    field_types: Dict[str, Callable[[], "pa.DataType"]], complete: bool = True
+) -> Tuple[Optional["pa.Schema"], Dict[str, Dict[str, Any]]]:
+    """Returns the Arrow schema and dlt column hints of fields typed by their callables.
+
+    The Arrow schema is left out when a field has no Arrow type or the fields are not
+    complete, e.g. when records may hold fields the schema does not name.
+    """
+    if pa is None:
+        return None, {}
+    types: Dict[str, Optional["pa.DataType"]] = {}
+    for name, arrow_type in field_types.items():
+        try:
+            types[name] = arrow_type()
+        except _UnsupportedType as e:
+            logger.debug(f"Field {name} has no Arrow equivalent: {e}")
+            types[name] = None
+    arrow_schema = (
+        pa.schema([pa.field(name, arrow_type) for name, arrow_type in types.items()])
+        if complete and all(arrow_type is not None for arrow_type in types.values())
+        else None
+    )
+    columns = {
+        name: get_column_type_from_py_arrow(arrow_type)
+        for name, arrow_type in types.items()
+        if arrow_type is not None
+        and not pa.types.is_nested(arrow_type)
+        and not pa.types.is_null(arrow_type)
+    }
+    return arrow_schema, columns
+
+
+def avro_arrow_schema(schema: Dict[str, Any]) -> Optional["pa.Schema"]:
+    """Returns the Arrow schema of a parsed Avro record schema.
+
+    Returns None for schemas holding types Arrow columns cannot, such as unions of several
+    types or recursive records. Fields are nullable so later schema versions may drop them.
+    """
+    if pa is None:
+        return None
+    try:
+        arrow_type = _avro_arrow_type(schema, schema.get("__named_schemas", {}), set())
+    except _UnsupportedType as e:
+        logger.debug(f"Avro schema {schema.get('name')} has no Arrow equivalent: {e}")
+        return None
+    if not pa.types.is_struct(arrow_type):
+        return None
+    return pa.schema(list(arrow_type))
+
+
+def _avro_arrow_type(schema: Any, named: Dict[str, Any], parents: set) -> "pa.DataType":
+    if isinstance(schema, str):
+        if schema in AVRO_PRIMITIVES:
+            return AVRO_PRIMITIVES[schema]
+        if schema in parents:
+            raise _UnsupportedType(f"recursive type {schema}")
+        if schema in named:
+            return _avro_arrow_type(named[schema], named, parents)
+        raise _UnsupportedType(f"unknown type {schema}")
+    if isinstance(schema, list):
+        branches = [branch for branch in schema if branch != "null"]
+        if len(branches) != 1:
+            raise _UnsupportedType("union of several types")
+        return _avro_arrow_type(branches[0], named, parents)
+
+    logical_type = schema.get("logicalType")
+    if logical_type == "decimal":
+        precision, scale = schema["precision"], schema.get("scale", 0)
+        return (pa.decimal128 if precision <= 38 else pa.decimal256)(precision, scale)
+    if logical_type in AVRO_LOGICAL_TYPES:
+        return AVRO_LOGICAL_TYPES[logical_type]
+
+    avro_type = schema["type"]
+    if avro_type == "record":
+        parents = parents | {schema["name"]}
+        return pa.struct(
+            [
+                pa.field(field["name"], _avro_arrow_type(field["type"], named, parents))
+                for field in schema["fields"]
+            ]
+        )
+    if avro_type == "enum":
+        return pa.string()
+    if avro_type == "fixed":
+        return pa.binary(schema["size"])
+    if avro_type == "array":
+        return pa.list_(_avro_arrow_type(schema["items"], named, parents))
+    if avro_type == "map":
+        return pa.map_(pa.string(), _avro_arrow_type(schema["values"], named, parents))
+    return _avro_arrow_type(avro_type, named, parents)
+
+
+def _avro_columns(schema: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    if schema.get("type") != "record":
+        return {}
+    named = schema.get("__named_schemas", {})
+    parents = {schema["name"]}
+    return _declared_types(
+        {
+            field["name"]: lambda field=field: _avro_arrow_type(field["type"], named, parents)
+            for field in schema["fields"]
+        }
+    )[1]
+
+
+def _json_schema_arrow_type(schema: Any, root: Dict[str, Any], parents: set) -> "pa.DataType":
+    if not isinstance(schema, dict):
+        raise _UnsupportedType(f"unknown type {schema}")
+    if "$ref" in schema:
+        ref = schema["$ref"]
+        if ref in parents:
+            raise _UnsupportedType(f"recursive type {ref}")
+        if not ref.startswith("#"):
+            raise _UnsupportedType(f"external reference {ref}")
+        target = root
+        try:
+            for part in ref.lstrip("#").strip("/").split("/"):
+                if part:
+                    target = target[part.replace("~1", "/").replace("~0", "~")]
+        except (KeyError, IndexError, TypeError):
+            raise _UnsupportedType(f"unresolvable reference {ref}")
+        return _json_schema_arrow_type(target, root, parents | {ref})
+    for combinator in ("anyOf", "oneOf"):
+        if combinator in schema:
+            branches = [branch for branch in schema[combinator] if branch.get("type") != "null"]
+            if len(branches) != 1:
+                raise _UnsupportedType(f"{combinator} of several types")
+            return _json_schema_arrow_type(branches[0], root, parents)
+
+    json_type = schema.get("type")
+    if isinstance(json_type, list):
+        types = [t for t in json_type if t != "null"]
+        if len(types) != 1:
+            raise _UnsupportedType("union of several types")
+        json_type = types[0]
+    if json_type in JSON_SCHEMA_TYPES:
+        return JSON_SCHEMA_TYPES[json_type]
+    if json_type == "array" and isinstance(schema.get("items"), dict):
+        return pa.list_(_json_schema_arrow_type(schema["items"], root, parents))
+    if json_type == "object" and schema.get("additionalProperties") is False:
+        return pa.struct(
+            [
+                pa.field(name, _json_schema_arrow_type(prop, root, parents))
+                for name, prop in schema.get("properties", {}).items()
+            ]
+        )
+    raise _UnsupportedType(f"type {json_type}")
+
+
+def json_schema_types(
+    schema: Dict[str, Any],
+) -> Tuple[Optional["pa.Schema"], Dict[str, Dict[str, Any]]]:
+    """Returns the Arrow schema and dlt column hints of a JSON Schema describing objects.
+
+    Objects only have an Arrow schema when closed with additionalProperties false, as Arrow
+    tables would drop the fields the schema does not name. String formats stay text.
+    """
+    properties = schema.get("properties", {})
+    return _declared_types(
+        {
+            name: lambda prop=prop: _json_schema_arrow_type(prop, schema, set())
+            for name, prop in properties.items()
+        },
+        complete=schema.get("additionalProperties") is False,
+    )
+
+
+def _is_map(field: "FieldDescriptor") -> bool:
+    return field.type == FieldDescriptor.TYPE_MESSAGE and field.message_type.GetOptions().map_entry
+
+
+def _is_repeated(field: "FieldDescriptor") -> bool:
+    # Older protobuf releases only have label, the latest ones only is_repeated
+    if hasattr(field, "is_repeated"):
+        return field.is_repeated
+    return field.label == FieldDescriptor.LABEL_REPEATED
+
+
+def _protobuf_arrow_type(field: "FieldDescriptor", parents: set) -> "pa.DataType":
+    if _is_map(field):
+        entry = field.message_type.fields_by_name
+        return pa.map_(
+            _protobuf_arrow_type(entry["key"], parents),
+            _protobuf_arrow_type(entry["value"], parents),
+        )
+    if field.type == FieldDescriptor.TYPE_MESSAGE:
+        name = field.message_type.full_name
+        if name == PROTOBUF_TIMESTAMP:
+            item = pa.timestamp("us", tz="UTC")
+        elif name in parents:
+            raise _UnsupportedType(f"recursive type {name}")
+        else:
+            item = pa.struct(
+                [
+                    pa.field(nested.name, _protobuf_arrow_type(nested, parents | {name}))
+                    for nested in field.message_type.fields
+                ]
+            )
+    elif field.type in PROTOBUF_SCALARS:
+        item = PROTOBUF_SCALARS[field.type]
+    else:
+        raise _UnsupportedType(f"field type {field.type}")
+    return pa.list_(item) if _is_repeated(field) else item
+
+
+def protobuf_types(
+    descriptor: "Descriptor",
+) -> Tuple[Optional["pa.Schema"], Dict[str, Dict[str, Any]]]:
+    """Returns the Arrow schema and dlt column hints of a Protobuf message type."""
+    return _declared_types(
+        {
+            field.name: lambda field=field: _protobuf_arrow_type(field, {descriptor.full_name})
+            for field in descriptor.fields
+        }
+    )
+
+
+def _protobuf_value(field: "FieldDescriptor", value: Any) -> Any:
+    if field.type == FieldDescriptor.TYPE_MESSAGE:
+        if field.message_type.full_name == PROTOBUF_TIMESTAMP:
+            return value.ToDatetime(tzinfo=timezone.utc)
+        return protobuf_record(value)
+    if field.type == FieldDescriptor.TYPE_ENUM:
+        enum_value = field.enum_type.values_by_number.get(value)
+        return enum_value.name if enum_value else value
+    return value
+
+
+def protobuf_record(message: Any) -> Dict[str, Any]:
+    """Returns the fields of a Protobuf message as a dict, unset optional fields as None."""
+    record = {}
+    for field in message.DESCRIPTOR.fields:
+        value = getattr(message, field.name)
+        if _is_map(field):
+            value_field = field.message_type.fields_by_name["value"]
+            record[field.name] = {
+                key: _protobuf_value(value_field, item) for key, item in value.items()
+            }
+        elif _is_repeated(field):
+            record[field.name] = [_protobuf_value(field, item) for item in value]
+        elif field.has_presence and not message.HasField(field.name):
+            record[field.name] = None
+        else:
+            record[field.name] = _protobuf_value(field, value)
+    return record
+
+
+def _read_varint(payload: bytes, pos: int) -> Tuple[int, int]:
+    """Reads a zigzag encoded varint, returns it and the position after it."""
+    value = shift = 0
+    while True:
+        if pos >= len(payload):
+            raise ValueError("Unexpected end of message while reading its message indexes")
+        byte = payload[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return (value >> 1) ^ -(value & 1), pos
+
+
+class RegistryDecoder(ABC):
+    """Decodes messages written with schemas of a schema registry.
+
+    Writer schemas are fetched once per schema key and kept ready to decode, along with the
+    Arrow schema and dlt column types they declare. Shared by the runs and consumers
+    reading from the same registry.
+    """
+
+    # Format the registry returns schemas in, None for their registered text
+    schema_format: Optional[str] = None
+
+    def __init__(self, registry_client: SchemaRegistryClient):
+        self.registry_client = registry_client
+        self._schemas: Dict[Hashable, WriterSchema] = {}
+
+    def schema_key(self, payload: bytes) -> Tuple[Hashable, int]:
+        """Returns the key of the schema a payload was written with and where its value starts."""
+        return read_schema_id(payload), HEADER_SIZE
+
+    def writer_schema(self, key: Hashable) -> WriterSchema:
+        schema = self._schemas.get(key)
+        if schema is None:
+            schema = self._schemas[key] = self._load(key)
+        return schema
+
+    @abstractmethod
+    def _load(self, key: Hashable) -> WriterSchema:
+        pass
+
+    def _fetch(self, schema_id: int):
+        if self.schema_format:
+            return self.registry_client.get_schema(schema_id, fmt=self.schema_format)
+        return self.registry_client.get_schema(schema_id)
+
+    def _latest_key(self, schema_id: int) -> Optional[Hashable]:
+        """Returns the key the values of a subject's schema are read with, None if unknown."""
+        return schema_id
+
+    def arrow_schema(self, key: Hashable) -> Optional["pa.Schema"]:
+        return self.writer_schema(key).arrow_schema
+
+    def subject_columns(self, subject: str) -> Dict[str, Dict[str, Any]]:
+        """Returns the column types declared by the latest schema of subject, if registered."""
+        try:
+            latest = self.registry_client.get_latest_version(subject)
+            key = self._latest_key(latest.schema_id)
+            if key is None:
+                logger.info(f"No column types declared for subject {subject}, its type is unknown")
+                return {}
+            return self.writer_schema(key).columns
+        except Exception as e:
+            logger.info(f"No column types declared for subject {subject}: {e}")
+            return {}
+
+    def decode(self, messages: List[Message]) -> List[DecodedBatch]:
+        """Decodes a batch, grouping consecutive messages written with the same schema.
+
+        Messages that fail to decode or whose value is not a record are skipped.
+        """
+        batches: List[DecodedBatch] = []
+        for message in messages:
+            payload = message.value()
+            try:
+                key, start = self.schema_key(payload)
+                value = self.writer_schema(key).read(payload[start:])
+            except Exception as e:
+                logger.error(f"Failed to deserialize or process message: {e}")
+                continue
+            if not isinstance(value, dict):
+                logger.warning(
+                    f"Skipping message at offset {message.offset()} of partition "
+                    f"{message.partition()}, its value is not a record"
+                )
+                continue
+            if not batches or batches[-1][0] != key:
+                batches.append((key, [], []))
+            batches[-1][1].append(value)
+            batches[-1][2].append(message)
+        return batches
+
+
+class AvroDecoder(RegistryDecoder):
+    """Decodes Avro messages, keyed by the id of their writer schema."""
+
+    def _load(self, key: int) -> WriterSchema:
+        parsed = fastavro.parse_schema(json.loads(self._fetch(key).schema_str))
+        return WriterSchema(
+            read=lambda value: fastavro.schemaless_reader(io.BytesIO(value), parsed, None),
+            arrow_schema=avro_arrow_schema(parsed),
+            columns=_avro_columns(parsed),
+        )
+
+
+class JsonSchemaDecoder(RegistryDecoder):
+    """Decodes JSON messages described by a JSON Schema, keyed by its schema id.
+
+    Values are not validated against their schema, producers validate them when writing.
+    """
+
+    def _load(self, key: int) -> WriterSchema:
+        schema = json.loads(self._fetch(key).schema_str)
+        arrow_schema, columns = json_schema_types(schema)
+        return WriterSchema(read=orjson.loads, arrow_schema=arrow_schema, columns=columns)
+
+
+class ProtobufDecoder(RegistryDecoder):
+    """Decodes Protobuf messages, keyed by their schema id and message indexes.
+
+    The registry serves schemas as serialized file descriptors, so message types are built
+    without compiling .proto files. Well-known types and referenced schemas are resolved.
+    """
+
+    schema_format = "serialized"
+
+    def __init__(self, registry_client: SchemaRegistryClient):
+        if descriptor_pb2 is None:
+            raise ValueError("Protobuf deserialization requires protobuf to be installed")
+        super().__init__(registry_client)
+        # schema id: (pool holding the schema and its references, its file descriptor)
+        self._files: Dict[int, Tuple["DescriptorPool", "descriptor_pb2.FileDescriptorProto"]] = {}
+
+    def schema_key(self, payload: bytes) -> Tuple[Hashable, int]:
+        schema_id = read_schema_id(payload)
+        count, pos = _read_varint(payload, HEADER_SIZE)
+        indexes = []
+        for _ in range(count):
+            index, pos = _read_varint(payload, pos)
+            indexes.append(index)
+        # An empty index list stands for the first message type of the file
+        return (schema_id, tuple(indexes or [0])), pos
+
+    def _latest_key(self, schema_id: int) -> Optional[Hashable]:
+        # Messages name their type by index, a file with several types may use any of them
+        _, file_proto = self._file(schema_id)
+        if len(file_proto.message_type) > 1:
+            return None
+        return schema_id, (0,)
+
+    def _load(self, key: Tuple[int, Tuple[int, ...]]) -> WriterSchema:
+        schema_id, indexes = key
+        pool, file_proto = self._file(schema_id)
+        # Indexes lead to the message type, top level first then nested
+        message_proto = file_proto.message_type[indexes[0]]
+        names = [message_proto.name]
+        for index in indexes[1:]:
+            message_proto = message_proto.nested_type[index]
+            names.append(message_proto.name)
+        full_name = ".".join(([file_proto.package] if file_proto.package else []) + names)
+        descriptor = pool.FindMessageTypeByName(full_name)
+        message_class = GetMessageClass(descriptor)
+        arrow_schema, columns = protobuf_types(descriptor)
+        return WriterSchema(
+            read=lambda value: protobuf_record(message_class.FromString(value)),
+            arrow_schema=arrow_schema,
+            columns=columns,
+        )
+
+    def _file(self, schema_id: int):
+        if schema_id not in self._files:
+            registered = self._fetch(schema_id)
+            pool = DescriptorPool()
+            for module in (
+                any_pb2,
+                source_context_pb2,
+                type_pb2,
+                api_pb2,
+                descriptor_pb2,
+                duration_pb2,
+                empty_pb2,
+                field_mask_pb2,
+                struct_pb2,
+                timestamp_pb2,
+                wrappers_pb2,
+            ):
+                pool.AddSerializedFile(module.DESCRIPTOR.serialized_pb)
+            self._add_references(pool, registered.references or [], set())
+            file_proto = self._file_proto(f"schema_{schema_id}.proto", registered.schema_str)
+            pool.Add(file_proto)
+            self._files[schema_id] = (pool, file_proto)
+        return self._files[schema_id]
+
+    def _add_references(self, pool: "DescriptorPool", references, added: set) -> None:
+        for reference in references:
+            if reference.name.startswith("google/protobuf/") or reference.name in added:
+                continue
+            added.add(reference.name)
+            registered = self.registry_client.get_version(
+                reference.subject, reference.version, True, self.schema_format
+            ).schema
+            self._add_references(pool, registered.references or [], added)
+            pool.Add(self._file_proto(reference.name, registered.schema_str))
+
+    @staticmethod
+    def _file_proto(name: str, schema_str: str) -> "descriptor_pb2.FileDescriptorProto":
+        file_proto = descriptor_pb2.FileDescriptorProto.FromString(
+            base64.standard_b64decode(schema_str)
+        )
+        file_proto.name = name
+        return file_proto
+
+
+# value_format URI parameter: decoder of the values
+REGISTRY_DECODERS = {
+    "avro": AvroDecoder,
+    "protobuf": ProtobufDecoder,
+    "json_schema": JsonSchemaDecoder,
+}
@@ -9,6 +9,7 @@ from dlt.sources import DltResource
 from .helpers import (
     MongoDbCollectionConfiguration,
     MongoDbCollectionResourceConfiguration,
+    TMongoClient,
     client_from_credentials,
     collection_documents,
 )
@@ -89,6 +90,7 @@ def mongodb_collection(
     chunk_size: Optional[int] = 10000,
     data_item_format: Optional[TDataItemFormat] = "object",
     filter_: Optional[Dict[str, Any]] = None,
+    client: Optional[TMongoClient] = None,
 ) -> Any:
     """
     A DLT source which loads a collection from a mongo database using PyMongo.
@@ -108,12 +110,15 @@ def mongodb_collection(
                 object - Python objects (dicts, lists).
                 arrow - Apache Arrow tables.
         filter_ (Optional[Dict[str, Any]]): The filter to apply to the collection.
+        client (Optional[TMongoClient]): An open client to read with instead of connecting to
+            connection_url.
 
     Returns:
         Iterable[DltResource]: A list of DLT resources for each collection to be loaded.
     """
     # set up mongo client
-    client = client_from_credentials(connection_url)
+    if client is None:
+        client = client_from_credentials(connection_url)
     if not database:
         mongo_database = client.get_default_database()
     else:
@@ -1,5 +1,7 @@
 """Mongo database source helpers"""
 
+import math
+from collections import Counter
 from itertools import islice
 from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
@@ -29,6 +31,9 @@ else:
     TCollection = Any
     TCursor = Any
 
+# Sampled documents per partition, more give partitions of more even sizes
+SAMPLES_PER_PARTITION = 10
+
 try:
     import pymongoarrow  # type: ignore
 
@@ -154,48 +159,150 @@ class CollectionLoader:
 
 
 class CollectionLoaderParallel(CollectionLoader):
-    def _get_document_count(self) -> int:
-        return self.collection.count_documents(filter=self._filter_op)
+    """
+    Mongo DB collection loader, which reads ranges
+    of the collection concurrently.
+
+    Documents are split into ranges of about chunk_size documents on `_id`,
+    or on the incremental cursor field when an index of the collection starts
+    with it. The incremental filter stays in the query either way. Range
+    boundaries are picked from a sample of the matching documents, so each
+    range is read with an index range scan instead of skipping the documents
+    of the ranges before it.
+    """
 
-    def _create_batches(self, limit: Optional[int] = None) -> List[Dict[str, int]]:
-        doc_count = self._get_document_count()
-        if limit:
-            doc_count = min(doc_count, abs(limit))
+    @property
+    def _partition_field(self) -> str:
+        # Ranges of an unindexed field would each scan the whole collection
+        if self._filter_op and self._leads_index(self.cursor_field):
+            return self.cursor_field
+        return "_id"
+
+    def _leads_index(self, field: str) -> bool:
+        """Tell whether an index of the collection starts with the field."""
+        return any(
+            index["key"][0][0] == field
+            for index in self.collection.index_information().values()
+        )
 
-        batches = []
-        left_to_load = doc_count
+    def _get_query(self, filter_: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the query matching the documents to load.
 
-        for sk in range(0, doc_count, self.chunk_size):
-            batches.append(dict(skip=sk, limit=min(self.chunk_size, left_to_load)))
-            left_to_load -= self.chunk_size
+        Args:
+            filter_ (Dict[str, Any]): The filter to apply to the collection.
 
+        Returns:
+            Dict[str, Any]: The incremental filter combined with the given filter.
+        """
+        filter_op = self._filter_op
+        _raise_if_intersection(filter_op, filter_)
+        filter_op.update(filter_)
+        return filter_op
+
+    def _get_document_count(self, query: Dict[str, Any]) -> int:
+        if not query:
+            # Read from the collection metadata instead of counting
+            return self.collection.estimated_document_count()
+        return self.collection.count_documents(filter=query)
+
+    def _sample_bounds(
+        self, query: Dict[str, Any], field: str, partitions: int
+    ) -> List[Any]:
+        """Pick the lower bounds of all ranges but the first from a sample.
+
+        Queries compare values of the same BSON type only, so bounds are
+        kept of the type most sampled values have.
+
+        Args:
+            query (Dict[str, Any]): The query matching the documents to load.
+            field (str): The field to split the documents on.
+            partitions (int): The number of ranges to split the documents into.
+
+        Returns:
+            List[Any]: Ascending bounds, empty if the sample holds none.
+        """
+        pipeline: List[Dict[str, Any]] = [{"$match": query}] if query else []
+        pipeline += [
+            {"$sample": {"size": partitions * SAMPLES_PER_PARTITION}},
+            {"$project": {"_id": 0, "bound": f"${field}"}},
+            {"$sort": {"bound": ASCENDING}},
+        ]
+        values = [
+            doc["bound"]
+            for doc in self.collection.aggregate(pipeline, allowDiskUse=True)
+            if doc.get("bound") is not None
+        ]
+        if not values:
+            return []
+
+        kind = Counter(_bson_kind(value) for value in values).most_common(1)[0][0]
+        values = [value for value in values if _bson_kind(value) == kind]
+        step = len(values) / partitions
+        bounds: List[Any] = []
+        for i in range(1, partitions):
+            value = values[min(int(i * step), len(values) - 1)]
+            if not bounds or value > bounds[-1]:
+                bounds.append(value)
+        return bounds
+
+    def _create_batches(
+        self, query: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Split the documents matching the query into ranges.
+
+        Args:
+            query (Dict[str, Any]): The query matching the documents to load.
+            limit (Optional[int]): The maximum number of documents to load.
+
+        Returns:
+            List[Dict[str, Any]]: The filter of every range, with the limit
+                of a single range when a limit is given.
+        """
+        if limit:
+            # Ranges would be read concurrently, the limit needs a single one
+            return [dict(filter={}, limit=abs(limit))]
+
+        doc_count = self._get_document_count(query)
+        if doc_count <= self.chunk_size:
+            return [dict(filter={})]
+
+        field = self._partition_field
+        bounds = self._sample_bounds(
+            query, field, math.ceil(doc_count / self.chunk_size)
+        )
+        if not bounds:
+            return [dict(filter={})]
+
+        # The first range also holds documents whose field is missing or of
+        # another type, the range queries do not match those
+        batches = [dict(filter={field: {"$not": {"$gte": bounds[0]}}})]
+        for lower, upper in zip(bounds, bounds[1:]):
+            batches.append(dict(filter={field: {"$gte": lower, "$lt": upper}}))
+        batches.append(dict(filter={field: {"$gte": bounds[-1]}}))
         return batches
 
-    def _get_cursor(self, filter_: Dict[str, Any]) -> TCursor:
+    def _get_cursor(self, query: Dict[str, Any]) -> TCursor:
         """Get a reading cursor for the collection.
 
         Args:
-            filter_ (Dict[str, Any]): The filter to apply to the collection.
+            query (Dict[str, Any]): The query to run on the collection.
 
         Returns:
             Cursor: The cursor for the collection.
         """
-        filter_op = self._filter_op
-        _raise_if_intersection(filter_op, filter_)
-        filter_op.update(filter_)
-
-        cursor = self.collection.find(filter=filter_op)
+        cursor = self.collection.find(filter=query)
         if self._sort_op:
             cursor = cursor.sort(self._sort_op)
 
         return cursor
 
     @dlt.defer
-    def _run_batch(self, cursor: TCursor, batch: Dict[str, int]) -> TDataItem:
-        cursor = cursor.clone()
+    def _run_batch(self, cursor: TCursor, batch: Dict[str, Any]) -> TDataItem:
+        if batch.get("limit"):
+            cursor = cursor.limit(batch["limit"])
 
         data = []
-        for document in cursor.skip(batch["skip"]).limit(batch["limit"]):
+        for document in cursor:
             data.append(map_nested_in_place(convert_mongo_objs, document))
 
         return data
@@ -212,10 +319,16 @@ class CollectionLoaderParallel(CollectionLoader):
         Yields:
             Iterator[TDataItem]: An iterator of the loaded documents.
         """
-        batches = self._create_batches(limit=limit)
-        cursor = self._get_cursor(filter_=filter_)
+        query = self._get_query(filter_)
+        batches = self._create_batches(query, limit=limit)
 
         for batch in batches:
+            batch_query = (
+                {"$and": [query, batch["filter"]]}
+                if query and batch["filter"]
+                else query or batch["filter"]
+            )
+            cursor = self._get_cursor(query=batch_query)
             yield self._run_batch(cursor=cursor, batch=batch)
 
     def load_documents(
@@ -283,21 +396,17 @@ class CollectionArrowLoaderParallel(CollectionLoaderParallel):
     Apache Arrow for data processing.
     """
 
-    def _get_cursor(self, filter_: Dict[str, Any]) -> TCursor:
+    def _get_cursor(self, query: Dict[str, Any]) -> TCursor:
         """Get a reading cursor for the collection.
 
         Args:
-            filter_ (Dict[str, Any]): The filter to apply to the collection.
+            query (Dict[str, Any]): The query to run on the collection.
 
         Returns:
             Cursor: The cursor for the collection.
         """
-        filter_op = self._filter_op
-        _raise_if_intersection(filter_op, filter_)
-        filter_op.update(filter_)
-
         cursor = self.collection.find_raw_batches(
-            filter=filter_op, batch_size=self.chunk_size
+            filter=query, batch_size=self.chunk_size
         )
         if self._sort_op:
             cursor = cursor.sort(self._sort_op)  # type: ignore
@@ -305,17 +414,18 @@ class CollectionArrowLoaderParallel(CollectionLoaderParallel):
         return cursor
 
     @dlt.defer
-    def _run_batch(self, cursor: TCursor, batch: Dict[str, int]) -> TDataItem:
+    def _run_batch(self, cursor: TCursor, batch: Dict[str, Any]) -> TDataItem:
         from pymongoarrow.context import PyMongoArrowContext
         from pymongoarrow.lib import process_bson_stream
 
-        cursor = cursor.clone()
-
         context = PyMongoArrowContext.from_schema(
             None, codec_options=self.collection.codec_options
         )
 
-        for chunk in cursor.skip(batch["skip"]).limit(batch["limit"]):
+        if batch.get("limit"):
+            cursor = cursor.limit(batch["limit"])
+
+        for chunk in cursor:
             process_bson_stream(chunk, context)
 
             table = context.finish()
@@ -434,6 +544,15 @@ def client_from_credentials(connection_url: str) -> TMongoClient:
     return client
 
 
+def _bson_kind(value: Any) -> type:
+    """Group values the way MongoDB compares them, numbers of any type together."""
+    if isinstance(value, bool):
+        return bool
+    if isinstance(value, (int, float, Decimal128)):
+        return float
+    return type(value)
+
+
 def _raise_if_intersection(filter1: Dict[str, Any], filter2: Dict[str, Any]) -> None:
     """
     Raise an exception, if the given filters'
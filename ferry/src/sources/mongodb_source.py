@@ -7,6 +7,7 @@ try:
     from ferry.src.sources.mongodb import mongodb, mongodb_collection
 except ImportError:
     from ferry.src.sources.mongodb import mongodb, mongodb_collection
+from ferry.src.sources.mongodb.helpers import client_from_credentials
 
 class MongoDbSource(SourceBase):
 
@@ -25,11 +26,19 @@ class MongoDbSource(SourceBase):
             raise ValueError(f"Invalid MongoDB URI: {e}")
 
         credentials = self.create_credentials(uri)
+        connection_url = credentials.to_native_representation()
+        # MongoClient is thread-safe, pooled clients are shared by concurrent runs
+        client = self._connection(
+            ("mongodb", connection_url),
+            lambda: client_from_credentials(connection_url),
+            close=lambda client: client.close(),
+        )
 
         source = mongodb_collection(
-            connection_url=credentials.to_native_representation(),
+            connection_url=connection_url,
             database=database,
             collection=table_name,
+            client=client,
         )
 
         incremental = None
@@ -0,0 +1,127 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, text
+from dlt.common.libs.sql_alchemy import Engine, MetaData, Table
+
+logger = logging.getLogger(__name__)
+
+SQLITE_TOKEN_QUERY = text("""
+SELECT tbl_name, type, name, sql
+FROM sqlite_master
+WHERE lower(tbl_name) IN :names
+ORDER BY tbl_name, name
+""").bindparams(bindparam("names", expanding=True))
+
+INFORMATION_SCHEMA_TOKEN_QUERY = text("""
+SELECT table_schema, table_name, column_name, data_type, is_nullable, ordinal_position,
+       character_maximum_length, numeric_precision, numeric_scale
+FROM information_schema.columns
+WHERE lower(table_name) IN :names
+ORDER BY table_schema, table_name, ordinal_position
+""").bindparams(bindparam("names", expanding=True))
+
+
+def reflect_tables(engine: Engine, metadata: MetaData, table_names: List[str]) -> None:
+    """Reflects tables into metadata, grouping schema-qualified names by schema."""
+    by_schema: Dict[Optional[str], List[str]] = {}
+    for table_name in table_names:
+        schema, _, name = table_name.rpartition(".")
+        by_schema.setdefault(schema or None, []).append(name)
+    for schema, names in by_schema.items():
+        metadata.reflect(bind=engine, schema=schema, views=True, only=names)
+
+
+class ReflectionCache:
+    """Caches reflected SQL tables between runs of the same pipeline.
+
+    Entries are keyed by source URI and table name and hold a change token computed from
+    the catalog in a single query. A table is reflected again when its token changes, and
+    tables without a token are never cached.
+    """
+
+    def __init__(self, cache_dir: str, uri: str):
+        self.cache_dir = cache_dir
+        self.uri = uri
+
+    def reflect(self, engine: Engine, table_names: List[str]) -> MetaData:
+        metadata = MetaData()
+        tokens = self._change_tokens(engine, table_names)
+        missing = []
+        for table_name in table_names:
+            table = self._load(table_name, tokens.get(table_name))
+            if table is None:
+                missing.append(table_name)
+            else:
+                table.to_metadata(metadata)
+
+        if missing:
+            logger.info(f"Reflecting {len(missing)} of {len(table_names)} tables")
+            reflect_tables(engine, metadata, missing)
+            for table_name in missing:
+                if tokens.get(table_name) and table_name in metadata.tables:
+                    self._store(metadata.tables[table_name], tokens[table_name])
+        return metadata
+
+    def _change_tokens(self, engine: Engine, table_names: List[str]) -> Dict[str, str]:
+        """Hashes the catalog entries of each table. Tables not found get no token."""
+        names = sorted({table_name.lower().rpartition(".")[2] for table_name in table_names})
+        try:
+            with engine.connect() as conn:
+                if engine.dialect.name == "sqlite":
+                    result = conn.execute(SQLITE_TOKEN_QUERY, {"names": names})
+                    rows = [(None, *row) for row in result]
+                else:
+                    rows = list(conn.execute(INFORMATION_SCHEMA_TOKEN_QUERY, {"names": names}))
+        except Exception as e:
+            logger.warning(f"Could not read catalog change tokens, reflection cache disabled: {e}")
+            return {}
+
+        tokens = {}
+        for table_name in table_names:
+            schema, _, name = table_name.lower().rpartition(".")
+            table_rows = [
+                row
+                for row in rows
+                if str(row[1]).lower() == name and (not schema or str(row[0]).lower() == schema)
+            ]
+            if table_rows:
+                tokens[table_name] = hashlib.sha256(repr(table_rows).encode()).hexdigest()
+        return tokens
+
+    def _path(self, table_name: str) -> str:
+        key = hashlib.sha256(f"{self.uri}|{table_name}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.pickle")
+
+    def _load(self, table_name: str, token: Optional[str]) -> Optional[Table]:
+        if not token:
+            return None
+        try:
+            with open(self._path(table_name), "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable reflection cache entry for {table_name}: {e}")
+            return None
+        if entry.get("token") != token:
+            return None
+        return entry["metadata"].tables.get(table_name)
+
+    def _store(self, table: Table, token: str) -> None:
+        metadata = MetaData()
+        table.to_metadata(metadata)
+        temp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, delete=False) as f:
+                temp_path = f.name
+                pickle.dump({"token": token, "metadata": metadata}, f)
+            os.replace(temp_path, self._path(table.key))
+        except Exception as e:
+            logger.warning(f"Could not write reflection cache entry for {table.key}: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -1,36 +1,116 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 import hashlib
 import logging
 import dlt
+import pandas as pd
+from dlt.common.schema.typing import TTableSchemaColumns
 from dlt.extract.source import DltSource
 from dlt.sources.credentials import ConnectionStringCredentials
+from ferry.src.connection_pool import Closer, ConnectionLeases
 from ferry.src.data_models.ingest_model import ResourceConfig, WriteDispositionType
 from ferry.src.data_models.merge_config_model import MergeConfig, MergeStrategy
+from ferry.src.profiler import RunProfiler
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
 
 logger = logging.getLogger(__name__)
 
+PSEUDONYMIZE_SALT = "WI@N57%zZrmk#88c"
+
 class SourceBase(ABC):
+    # Set by PipelineBuilder when the run is profiled
+    profiler: Optional[RunProfiler] = None
+    # Set by PipelineBuilder, pooled across runs in the servers
+    connections: Optional[ConnectionLeases] = None
+    # Set by PipelineBuilder when the run repeats as micro-batches until stopped
+    continuous: bool = False
 
     @abstractmethod
     def dlt_source_system(self, uri: str, resources: List[ResourceConfig], identity: str) -> DltSource:
         pass
 
+    def on_load_completed(self) -> None:
+        """Called by PipelineBuilder once the run's data is loaded into the destination."""
+
     def create_credentials(self, uri: str):
         return ConnectionStringCredentials(uri)
 
+    def _connection(self, key: tuple, create, close: Closer = None, shared: bool = True) -> Any:
+        """Returns a connection for the run, reused across runs when a pool is set."""
+        if self.connections is None:
+            self.connections = ConnectionLeases()
+        return self.connections.acquire(key, create, close, shared)
+
+    def _pseudonymize_value(self, value: Any) -> str:
+        """Hashes a single value with SHA-256."""
+        sh = hashlib.sha256()
+        sh.update((str(value) + PSEUDONYMIZE_SALT).encode())
+        return sh.hexdigest()
+
     def _pseudonymize_columns(self, row: Dict, pseudonymizing_columns: List[str]) -> Dict:
         """Pseudonymizes specified columns using SHA-256 hashing."""
-        salt = "WI@N57%zZrmk#88c"
         for col in pseudonymizing_columns:
             if col in row and row[col] is not None:
-                sh = hashlib.sha256()
-                sh.update((str(row[col]) + salt).encode())
-                row[col] = sh.hexdigest()
+                row[col] = self._pseudonymize_value(row[col])
         return row
 
-    def _create_dlt_resource(self, resource_config: ResourceConfig, data_iterator):
-        """Creates a DLT resource dynamically."""
+    def _pseudonymize_array(self, array):
+        """Pseudonymizes an Arrow array, hashing each distinct value once."""
+        distinct = pc.unique(array)
+        hashed = pa.array(
+            [None if value is None else self._pseudonymize_value(value)
+             for value in distinct.to_pylist()],
+            type=pa.string(),
+        )
+        indices = pc.index_in(array, value_set=distinct, skip_nulls=False)
+        return pc.take(hashed, indices)
+
+    def _apply_arrow_column_rules(
+        self, item, exclude_columns: List[str], pseudonymizing_columns: List[str]
+    ):
+        """Applies column rules to an Arrow table or record batch without leaving Arrow."""
+        fields, arrays = [], []
+        for field in item.schema:
+            if field.name in exclude_columns:
+                continue
+            column = item.column(field.name)
+            if field.name in pseudonymizing_columns:
+                column = self._pseudonymize_array(column)
+                field = pa.field(field.name, pa.string(), field.nullable, field.metadata)
+            fields.append(field)
+            arrays.append(column)
+        schema = pa.schema(fields, metadata=item.schema.metadata)
+        return type(item).from_arrays(arrays, schema=schema)
+
+    def _apply_dataframe_column_rules(
+        self, df: pd.DataFrame, exclude_columns: List[str], pseudonymizing_columns: List[str]
+    ) -> pd.DataFrame:
+        """Applies column rules to a copy of a data frame, hashing each distinct value once."""
+        df = df.copy()
+        df = df.drop(columns=[col for col in exclude_columns if col in df.columns])
+        for col in pseudonymizing_columns:
+            if col in df.columns:
+                distinct = df[col].dropna().unique()
+                hashed = {value: self._pseudonymize_value(value) for value in distinct}
+                df[col] = df[col].map(hashed)
+        return df
+
+    def _create_dlt_resource(
+        self,
+        resource_config: ResourceConfig,
+        data_iterator,
+        declared_columns: Optional[TTableSchemaColumns] = None,
+    ):
+        """Creates a DLT resource dynamically.
+
+        declared_columns holds column types the source knows up front, such as those of a
+        registry schema, so dlt does not infer them from the data.
+        """
         exclude_columns = resource_config.column_rules.get("exclude_columns", []) if resource_config.column_rules else []
         pseudonymizing_columns = resource_config.column_rules.get("pseudonymizing_columns", []) if resource_config.column_rules else []
         primary_key = None
@@ -50,33 +130,75 @@ class SourceBase(ABC):
             primary_key = merge_config.build_pk_config()
             merge_key = merge_config.build_merge_key()
             columns = merge_config.build_columns()
+        if declared_columns:
+            # Excluded and pseudonymized columns do not keep their source types
+            declared = {
+                name: dict(column)
+                for name, column in declared_columns.items()
+                if name not in exclude_columns and name not in pseudonymizing_columns
+            }
+            for name, hints in (columns or {}).items():
+                declared.setdefault(name, {}).update(hints)
+            columns = declared
         
 
-        @dlt.resource(
-            name=resource_config.get_destination_table_name(),
-            incremental=dlt.sources.incremental(incremental_column) if incremental_column else None,
-            write_disposition=write_disposition,
-            primary_key=primary_key,
-            merge_key=merge_key,
-            columns=columns,
-        )
-        def resource_function():
+        name = resource_config.get_destination_table_name()
+        profiler = self.profiler
+        if profiler:
+            data_iterator = profiler.track_reads(name, data_iterator)
 
-            if not exclude_columns and not pseudonymizing_columns:
-                                yield from data_iterator
-                                return
+        def process_items():
 
-            for row in data_iterator:
-                if not isinstance(row, dict):
-                    logger.warning(f"Skipping non-dictionary row: {row}")
-                    continue
+            if not exclude_columns and not pseudonymizing_columns:
+                yield from data_iterator
+                return
 
+            def process_row(row: Dict) -> Dict:
                 if exclude_columns:
                     row = {k: v for k, v in row.items() if k not in exclude_columns}
                 if pseudonymizing_columns:
                     row = self._pseudonymize_columns(row, pseudonymizing_columns)
+                return row
+
+            for item in data_iterator:
+                # Arrow and pandas batches are processed column-wise
+                if pa is not None and isinstance(item, (pa.Table, pa.RecordBatch)):
+                    yield self._apply_arrow_column_rules(
+                        item, exclude_columns, pseudonymizing_columns
+                    )
+                    continue
+
+                if isinstance(item, pd.DataFrame):
+                    yield self._apply_dataframe_column_rules(
+                        item, exclude_columns, pseudonymizing_columns
+                    )
+                    continue
+
+                # Batched sources yield lists of rows, keep the batch intact
+                if isinstance(item, list):
+                    yield [process_row(row) for row in item if isinstance(row, dict)]
+                    continue
+
+                if not isinstance(item, dict):
+                    logger.warning(f"Skipping non-dictionary row: {item}")
+                    continue
 
+                row = process_row(item)
                 logger.debug(f"Processed row: {row}")
                 yield row
 
+        @dlt.resource(
+            name=name,
+            incremental=dlt.sources.incremental(incremental_column) if incremental_column else None,
+            write_disposition=write_disposition,
+            primary_key=primary_key,
+            merge_key=merge_key,
+            columns=columns,
+        )
+        def resource_function():
+            if profiler:
+                yield from profiler.track_resource(name, process_items())
+            else:
+                yield from process_items()
+
         return resource_function()
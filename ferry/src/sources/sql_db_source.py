@@ -1,33 +1,61 @@
 import dlt
-from typing import List
-from dlt.sources.sql_database import sql_database
-from dlt.extract.source import DltSource
-from ferry.src.data_models.ingest_model import ResourceConfig, WriteDispositionType
-from ferry.src.data_models.merge_config_model import MergeConfig, MergeStrategy
 import logging
-from typing import List
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import and_, func, or_, select
+from dlt.common.libs.sql_alchemy import Engine, MetaData, Table
+from dlt.common.pipeline import get_dlt_pipelines_dir
 from dlt.extract.source import DltSource
-from dlt.sources.sql_database import sql_database
-from ferry.src.data_models.ingest_model import ResourceConfig
+from dlt.sources.sql_database import engine_from_credentials
+from dlt.sources.sql_database.helpers import table_rows
+from ferry.src.data_models.ingest_model import ResourceConfig, TableBackend
+from ferry.src.data_models.partition_config_model import PartitionConfig
+from ferry.src.sources.reflection_cache import ReflectionCache, reflect_tables
 from ferry.src.sources.source_base import SourceBase
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = 50000
+
+
 class SqlDbSource(SourceBase):
-    
+
     def __init__(self):
         super().__init__()
-    
+
     def dlt_source_system(self, uri: str, resources: List[ResourceConfig], identity: str) -> DltSource:
         """Creates a DLT source with resources for multiple tables."""
         credentials = self.create_credentials(uri)
-        sql_source = sql_database(credentials)
+        engines: Dict[bool, Engine] = {}
+        cache_dir = os.path.join(get_dlt_pipelines_dir(), identity, "reflection_cache")
+        metadata = self._reflect_tables(
+            self._get_engine(credentials, engines, True), resources, ReflectionCache(cache_dir, uri)
+        )
         resources_list = []
 
         for resource_config in resources:
-            table_name = resource_config.source_table_name  
+            table_name = resource_config.source_table_name
             logger.info(f"Processing table: {table_name}")
-            data_iterator = sql_source.with_resources(table_name)
+            stream_results = self._get_stream_results(resource_config)
+            engine = self._get_engine(credentials, engines, stream_results)
+            table = metadata.tables[table_name]
+            partition = self._get_partition(resource_config)
+            if partition:
+                if partition.column not in table.c:
+                    raise ValueError(
+                        f"Partition column '{partition.column}' does not exist in table "
+                        f"'{table_name}'"
+                    )
+                data_iterator = self._read_partitioned(
+                    engine, table, metadata, resource_config, partition
+                )
+            else:
+                data_iterator = self._read_table(engine, table, metadata, resource_config)
             resources_list.append(self._create_dlt_resource(resource_config, data_iterator))
 
         return DltSource(
@@ -35,3 +63,187 @@ class SqlDbSource(SourceBase):
             section="sql_db_source",
             resources=resources_list
         )
+
+    def _read_table(
+        self,
+        engine: Engine,
+        table: Table,
+        metadata: MetaData,
+        resource_config: ResourceConfig,
+        condition: Optional[Any] = None,
+    ) -> Iterator[Any]:
+        """Reads a table, optionally restricted to the rows matching condition."""
+        return table_rows(
+            engine,
+            table,
+            metadata,
+            chunk_size=self._get_chunk_size(resource_config),
+            backend=self._get_backend(resource_config).value,
+            reflection_level="full",
+            query_adapter_callback=(lambda query, _table: query.where(condition))
+            if condition is not None
+            else None,
+        )
+
+    def _read_partitioned(
+        self,
+        engine: Engine,
+        table: Table,
+        metadata: MetaData,
+        resource_config: ResourceConfig,
+        partition: PartitionConfig,
+    ) -> Iterator[Any]:
+        """Reads key ranges of a table concurrently over separate connections.
+
+        Chunks are merged into a single stream as they arrive. The queue holds at most
+        one chunk per worker so memory stays bounded while the consumer catches up.
+        """
+        conditions = self._partition_conditions(engine, table, partition)
+        max_workers = min(partition.max_workers or len(conditions), len(conditions))
+        logger.info(
+            f"Reading table {table.name} in {len(conditions)} ranges with {max_workers} workers"
+        )
+        chunks: queue.Queue = queue.Queue(maxsize=max_workers)
+        stop = threading.Event()
+
+        def read_range(condition):
+            rows = self._read_table(engine, table, metadata, resource_config, condition)
+            try:
+                for chunk in rows:
+                    while not stop.is_set():
+                        try:
+                            chunks.put(chunk, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+            finally:
+                rows.close()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(read_range, condition) for condition in conditions]
+            try:
+                while True:
+                    for future in futures:
+                        if future.done() and future.exception():
+                            raise future.exception()
+                    try:
+                        yield chunks.get(timeout=0.1)
+                    except queue.Empty:
+                        if all(future.done() for future in futures) and chunks.empty():
+                            break
+            finally:
+                stop.set()
+
+    def _partition_conditions(
+        self, engine: Engine, table: Table, partition: PartitionConfig
+    ) -> List[Any]:
+        """Builds one filter per key range. Rows with a NULL key fall into the first range."""
+        column = table.c[partition.column]
+        if partition.bounds is not None:
+            bounds = [self._coerce_bound(column, bound) for bound in partition.bounds]
+            if not all(a < b for a, b in zip(bounds, bounds[1:])):
+                raise ValueError(
+                    f"'bounds' of partition column '{column.name}' must be strictly ascending"
+                )
+        else:
+            bounds = self._compute_bounds(engine, column, partition.partitions)
+        if not bounds:
+            return [None]
+
+        conditions = [or_(column.is_(None), column < bounds[0])]
+        conditions += [
+            and_(column >= lower, column < upper) for lower, upper in zip(bounds, bounds[1:])
+        ]
+        conditions.append(column >= bounds[-1])
+        return conditions
+
+    def _compute_bounds(self, engine: Engine, column, partitions: int) -> List[Any]:
+        """Splits the range between the minimum and maximum key into equal ranges."""
+        with engine.connect() as conn:
+            lower, upper = conn.execute(select(func.min(column), func.max(column))).one()
+        if lower is None or lower == upper:
+            return []
+        try:
+            if isinstance(lower, int):
+                bounds = [lower + (upper - lower) * i // partitions for i in range(1, partitions)]
+            else:
+                bounds = [lower + (upper - lower) * i / partitions for i in range(1, partitions)]
+        except TypeError:
+            raise ValueError(
+                f"Column '{column.name}' cannot be split into equal ranges, "
+                "provide 'bounds' instead"
+            )
+        return sorted({bound for bound in bounds if lower < bound <= upper})
+
+    def _coerce_bound(self, column, bound: Any) -> Any:
+        """Converts a bound to the Python type of the partition column."""
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return bound
+        if isinstance(bound, str) and python_type in (datetime, date):
+            return python_type.fromisoformat(bound)
+        if isinstance(bound, (int, float, str)) and python_type in (int, float, Decimal):
+            return python_type(str(bound) if python_type is Decimal else bound)
+        if isinstance(bound, (int, float)) and python_type is str:
+            return str(bound)
+        return bound
+
+    def _get_partition(self, resource_config: ResourceConfig) -> Optional[PartitionConfig]:
+        source_options = resource_config.source_options
+        return source_options.partition if source_options else None
+
+    def _get_backend(self, resource_config: ResourceConfig) -> TableBackend:
+        source_options = resource_config.source_options
+        if source_options and source_options.backend is not None:
+            return source_options.backend
+        return TableBackend.SQLALCHEMY
+
+    def _get_chunk_size(self, resource_config: ResourceConfig) -> int:
+        source_options = resource_config.source_options
+        if source_options and source_options.chunk_size is not None:
+            return source_options.chunk_size
+        return DEFAULT_CHUNK_SIZE
+
+    def _get_stream_results(self, resource_config: ResourceConfig) -> bool:
+        source_options = resource_config.source_options
+        if source_options and source_options.stream_results is not None:
+            return source_options.stream_results
+        return True
+
+    def _get_engine(self, credentials, engines: Dict[bool, Engine], stream_results: bool) -> Engine:
+        """Returns the engine for the cursor mode, creating it on first use.
+
+        Tables are read with yield_per, which already requests a server-side cursor on
+        dialects that support one. Client-side reads use an engine whose dialect opts out.
+        Engines are pooled per URI and cursor mode in the servers.
+        """
+        if stream_results not in engines:
+            pooled = self.connections is not None and self.connections.pooled
+
+            def create_engine() -> Engine:
+                # Pooled engines may hold connections the database dropped while idle
+                engine = engine_from_credentials(credentials, pool_pre_ping=pooled)
+                if not stream_results:
+                    engine.dialect.supports_server_side_cursors = False
+                return engine
+
+            key = ("sqlalchemy", credentials.to_native_representation(), stream_results)
+            engines[stream_results] = self._connection(key, create_engine, close=Engine.dispose)
+        return engines[stream_results]
+
+    def _reflect_tables(
+        self,
+        engine: Engine,
+        resources: List[ResourceConfig],
+        cache: Optional[ReflectionCache] = None,
+    ) -> MetaData:
+        """Reflects all requested tables in a single pass over one engine."""
+        table_names = [resource_config.source_table_name for resource_config in resources]
+        if cache:
+            return cache.reflect(engine, table_names)
+        metadata = MetaData()
+        reflect_tables(engine, metadata, table_names)
+        return metadata
@@ -0,0 +1,37 @@
+import os
+import pytest
+from ferry.src.benchmark import compare_to_baseline, load_baseline, run_benchmarks
+from ferry.src.benchmark_pairs import BENCHMARK_PAIRS, DEFAULT_BASELINE_PATH
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("FERRY_BENCHMARK"), reason="Set FERRY_BENCHMARK=1 to run benchmarks"
+)
+
+ROWS = int(os.environ.get("FERRY_BENCHMARK_ROWS", 100000))
+COLUMNS = int(os.environ.get("FERRY_BENCHMARK_COLUMNS", 10))
+TOLERANCE = float(os.environ.get("FERRY_BENCHMARK_TOLERANCE", 10))
+BASELINE = os.environ.get("FERRY_BENCHMARK_BASELINE", DEFAULT_BASELINE_PATH)
+
+
+@pytest.mark.parametrize("pair", list(BENCHMARK_PAIRS))
+def test_throughput(pair, request):
+    results = run_benchmarks([pair], ROWS, COLUMNS)
+    baseline = load_baseline(BASELINE) if os.path.exists(BASELINE) else []
+
+    comparison = compare_to_baseline(results, baseline, TOLERANCE)[0]
+    result = comparison.result
+    summary = (
+        f"{pair}: {result.rows_per_second:,.0f} rows/s, {result.mb_per_second:.2f} MB/s, "
+        f"peak RSS {result.peak_rss_mb} MB, steps {result.steps}"
+    )
+    # Reported past output capturing, so every run shows its throughput
+    reporter = request.config.pluginmanager.get_plugin("terminalreporter")
+    capture = request.config.pluginmanager.get_plugin("capturemanager")
+    if reporter and capture:
+        with capture.global_and_fixture_disabled():
+            reporter.write_line(summary)
+    assert not comparison.regressed, (
+        f"{pair} is {-comparison.change_percent:.1f}% slower than the baseline "
+        f"({result.rows_per_second:,.0f} vs {comparison.baseline.rows_per_second:,.0f} rows/s). "
+        f"{summary}"
+    )
@@ -44,6 +44,22 @@ def test_single_resource_should_be_provided(valid_ingest_data):
     with pytest.raises(ValidationError) as exc_info:
         IngestModel(**invalid_data)
     assert "At least one resource must be provided" in str(exc_info.value)    
+
+def test_only_kafka_sources_run_continuously(valid_ingest_data):
+    with pytest.raises(ValidationError) as exc_info:
+        IngestModel(**valid_ingest_data, continuous=True)
+    assert "Only Kafka sources can run continuously" in str(exc_info.value)
+
+def test_continuous_runs_need_appending_or_merging_resources(valid_ingest_data):
+    kafka_data = dict(valid_ingest_data, source_uri="kafka://localhost:9092?security_protocol=PLAINTEXT")
+    with pytest.raises(ValidationError) as exc_info:
+        IngestModel(**kafka_data, continuous=True)
+    assert "append or merge write disposition, not replace: source_table" in str(exc_info.value)
+
+    kafka_data["resources"] = [
+        {"source_table_name": "source_table", "write_disposition_config": {"type": "append"}}
+    ]
+    assert IngestModel(**kafka_data, continuous=True).continuous
         
     
 
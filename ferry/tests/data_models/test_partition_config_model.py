@@ -0,0 +1,33 @@
+import pytest
+from pydantic import ValidationError
+from ferry.src.data_models.partition_config_model import PartitionConfig
+
+
+def test_partitions():
+    config = PartitionConfig(column="id", partitions=4)
+    assert config.partitions == 4
+    assert config.bounds is None
+
+
+def test_bounds():
+    config = PartitionConfig(column="created_at", bounds=["2024-01-01", "2024-07-01"])
+    assert config.bounds == ["2024-01-01", "2024-07-01"]
+
+
+def test_partitions_or_bounds_required():
+    with pytest.raises(ValidationError):
+        PartitionConfig(column="id")
+    with pytest.raises(ValidationError):
+        PartitionConfig(column="id", partitions=2, bounds=[10])
+
+
+def test_single_partition_rejected():
+    with pytest.raises(ValidationError):
+        PartitionConfig(column="id", partitions=1)
+
+
+def test_bounds_must_ascend():
+    with pytest.raises(ValidationError):
+        PartitionConfig(column="id", bounds=[10, 5])
+    with pytest.raises(ValidationError):
+        PartitionConfig(column="id", bounds=[10, "x"])
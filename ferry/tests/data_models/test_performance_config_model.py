@@ -0,0 +1,17 @@
+import pytest
+from pydantic import ValidationError
+from ferry.src.data_models.performance_config_model import PerformanceConfig
+
+
+def test_build_config_maps_settings_to_dlt_keys():
+    config = PerformanceConfig(load_workers=16, normalize_workers=4, file_max_items=100000)
+    built = config.build_config()
+    assert built["load.workers"] == 16
+    assert built["normalize.workers"] == 4
+    assert built["data_writer.file_max_items"] == 100000
+    assert built["extract.workers"] is None
+
+
+def test_invalid_worker_count():
+    with pytest.raises(ValidationError):
+        PerformanceConfig(load_workers=0)
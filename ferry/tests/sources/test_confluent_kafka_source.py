@@ -0,0 +1,484 @@
+import io
+import json
+from types import SimpleNamespace
+import duckdb
+import fastavro
+import pyarrow as pa
+import pytest
+from dlt.common.runtime.telemetry import stop_telemetry
+from dlt.pipeline.exceptions import PipelineStepFailed
+from confluent_kafka import OFFSET_END, TopicPartition
+from pydantic import ValidationError
+from ferry.src.connection_pool import ConnectionLeases
+from ferry.src.data_models.ingest_model import DataItemFormat, IngestModel, ResourceConfig
+from ferry.src.pipeline_builder import PipelineBuilder
+from ferry.src.sources import confluent_kafka_source
+from ferry.src.sources.confluent_kafka_source import KafkaSource, RunBounds
+from ferry.src.sources.kafka_decoders import AvroDecoder
+
+
+class FakeMessage:
+    def __init__(self, value, offset, partition=0, key=None, timestamp=1700000000000):
+        self._value = value
+        self._offset = offset
+        self._partition = partition
+        self._key = key
+        self._timestamp = timestamp
+
+    def value(self):
+        return self._value
+
+    def key(self):
+        return self._key
+
+    def offset(self):
+        return self._offset
+
+    def partition(self):
+        return self._partition
+
+    def timestamp(self):
+        return (1, self._timestamp)
+
+    def error(self):
+        return None
+
+
+class FakeConsumer:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.requested = []
+        self.unassigned = False
+        self.closed = False
+
+    def consume(self, num_messages=1, timeout=-1):
+        self.requested.append(num_messages)
+        batch, self.messages = self.messages[:num_messages], self.messages[num_messages:]
+        return batch
+
+    def assignment(self):
+        return [TopicPartition("topic", p) for p in {m.partition() for m in self.messages}]
+
+    def unassign(self):
+        self.unassigned = True
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTopicConsumer(FakeConsumer):
+    """Serves the messages of the partitions assigned to it"""
+
+    topic_messages = []
+    instances = []
+    committed = []
+
+    def __init__(self, conf):
+        super().__init__([])
+        self.assigned = []
+        self.instances.append(self)
+
+    def list_topics(self, timeout=-1):
+        partitions = {message.partition() for message in self.topic_messages}
+        return SimpleNamespace(
+            topics={"topic": SimpleNamespace(partitions={p: None for p in partitions})}
+        )
+
+    def assign(self, topic_partitions):
+        self.assigned = topic_partitions
+        self.requested_from = sorted(tp.partition for tp in topic_partitions)
+        # Offsets are positions, OFFSET_BEGINNING or OFFSET_END
+        starts = {
+            tp.partition: float("inf") if tp.offset == OFFSET_END else max(tp.offset, 0)
+            for tp in topic_partitions
+        }
+        self.messages = [
+            m
+            for m in self.topic_messages
+            if m.partition() in starts and m.offset() >= starts[m.partition()]
+        ]
+
+    def assignment(self):
+        return self.assigned
+
+    def get_watermark_offsets(self, partition, timeout=-1):
+        offsets = [m.offset() for m in self.topic_messages if m.partition() == partition.partition]
+        return (min(offsets), max(offsets) + 1) if offsets else (0, 0)
+
+    def unassign(self):
+        self.assigned = []
+
+    def commit(self, offsets=None, asynchronous=True):
+        self.committed.extend((tp.partition, tp.offset) for tp in offsets)
+
+
+def _json_messages(count, partition=0):
+    return [
+        FakeMessage(
+            json.dumps({"id": i, "name": f"user{i}"}).encode(), offset=i, partition=partition
+        )
+        for i in range(count)
+    ]
+
+
+def _consume(messages, data_item_format=DataItemFormat.OBJECT, batch_size=4, bounds=None):
+    source = KafkaSource()
+    source.connections = ConnectionLeases()
+    consumer = source._connection(
+        ("kafka",), lambda: FakeConsumer(messages), close=FakeConsumer.close
+    )
+    if bounds is None:
+        bounds = RunBounds(stop_at_end=True)
+        bounds.start({m.partition(): m.offset() + 1 for m in messages})
+    batches = list(
+        source._consume_messages(
+            consumer,
+            "topic",
+            None,
+            batch_size=batch_size,
+            data_item_format=data_item_format,
+            bounds=bounds,
+        )
+    )
+    return consumer, batches
+
+
+def test_messages_are_consumed_in_batches():
+    consumer, batches = _consume(_json_messages(10))
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert batches[0][1] == {
+        "id": 1,
+        "name": "user1",
+        "offset": 1,
+        "partition": 0,
+        "timestamp": 1700000000000,
+        "key": None,
+    }
+    assert consumer.requested[:3] == [4, 4, 4]
+    # Held for the offset commit once reading ends
+    assert consumer.unassigned and not consumer.closed
+
+
+def test_arrow_batches_carry_message_metadata():
+    _, batches = _consume(_json_messages(6), DataItemFormat.ARROW)
+
+    assert all(isinstance(batch, pa.Table) for batch in batches)
+    table = pa.concat_tables(batches)
+    assert table.column_names == ["id", "name", "offset", "partition", "timestamp", "key"]
+    assert table.column("id").type == pa.int64()
+    assert table.column("offset").to_pylist() == list(range(6))
+
+
+def test_arrow_batches_fall_back_to_per_message_decoding():
+    messages = [
+        FakeMessage(b'{"id": 1}', offset=0),
+        FakeMessage(b"a,b", offset=1, key=b"header:x,y"),
+        FakeMessage(b"[1, 2]", offset=2),
+        FakeMessage(None, offset=3),
+    ]
+    _, batches = _consume(messages, DataItemFormat.ARROW)
+
+    assert len(batches) == 1
+    assert batches[0].select(["id", "x", "y", "offset"]).to_pylist() == [
+        {"id": 1, "x": None, "y": None, "offset": 0},
+        {"id": None, "x": "a", "y": "b", "offset": 1},
+    ]
+
+
+def test_undecodable_values_are_kept_raw():
+    _, batches = _consume([FakeMessage(b"not json", offset=0)])
+    assert batches == [
+        [{"raw": "not json", "offset": 0, "partition": 0, "timestamp": 1700000000000, "key": None}]
+    ]
+
+
+def test_partitions_are_read_by_parallel_consumers(monkeypatch):
+    messages = [message for p in range(4) for message in _json_messages(5, partition=p)]
+    monkeypatch.setattr(FakeTopicConsumer, "topic_messages", messages)
+    monkeypatch.setattr(FakeTopicConsumer, "instances", [])
+    monkeypatch.setattr(confluent_kafka_source, "Consumer", FakeTopicConsumer)
+    resource_config = ResourceConfig(
+        source_table_name="topic", source_options={"consumers": 2, "batch_size": 3}
+    )
+    source = KafkaSource()
+    source.connections = ConnectionLeases()
+    dlt_source = source.dlt_source_system(
+        "kafka://localhost:9092?group_id=group", [resource_config], "test_kafka"
+    )
+    rows = list(dlt_source.resources["topic"])
+
+    assert sorted((row["partition"], row["offset"]) for row in rows) == sorted(
+        (m.partition(), m.offset()) for m in messages
+    )
+    assert [c.requested_from for c in FakeTopicConsumer.instances] == [
+        [0, 2],
+        [1, 3],
+    ]
+    assert source.offsets == {"topic": {0: 5, 1: 5, 2: 5, 3: 5}}
+    source.on_load_completed()
+    assert all(c.closed for c in FakeTopicConsumer.instances)
+
+
+@pytest.fixture
+def kafka_pipeline(monkeypatch, tmp_path):
+    """Returns a model loading the fake topic into DuckDB, and the path of the database"""
+    monkeypatch.setenv("DLT_DATA_DIR", str(tmp_path / "dlt"))
+    monkeypatch.setenv("RUNTIME__DLTHUB_TELEMETRY", "false")
+    # The runs' collector logs are written under the working directory
+    monkeypatch.chdir(tmp_path)
+    # Started by earlier pipelines of the session, it would send the runs' events
+    stop_telemetry()
+    monkeypatch.setattr(FakeTopicConsumer, "committed", [])
+    monkeypatch.setattr(confluent_kafka_source, "Consumer", FakeTopicConsumer)
+    destination = tmp_path / "kafka.duckdb"
+
+    def model(source_options=None, write_disposition="append", **fields):
+        return IngestModel(
+            identity="kafka_pipeline",
+            source_uri=(
+                "kafka://localhost:9092?group_id=group&security_protocol=PLAINTEXT"
+                "&sasl_mechanisms=PLAIN&sasl_username=user&sasl_password=pass"
+            ),
+            destination_uri=f"duckdb:///{destination}",
+            resources=[
+                ResourceConfig(
+                    source_table_name="topic",
+                    destination_table_name="events",
+                    write_disposition_config=(
+                        {"type": write_disposition} if write_disposition else None
+                    ),
+                    source_options=source_options,
+                )
+            ],
+            **fields,
+        )
+
+    return model, destination
+
+
+def _loaded_offsets(destination):
+    with duckdb.connect(str(destination)) as conn:
+        return conn.execute(
+            'SELECT "partition", "offset" FROM kafka.events ORDER BY 1, 2'
+        ).fetchall()
+
+
+def test_runs_resume_from_offsets_stored_in_state(monkeypatch, kafka_pipeline):
+    model, destination = kafka_pipeline
+    monkeypatch.setattr(
+        FakeTopicConsumer, "topic_messages", _json_messages(3) + _json_messages(3, partition=1)
+    )
+    PipelineBuilder(model()).build().run()
+    assert FakeTopicConsumer.committed == [(0, 3), (1, 3)]
+
+    # The topic retains the messages read by the first run
+    FakeTopicConsumer.topic_messages.extend(
+        FakeMessage(json.dumps({"id": i}).encode(), offset=i) for i in range(3, 5)
+    )
+    PipelineBuilder(model()).build().run()
+
+    assert _loaded_offsets(destination) == [
+        (0, 0),
+        (0, 1),
+        (0, 2),
+        (0, 3),
+        (0, 4),
+        (1, 0),
+        (1, 1),
+        (1, 2),
+    ]
+    assert FakeTopicConsumer.committed == [(0, 3), (1, 3), (0, 5)]
+
+
+def test_offsets_are_committed_by_the_reading_consumer(monkeypatch, kafka_pipeline):
+    model, _ = kafka_pipeline
+    monkeypatch.setattr(FakeTopicConsumer, "topic_messages", _json_messages(3))
+    monkeypatch.setattr(FakeTopicConsumer, "instances", [])
+
+    PipelineBuilder(model()).build().run()
+
+    assert FakeTopicConsumer.committed == [(0, 3)]
+    assert len(FakeTopicConsumer.instances) == 1
+    assert FakeTopicConsumer.instances[0].closed
+
+
+def test_replaced_topics_are_reread_without_committing(monkeypatch, kafka_pipeline):
+    model, destination = kafka_pipeline
+    monkeypatch.setattr(FakeTopicConsumer, "topic_messages", _json_messages(3))
+
+    for _ in range(2):
+        PipelineBuilder(model(write_disposition="replace")).build().run()
+
+    assert _loaded_offsets(destination) == [(0, 0), (0, 1), (0, 2)]
+    assert FakeTopicConsumer.committed == []
+
+
+def test_failed_reads_fail_the_run_and_keep_offsets(monkeypatch, kafka_pipeline):
+    model, destination = kafka_pipeline
+    monkeypatch.setattr(FakeTopicConsumer, "topic_messages", _json_messages(5))
+    consume = FakeTopicConsumer.consume
+
+    def consume_once(self, num_messages=1, timeout=-1):
+        if self.requested:
+            raise RuntimeError("broker went away")
+        return consume(self, num_messages, timeout)
+
+    monkeypatch.setattr(FakeTopicConsumer, "consume", consume_once)
+    with pytest.raises(PipelineStepFailed):
+        PipelineBuilder(model({"batch_size": 2})).build().run()
+    assert FakeTopicConsumer.committed == []
+
+    monkeypatch.setattr(FakeTopicConsumer, "consume", consume)
+    PipelineBuilder(model({"batch_size": 2})).build().run()
+
+    assert _loaded_offsets(destination) == [(0, i) for i in range(5)]
+    assert FakeTopicConsumer.committed == [(0, 5)]
+
+
+def test_run_stops_at_end_offsets_of_its_start():
+    messages = _json_messages(5)
+    bounds = RunBounds(stop_at_end=True)
+    bounds.start({0: 3})
+    consumer, batches = _consume(messages, bounds=bounds)
+
+    assert [row["offset"] for batch in batches for row in batch] == [0, 1, 2]
+    # Stops once the partition reached its end offset, the rest is left to the next run
+    assert consumer.requested == [4]
+
+
+def test_run_stops_after_max_messages():
+    consumer, batches = _consume(_json_messages(10), bounds=_started(RunBounds(max_messages=6)))
+
+    assert [len(batch) for batch in batches] == [4, 2]
+    assert consumer.requested == [4, 2]
+
+
+def test_run_stops_after_max_duration():
+    consumer, batches = _consume([], bounds=_started(RunBounds(max_duration=0.05)))
+
+    assert batches == []
+    assert consumer.unassigned
+
+
+def _started(bounds):
+    bounds.start()
+    return bounds
+
+
+def test_max_messages_is_shared_by_parallel_consumers(monkeypatch):
+    messages = [message for p in range(4) for message in _json_messages(5, partition=p)]
+    monkeypatch.setattr(FakeTopicConsumer, "topic_messages", messages)
+    monkeypatch.setattr(confluent_kafka_source, "Consumer", FakeTopicConsumer)
+    resource_config = ResourceConfig(
+        source_table_name="topic",
+        source_options={"consumers": 2, "batch_size": 3, "max_messages": 7},
+    )
+    source = KafkaSource()
+    dlt_source = source.dlt_source_system(
+        "kafka://localhost:9092?group_id=group", [resource_config], "test_kafka"
+    )
+
+    assert len(list(dlt_source.resources["topic"])) == 7
+    assert sum(source.offsets["topic"].values()) == 7
+
+
+def test_unbounded_topics_are_rejected(monkeypatch):
+    monkeypatch.setattr(confluent_kafka_source, "Consumer", FakeTopicConsumer)
+    resource_config = ResourceConfig(
+        source_table_name="topic", source_options={"stop_at_end": False}
+    )
+    with pytest.raises(ValueError, match="would never end"):
+        KafkaSource().dlt_source_system(
+            "kafka://localhost:9092?group_id=group", [resource_config], "test_kafka"
+        )
+
+
+def test_continuous_run_loads_micro_batches(monkeypatch, kafka_pipeline):
+    model, destination = kafka_pipeline
+    monkeypatch.setattr(FakeTopicConsumer, "topic_messages", _json_messages(5))
+    builder = PipelineBuilder(
+        model({"max_messages": 2, "max_duration": 0.5}, continuous=True)
+    ).build()
+    run_once = builder._run_once
+
+    def run_micro_batch():
+        run_once()
+        if len(FakeTopicConsumer.committed) == 3:
+            builder.stop()
+
+    monkeypatch.setattr(builder, "_run_once", run_micro_batch)
+    builder.run()
+
+    assert _loaded_offsets(destination) == [(0, i) for i in range(5)]
+    assert FakeTopicConsumer.committed == [(0, 2), (0, 4), (0, 5)]
+    with duckdb.connect(str(destination)) as conn:
+        assert conn.execute("SELECT count(*) FROM kafka._dlt_loads").fetchone() == (3,)
+
+
+def test_continuous_runs_reject_the_default_disposition(kafka_pipeline):
+    model, _ = kafka_pipeline
+    with pytest.raises(ValidationError, match="append or merge write disposition"):
+        model({"max_messages": 2}, write_disposition=None, continuous=True)
+
+
+def test_avro_batches_are_typed_by_writer_schema():
+    schema = {
+        "type": "record",
+        "name": "Reading",
+        "fields": [
+            {"name": "sensor", "type": "string"},
+            {"name": "value", "type": ["null", "float"]},
+            {"name": "taken_at", "type": {"type": "long", "logicalType": "timestamp-micros"}},
+        ],
+    }
+    registry = SimpleNamespace(get_schema=lambda _: SimpleNamespace(schema_str=json.dumps(schema)))
+    messages = []
+    for i in range(3):
+        payload = io.BytesIO(b"\x00\x00\x00\x00\x07")
+        payload.seek(0, io.SEEK_END)
+        fastavro.schemaless_writer(
+            payload,
+            fastavro.parse_schema(schema),
+            {"sensor": f"s{i}", "value": None if i else 1.5, "taken_at": 1_700_000_000_000_000},
+        )
+        messages.append(FakeMessage(payload.getvalue(), offset=i))
+
+    (table,) = KafkaSource()._decode_batch(messages, AvroDecoder(registry), DataItemFormat.ARROW)
+
+    assert table.schema.field("value").type == pa.float32()
+    assert table.schema.field("taken_at").type == pa.timestamp("us", tz="UTC")
+    assert table.column("value").to_pylist() == [1.5, None, None]
+    assert table.column("offset").to_pylist() == [0, 1, 2]
+
+
+def test_value_format_defaults_to_avro_with_use_avro():
+    uri = "kafka://broker:9092?security_protocol=PLAINTEXT&schema_registry=http://registry"
+    assert KafkaSource()._parse_kafka_uri(uri)[1]["value_format"] == "json"
+    assert KafkaSource()._parse_kafka_uri(f"{uri}&use_avro=true")[1]["value_format"] == "avro"
+    assert (
+        KafkaSource()._parse_kafka_uri(f"{uri}&value_format=Protobuf")[1]["value_format"]
+        == "protobuf"
+    )
+    with pytest.raises(ValueError, match="Unsupported value_format"):
+        KafkaSource()._create_kafka_consumer("broker:9092", "t", {"value_format": "xml"})
+
+
+def test_declared_columns_skip_rewritten_columns():
+    resource_config = ResourceConfig(
+        source_table_name="readings",
+        column_rules={"exclude_columns": ["secret"], "pseudonymizing_columns": ["sensor"]},
+    )
+    resource = KafkaSource()._create_dlt_resource(
+        resource_config,
+        iter([]),
+        {
+            "value": {"data_type": "double"},
+            "secret": {"data_type": "text"},
+            "sensor": {"data_type": "bigint"},
+        },
+    )
+
+    columns = resource.compute_table_schema()["columns"]
+    assert columns["value"]["data_type"] == "double"
+    assert "secret" not in columns and "sensor" not in columns
@@ -0,0 +1,324 @@
+import base64
+import io
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import fastavro
+import pyarrow as pa
+from google.protobuf import descriptor_pb2, timestamp_pb2
+from google.protobuf.descriptor_pool import DescriptorPool
+from google.protobuf.message_factory import GetMessageClass
+from ferry.src.sources.kafka_decoders import (
+    AvroDecoder,
+    JsonSchemaDecoder,
+    ProtobufDecoder,
+    avro_arrow_schema,
+    json_schema_types,
+)
+
+USER_SCHEMA = {
+    "type": "record",
+    "name": "User",
+    "namespace": "test",
+    "fields": [
+        {"name": "id", "type": "long"},
+        {"name": "name", "type": ["null", "string"], "default": None},
+        {"name": "created_at", "type": {"type": "long", "logicalType": "timestamp-millis"}},
+        {
+            "name": "address",
+            "type": {
+                "type": "record",
+                "name": "Address",
+                "fields": [{"name": "city", "type": "string"}],
+            },
+        },
+        {"name": "previous_address", "type": ["null", "Address"], "default": None},
+        {"name": "tags", "type": {"type": "array", "items": "string"}},
+        {"name": "scores", "type": {"type": "map", "values": "double"}},
+        {"name": "status", "type": {"type": "enum", "name": "Status", "symbols": ["ON", "OFF"]}},
+    ],
+}
+
+
+class FakeRegistry:
+    def __init__(self, schemas, subjects=None):
+        self.schemas = schemas
+        self.subjects = subjects or {}
+        self.requested = []
+
+    def get_schema(self, schema_id, fmt=None):
+        self.requested.append(schema_id)
+        schema = self.schemas[schema_id]
+        schema_str = schema if isinstance(schema, str) else json.dumps(schema)
+        return SimpleNamespace(schema_str=schema_str, references=[])
+
+    def get_latest_version(self, subject):
+        return SimpleNamespace(schema_id=self.subjects[subject])
+
+
+class FakeMessage:
+    def __init__(self, value, offset=0, partition=0):
+        self._value = value
+        self._offset = offset
+        self._partition = partition
+
+    def value(self):
+        return self._value
+
+    def offset(self):
+        return self._offset
+
+    def partition(self):
+        return self._partition
+
+
+def _avro_message(schema, schema_id, record, offset=0):
+    payload = io.BytesIO()
+    payload.write(b"\x00" + schema_id.to_bytes(4, "big"))
+    fastavro.schemaless_writer(payload, fastavro.parse_schema(schema), record)
+    return FakeMessage(payload.getvalue(), offset)
+
+
+def _user(i):
+    return {
+        "id": i,
+        "name": f"user{i}",
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "address": {"city": "Berlin"},
+        "previous_address": None,
+        "tags": ["a"],
+        "scores": {"x": 1.5},
+        "status": "ON",
+    }
+
+
+def test_arrow_schema_follows_avro_types():
+    address = pa.struct([pa.field("city", pa.string())])
+    assert avro_arrow_schema(fastavro.parse_schema(USER_SCHEMA)) == pa.schema(
+        [
+            pa.field("id", pa.int64()),
+            pa.field("name", pa.string()),
+            pa.field("created_at", pa.timestamp("ms", tz="UTC")),
+            pa.field("address", address),
+            pa.field("previous_address", address),
+            pa.field("tags", pa.list_(pa.string())),
+            pa.field("scores", pa.map_(pa.string(), pa.float64())),
+            pa.field("status", pa.string()),
+        ]
+    )
+
+
+def test_arrow_schema_is_none_for_unions_of_several_types():
+    schema = {
+        "type": "record",
+        "name": "Event",
+        "fields": [{"name": "value", "type": ["null", "long", "string"]}],
+    }
+    assert avro_arrow_schema(fastavro.parse_schema(schema)) is None
+
+
+def test_writer_schemas_are_fetched_once_per_id():
+    v2 = dict(USER_SCHEMA, fields=USER_SCHEMA["fields"][:2])
+    registry = FakeRegistry({1: USER_SCHEMA, 2: v2})
+    decoder = AvroDecoder(registry)
+    messages = [
+        _avro_message(USER_SCHEMA, 1, _user(0), offset=0),
+        _avro_message(USER_SCHEMA, 1, _user(1), offset=1),
+        _avro_message(v2, 2, {"id": 2, "name": None}, offset=2),
+        FakeMessage(b"not avro", offset=3),
+    ]
+
+    batches = decoder.decode(messages) + decoder.decode(messages[:1])
+
+    assert [(schema_id, len(values)) for schema_id, values, _ in batches] == [
+        (1, 2),
+        (2, 1),
+        (1, 1),
+    ]
+    assert batches[1][1] == [{"id": 2, "name": None}]
+    assert [message.offset() for message in batches[0][2]] == [0, 1]
+    assert registry.requested == [1, 2]
+
+
+def test_avro_subject_declares_scalar_columns():
+    registry = FakeRegistry({1: USER_SCHEMA}, subjects={"users-value": 1})
+    decoder = AvroDecoder(registry)
+
+    assert decoder.subject_columns("users-value") == {
+        "id": {"data_type": "bigint"},
+        "name": {"data_type": "text"},
+        "created_at": {"data_type": "timestamp", "precision": 3},
+        "status": {"data_type": "text"},
+    }
+    assert decoder.subject_columns("unknown-value") == {}
+
+
+def _user_proto():
+    proto = descriptor_pb2.FileDescriptorProto(
+        name="user.proto",
+        package="test",
+        syntax="proto3",
+        dependency=["google/protobuf/timestamp.proto"],
+    )
+    user = proto.message_type.add(name="User")
+    user.field.add(name="id", number=1, type=3, label=1)
+    user.field.add(name="name", number=2, type=9, label=1, proto3_optional=True, oneof_index=0)
+    user.oneof_decl.add(name="_name")
+    user.field.add(
+        name="created_at", number=3, type=11, label=1, type_name=".google.protobuf.Timestamp"
+    )
+    user.field.add(name="tags", number=4, type=9, label=3)
+    user.field.add(name="status", number=5, type=14, label=1, type_name=".test.User.Status")
+    user.field.add(name="address", number=6, type=11, label=1, type_name=".test.User.Address")
+    status = user.enum_type.add(name="Status")
+    status.value.add(name="ON", number=0)
+    status.value.add(name="OFF", number=1)
+    user.nested_type.add(name="Address").field.add(name="city", number=1, type=9, label=1)
+    return proto
+
+
+USER_PROTO = _user_proto()
+
+
+def _proto_classes():
+    pool = DescriptorPool()
+    pool.AddSerializedFile(timestamp_pb2.DESCRIPTOR.serialized_pb)
+    pool.Add(USER_PROTO)
+    return (
+        GetMessageClass(pool.FindMessageTypeByName("test.User")),
+        GetMessageClass(pool.FindMessageTypeByName("test.User.Address")),
+    )
+
+
+def test_protobuf_messages_are_decoded_by_message_index():
+    user_class, address_class = _proto_classes()
+    registry = FakeRegistry(
+        {3: base64.standard_b64encode(USER_PROTO.SerializeToString()).decode()},
+        subjects={"users-value": 3},
+    )
+    decoder = ProtobufDecoder(registry)
+    user = user_class(id=7, tags=["a", "b"], status=1)
+    user.created_at.FromDatetime(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    user.address.city = "Berlin"
+    header = b"\x00" + (3).to_bytes(4, "big")
+    messages = [
+        # No indexes stand for the first message type of the file
+        FakeMessage(header + b"\x00" + user.SerializeToString(), offset=0),
+        # Two zigzag encoded indexes, 0 and 0, lead to the nested Address
+        FakeMessage(
+            header + b"\x04\x00\x00" + address_class(city="Paris").SerializeToString(), offset=1
+        ),
+    ]
+
+    batches = decoder.decode(messages) + decoder.decode(messages[:1])
+
+    assert [(key, values) for key, values, _ in batches] == [
+        (
+            (3, (0,)),
+            [
+                {
+                    "id": 7,
+                    "name": None,
+                    "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                    "tags": ["a", "b"],
+                    "status": "OFF",
+                    "address": {"city": "Berlin"},
+                }
+            ],
+        ),
+        ((3, (0, 0)), [{"city": "Paris"}]),
+        ((3, (0,)), batches[0][1]),
+    ]
+    assert registry.requested == [3]
+    assert decoder.arrow_schema((3, (0,))) == pa.schema(
+        [
+            pa.field("id", pa.int64()),
+            pa.field("name", pa.string()),
+            pa.field("created_at", pa.timestamp("us", tz="UTC")),
+            pa.field("tags", pa.list_(pa.string())),
+            pa.field("status", pa.string()),
+            pa.field("address", pa.struct([pa.field("city", pa.string())])),
+        ]
+    )
+    assert decoder.subject_columns("users-value") == {
+        "id": {"data_type": "bigint"},
+        "name": {"data_type": "text"},
+        "created_at": {"data_type": "timestamp", "precision": 6},
+        "status": {"data_type": "text"},
+    }
+
+
+def test_protobuf_files_with_several_message_types_declare_no_columns():
+    proto = _user_proto()
+    proto.message_type.add(name="Order").field.add(name="id", number=1, type=3, label=1)
+    registry = FakeRegistry(
+        {4: base64.standard_b64encode(proto.SerializeToString()).decode()},
+        subjects={"users-value": 4},
+    )
+
+    assert ProtobufDecoder(registry).subject_columns("users-value") == {}
+
+
+def test_json_schema_arrow_schema_needs_closed_objects():
+    schema = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer"},
+            "price": {"type": ["number", "null"]},
+            "seen_at": {"type": "string", "format": "date-time"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "owner": {"$ref": "#/definitions/Owner"},
+        },
+        "definitions": {
+            "Owner": {
+                "type": "object",
+                "properties": {"name": {"type": "string"}},
+                "additionalProperties": False,
+            }
+        },
+    }
+    arrow_schema, columns = json_schema_types(schema)
+
+    assert arrow_schema is None
+    assert columns == {
+        "id": {"data_type": "bigint"},
+        "price": {"data_type": "double"},
+        "seen_at": {"data_type": "text"},
+    }
+    arrow_schema, _ = json_schema_types(dict(schema, additionalProperties=False))
+    assert arrow_schema.field("owner").type == pa.struct([pa.field("name", pa.string())])
+    assert arrow_schema.field("tags").type == pa.list_(pa.string())
+
+
+def test_json_schema_dangling_references_only_drop_their_fields():
+    schema = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer"},
+            "owner": {"$ref": "#/definitions/Owner"},
+            "first_tag": {"$ref": "#/properties/tags/items/0"},
+            "tags": {"type": "array", "items": [{"type": "string"}]},
+        },
+        "additionalProperties": False,
+    }
+    arrow_schema, columns = json_schema_types(schema)
+
+    assert arrow_schema is None
+    assert columns == {"id": {"data_type": "bigint"}}
+
+
+def test_json_schema_messages_skip_the_registry_header():
+    registry = FakeRegistry({5: {"type": "object", "properties": {"id": {"type": "integer"}}}})
+    decoder = JsonSchemaDecoder(registry)
+    header = b"\x00" + (5).to_bytes(4, "big")
+    messages = [
+        FakeMessage(header + b'{"id": 1, "extra": "x"}', offset=0),
+        FakeMessage(header + b"[1]", offset=1),
+        FakeMessage(b'{"id": 3}', offset=2),
+    ]
+
+    (batch,) = decoder.decode(messages)
+
+    assert batch[0] == 5
+    assert batch[1] == [{"id": 1, "extra": "x"}]
+    assert registry.requested == [5]
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+from bson.objectid import ObjectId
+from ferry.src.sources.mongodb.helpers import CollectionLoaderParallel
+
+
+class FakeCursor(list):
+    def sort(self, _):
+        return self
+
+    def limit(self, limit):
+        return FakeCursor(self[:limit])
+
+
+class FakeCollection:
+    def __init__(self, count, sample, indexes=None):
+        self.count = count
+        self.sample = sample
+        self.indexes = {"_id_": {"key": [("_id", 1)]}, **(indexes or {})}
+        self.pipelines = []
+        self.queries = []
+
+    def index_information(self):
+        return self.indexes
+
+    def estimated_document_count(self):
+        return self.count
+
+    def count_documents(self, filter):
+        return self.count
+
+    def aggregate(self, pipeline, allowDiskUse=False):
+        self.pipelines.append(pipeline)
+        return [{"bound": value} for value in self.sample]
+
+    def find(self, filter):
+        self.queries.append(filter)
+        return FakeCursor([{"_id": 1}])
+
+
+def test_batches_are_id_ranges_from_a_sample():
+    ids = sorted(ObjectId() for _ in range(40))
+    collection = FakeCollection(count=40, sample=ids)
+    loader = CollectionLoaderParallel(None, collection, chunk_size=10)
+
+    batches = loader._create_batches({})
+
+    assert [batch["filter"] for batch in batches] == [
+        {"_id": {"$not": {"$gte": ids[10]}}},
+        {"_id": {"$gte": ids[10], "$lt": ids[20]}},
+        {"_id": {"$gte": ids[20], "$lt": ids[30]}},
+        {"_id": {"$gte": ids[30]}},
+    ]
+    # Four partitions, sampled without a $match on an empty query
+    assert collection.pipelines[0][0] == {"$sample": {"size": 40}}
+
+
+def test_bounds_keep_the_most_sampled_type_and_skip_duplicates():
+    collection = FakeCollection(count=30, sample=[None, "a", 1, 1, 1, 1, 2.5, 3])
+    loader = CollectionLoaderParallel(None, collection, chunk_size=10)
+
+    assert loader._sample_bounds({}, "_id", 4) == [1, 2.5]
+
+
+def test_small_and_limited_loads_are_single_batches():
+    collection = FakeCollection(count=5, sample=[])
+    loader = CollectionLoaderParallel(None, collection, chunk_size=10)
+
+    assert loader._create_batches({}) == [{"filter": {}}]
+    assert loader._create_batches({}, limit=-3) == [{"filter": {}, "limit": 3}]
+    assert collection.pipelines == []
+
+
+def test_range_filters_are_combined_with_the_query():
+    ids = sorted(ObjectId() for _ in range(20))
+    collection = FakeCollection(count=20, sample=ids)
+    loader = CollectionLoaderParallel(None, collection, chunk_size=10)
+
+    batches = list(loader._get_all_batches({"status": "active"}))
+
+    assert len(batches) == 2
+    assert collection.queries == [
+        {"$and": [{"status": "active"}, {"_id": {"$not": {"$gte": ids[10]}}}]},
+        {"$and": [{"status": "active"}, {"_id": {"$gte": ids[10]}}]},
+    ]
+    assert collection.pipelines[0][0] == {"$match": {"status": "active"}}
+
+
+def _incremental(cursor_path, last_value):
+    return SimpleNamespace(
+        cursor_path=cursor_path,
+        last_value=last_value,
+        last_value_func=max,
+        end_value=None,
+        row_order=None,
+    )
+
+
+def test_incremental_loads_split_on_id_unless_the_cursor_field_leads_an_index():
+    ids = sorted(ObjectId() for _ in range(20))
+    collection = FakeCollection(count=20, sample=ids)
+    loader = CollectionLoaderParallel(
+        None, collection, chunk_size=10, incremental=_incremental("updated_at", 5)
+    )
+
+    list(loader._get_all_batches({}))
+
+    assert collection.queries[1] == {
+        "$and": [{"updated_at": {"$gte": 5}}, {"_id": {"$gte": ids[10]}}]
+    }
+
+    collection.indexes["updated_at_1_status_1"] = {"key": [("updated_at", 1), ("status", 1)]}
+    assert loader._partition_field == "updated_at"
@@ -0,0 +1,79 @@
+import sqlite3
+from unittest import mock
+import pytest
+from sqlalchemy import create_engine
+from ferry.src.sources import reflection_cache
+from ferry.src.sources.reflection_cache import ReflectionCache, reflect_tables
+from dlt.common.libs.sql_alchemy import MetaData
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "source.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path, db_path):
+    return ReflectionCache(str(tmp_path / "cache"), f"sqlite:///{db_path}")
+
+
+def _reflect(cache, db_path, table_names):
+    engine = create_engine(f"sqlite:///{db_path}")
+    with mock.patch.object(
+        reflection_cache, "reflect_tables", wraps=reflect_tables
+    ) as reflect_mock:
+        metadata = cache.reflect(engine, table_names)
+    return metadata, reflect_mock
+
+
+def test_second_reflection_uses_cache(cache, db_path):
+    metadata, reflect_mock = _reflect(cache, db_path, ["users", "orders"])
+    assert set(metadata.tables) == {"users", "orders"}
+    reflect_mock.assert_called_once()
+
+    metadata, reflect_mock = _reflect(cache, db_path, ["users", "orders"])
+    assert set(metadata.tables) == {"users", "orders"}
+    assert [c.name for c in metadata.tables["users"].columns] == ["id", "name"]
+    assert metadata.tables["users"].primary_key.columns.keys() == ["id"]
+    reflect_mock.assert_not_called()
+
+
+def test_changed_table_is_reflected_again(cache, db_path):
+    _reflect(cache, db_path, ["users", "orders"])
+    conn = sqlite3.connect(db_path)
+    conn.execute("ALTER TABLE users ADD COLUMN email TEXT")
+    conn.commit()
+    conn.close()
+
+    metadata, reflect_mock = _reflect(cache, db_path, ["users", "orders"])
+    assert "email" in metadata.tables["users"].columns
+    reflect_mock.assert_called_once()
+    assert reflect_mock.call_args.args[2] == ["users"]
+
+
+def test_cache_is_keyed_by_uri(tmp_path, cache, db_path):
+    _reflect(cache, db_path, ["users"])
+    other = ReflectionCache(cache.cache_dir, f"sqlite:///{db_path}?mode=ro")
+    _, reflect_mock = _reflect(other, db_path, ["users"])
+    reflect_mock.assert_called_once()
+
+
+def test_unreadable_entry_is_ignored(cache, db_path):
+    _reflect(cache, db_path, ["users"])
+    with open(cache._path("users"), "wb") as f:
+        f.write(b"not a pickle")
+    metadata, reflect_mock = _reflect(cache, db_path, ["users"])
+    assert "users" in metadata.tables
+    reflect_mock.assert_called_once()
+
+
+def test_reflect_schema_qualified_tables(db_path):
+    metadata = MetaData()
+    reflect_tables(create_engine(f"sqlite:///{db_path}"), metadata, ["main.users", "orders"])
+    assert set(metadata.tables) == {"main.users", "orders"}
@@ -0,0 +1,50 @@
+import pandas as pd
+import pyarrow as pa
+from ferry.src.data_models.ingest_model import ResourceConfig
+from ferry.src.sources.source_base import SourceBase
+
+
+class ItemsSource(SourceBase):
+    def dlt_source_system(self, uri, resources, identity):
+        raise NotImplementedError
+
+
+COLUMN_RULES = {"exclude_columns": ["name"], "pseudonymizing_columns": ["email"]}
+ROWS = [{"id": i, "name": f"user{i}", "email": f"user{i}@example.com"} for i in range(3)]
+
+
+def _process(item):
+    resource_config = ResourceConfig(source_table_name="users", column_rules=COLUMN_RULES)
+    return list(ItemsSource()._create_dlt_resource(resource_config, iter([item])))
+
+
+def test_column_rules_on_arrow_tables():
+    rows = _process([dict(row) for row in ROWS])
+    (table,) = _process(pa.Table.from_pylist(ROWS))
+
+    assert table.column_names == ["id", "email"]
+    assert table.schema.field("email").type == pa.string()
+    assert table.to_pylist() == rows
+
+
+def test_column_rules_on_data_frames():
+    df = pd.DataFrame(ROWS)
+
+    (processed,) = _process(df)
+
+    assert list(processed.columns) == ["id", "email"]
+    assert processed["email"].str.len().eq(64).all()
+    assert processed["email"].nunique() == 3
+    # The source's frame is left as it was
+    assert df.equals(pd.DataFrame(ROWS))
+
+
+def test_data_frames_are_copied_when_no_column_is_excluded():
+    df = pd.DataFrame(ROWS)
+    rules = {"pseudonymizing_columns": ["email"]}
+    resource_config = ResourceConfig(source_table_name="users", column_rules=rules)
+
+    (processed,) = ItemsSource()._create_dlt_resource(resource_config, iter([df]))
+
+    assert processed["email"].str.len().eq(64).all()
+    assert df["email"].tolist() == [row["email"] for row in ROWS]
@@ -0,0 +1,109 @@
+import sqlite3
+import subprocess
+import sys
+import duckdb
+import pytest
+from ferry.src.benchmark import (
+    BENCHMARK_TABLE,
+    compare_to_baseline,
+    create_dataset,
+    load_baseline,
+    run_benchmarks,
+    store_baseline,
+)
+from ferry.src.data_models.benchmark_model import BenchmarkResult
+
+
+def _result(pair="sqlite-duckdb", rows_per_second=1000.0, rows=100):
+    return BenchmarkResult(
+        pair=pair,
+        rows=rows,
+        columns=3,
+        seconds=1.0,
+        rows_per_second=rows_per_second,
+        mb_per_second=1.0,
+    )
+
+
+def test_create_sqlite_dataset(tmp_path):
+    path = str(tmp_path / "source.db")
+    create_dataset("sqlite", path, 250, 4)
+
+    with sqlite3.connect(path) as conn:
+        cursor = conn.execute(f"SELECT * FROM {BENCHMARK_TABLE} ORDER BY id")
+        columns = [c[0] for c in cursor.description]
+        rows = cursor.fetchall()
+    assert columns == ["id", "col_0", "col_1", "col_2", "col_3"]
+    assert len(rows) == 250
+    assert rows[2] == (2, 2, 1.0, "value_2", 8)
+
+
+def test_create_duckdb_dataset(tmp_path):
+    path = str(tmp_path / "source.duckdb")
+    create_dataset("duckdb", path, 250, 3)
+
+    with duckdb.connect(path) as conn:
+        assert conn.execute(f"SELECT count(*) FROM {BENCHMARK_TABLE}").fetchone() == (250,)
+        assert conn.execute(f"SELECT * FROM {BENCHMARK_TABLE} WHERE id = 2").fetchone() == (
+            2,
+            2,
+            1.0,
+            "value_2",
+        )
+
+
+def test_run_benchmarks_rejects_unknown_pairs():
+    with pytest.raises(ValueError, match="Unknown benchmark pairs: mysql-duckdb"):
+        run_benchmarks(["mysql-duckdb"], 10, 1)
+
+
+def test_run_benchmarks(tmp_path):
+    results = run_benchmarks(["sqlite-duckdb"], 500, 3, work_dir=str(tmp_path))
+
+    assert len(results) == 1
+    result = results[0]
+    assert (result.pair, result.rows, result.columns) == ("sqlite-duckdb", 500, 3)
+    assert result.rows_per_second > 0
+    assert result.mb_per_second > 0
+    assert set(result.steps) == {"extract", "normalize", "load"}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_compare_to_baseline():
+    baseline = [_result("sqlite-duckdb", 1000.0), _result("duckdb-duckdb", 1000.0)]
+    results = [
+        _result("sqlite-duckdb", 850.0),
+        _result("duckdb-duckdb", 950.0),
+        _result("sqlite-sqlite", 500.0),
+    ]
+
+    comparisons = compare_to_baseline(results, baseline, tolerance=10)
+
+    assert [(c.change_percent, c.regressed) for c in comparisons] == [
+        (-15.0, True),
+        (-5.0, False),
+        (None, False),
+    ]
+
+
+def test_compare_to_baseline_matches_size():
+    comparisons = compare_to_baseline([_result(rows=200)], [_result(rows=100)], tolerance=10)
+
+    assert comparisons[0].baseline is None
+
+
+def test_store_baseline_replaces_same_cases(tmp_path):
+    path = str(tmp_path / "benchmarks" / "baseline.json")
+    store_baseline([_result("sqlite-duckdb", 1000.0), _result("duckdb-duckdb", 1000.0)], path)
+    store_baseline([_result("sqlite-duckdb", 2000.0)], path)
+
+    stored = {result.pair: result.rows_per_second for result in load_baseline(path)}
+    assert stored == {"sqlite-duckdb": 2000.0, "duckdb-duckdb": 1000.0}
+
+
+def test_cli_does_not_import_the_benchmark_runner():
+    code = "import sys, ferry.main; print('ferry.src.benchmark' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,104 @@
+import time
+from ferry.src.connection_pool import ConnectionLeases, ConnectionPool
+
+
+class Resource:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _acquire(pool, key="postgresql://host/db", shared=True):
+    return pool.acquire(key, Resource, close=Resource.close, shared=shared)
+
+
+def test_shared_entries_are_reused():
+    pool = ConnectionPool(ttl_seconds=60, max_size=4)
+    first = _acquire(pool)
+    assert _acquire(pool) is first
+    assert _acquire(pool, key="postgresql://other/db") is not first
+    assert (pool.hits, pool.misses) == (1, 2)
+
+
+def test_exclusive_entries_are_leased_one_at_a_time():
+    pool = ConnectionPool(ttl_seconds=60, max_size=4)
+    first = _acquire(pool, shared=False)
+    second = _acquire(pool, shared=False)
+    assert second is not first
+
+    pool.release(first)
+    assert _acquire(pool, shared=False) is first
+    assert pool.size == 2
+
+
+def test_idle_entries_expire_after_ttl():
+    pool = ConnectionPool(ttl_seconds=0.01, max_size=4)
+    resource = _acquire(pool)
+    pool.release(resource)
+    assert not resource.closed
+
+    time.sleep(0.02)
+    pool.prune()
+    assert resource.closed
+    assert pool.size == 0
+
+
+def test_least_recently_used_idle_entries_are_closed_beyond_max_size():
+    pool = ConnectionPool(ttl_seconds=60, max_size=1)
+    older, newer = _acquire(pool, key="a"), _acquire(pool, key="b")
+    pool.release(older)
+    pool.release(newer)
+
+    assert older.closed
+    assert not newer.closed
+    assert pool.size == 1
+
+
+def test_entries_in_use_are_not_expired():
+    pool = ConnectionPool(ttl_seconds=0, max_size=0)
+    resource = _acquire(pool)
+    _acquire(pool)
+    pool.release(resource)
+    pool.prune()
+    assert not resource.closed
+
+    pool.release(resource)
+    assert resource.closed
+
+
+def test_close_waits_for_leased_entries():
+    pool = ConnectionPool(ttl_seconds=60, max_size=4)
+    idle, leased = _acquire(pool, key="a"), _acquire(pool, key="b")
+    pool.release(idle)
+    pool.close()
+    assert idle.closed
+    assert not leased.closed
+
+    pool.release(leased)
+    assert leased.closed
+    assert pool.size == 0
+
+
+def test_leases_return_connections_to_the_pool():
+    pool = ConnectionPool(ttl_seconds=60, max_size=4)
+    leases = ConnectionLeases(pool)
+    resource = leases.acquire("a", Resource, close=Resource.close)
+    leases.release_all()
+
+    assert not resource.closed
+    assert pool.idle == 1
+    assert ConnectionLeases(pool).acquire("a", Resource) is resource
+
+
+def test_leases_without_pool_close_connections():
+    leases = ConnectionLeases()
+    early, late = Resource(), Resource()
+    leases.acquire("a", lambda: early, close=Resource.close)
+    leases.acquire("b", lambda: late, close=Resource.close)
+
+    leases.release(early)
+    assert early.closed and not late.closed
+    leases.release_all()
+    assert late.closed
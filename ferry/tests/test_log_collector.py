@@ -2,12 +2,20 @@ import os
 import json
 import tempfile
 import shutil
+import dlt
 import pytest
+from dlt.pipeline import trace
 from unittest import mock
-from ferry.src.log_collector import FerryLogCollector
+from ferry.src.log_collector import FerryLogCollector, read_last_log
 import sys
 
 
+@pytest.fixture(autouse=True)
+def work_dir(tmp_path, monkeypatch):
+    """Collectors write logs/<identity>.jsonl under the working directory"""
+    monkeypatch.chdir(tmp_path)
+
+
 @pytest.fixture
 def temp_log_dir():
     temp_dir = tempfile.mkdtemp()
@@ -31,10 +39,9 @@ def test_log_file_written_and_locked(temp_log_dir):
     collector._log({"test": "value"})
 
     assert os.path.exists(collector.log_file)
-    with open(collector.log_file) as f:
-        log_data = json.load(f)
-        assert log_data["test"] == "value"
-        assert "timestamp" in log_data
+    log_data = read_last_log(collector.log_file)
+    assert log_data["test"] == "value"
+    assert "timestamp" in log_data
 
 
 def test_update_counter_and_step_tracking(monkeypatch):
@@ -68,13 +75,13 @@ def test_dump_counters_extract_normalize_load(monkeypatch):
     collector.update("Items", inc=5)
     collector.step = "load"
     collector.update("Jobs", inc=3)
+    collector.dump_counters()
 
     # Assert data logged correctly
-    with open(collector.log_file) as f:
-        data = json.load(f)
-        assert data["extract"]["status"] == "completed"
-        assert data["normalize"]["status"] == "completed"
-        assert data["load"]["status"] == "completed"
+    data = read_last_log(collector.log_file)
+    assert data["extract"]["status"] == "completed"
+    assert data["normalize"]["status"] == "completed"
+    assert data["load"]["status"] == "completed"
 
 
 def test_log_skips_resources():
@@ -115,8 +122,8 @@ def test_log_file_locking(temp_log_dir):
     collector._log({"second": "entry"})
 
     with open(collector.log_file) as f:
-        data = json.load(f)
-        assert "second" in data or "first" in data
+        assert [json.loads(line) for line in f][-2]["first"] == "entry"
+    assert read_last_log(collector.log_file)["second"] == "entry"
 
 
 def test_files_normalized_truncation(monkeypatch):
@@ -125,7 +132,94 @@ def test_files_normalized_truncation(monkeypatch):
     collector.files_normalized = {"f1.csv", "f2.csv", "f3.csv"}
     collector.update("Files", inc=1, label="f4.csv")
 
+    data = read_last_log(collector.log_file)
+    normalized_files = data["normalize"].get("files_normalized", [])
+    assert isinstance(normalized_files, list)
+
+
+def test_updates_are_flushed_once_per_log_period(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ferry.src.log_collector.time.time", lambda: now[0])
+    collector = FerryLogCollector("test_log_period", log_period=1.0)
+    collector("Extract orders")._start("Extract orders")
+    with mock.patch.object(collector, "_log") as log:
+        collector.update("orders", inc=10)
+        collector.update("orders", inc=5)
+        log.assert_not_called()
+
+        now[0] += 1.0
+        collector.update("orders", inc=5)
+        assert log.call_count == 1
+        assert log.call_args[0][0]["extract"]["records_extracted"] == 20
+
+        collector._stop()
+        assert log.call_count == 2
+
+
+def test_log_is_truncated_by_new_run():
+    FerryLogCollector("test_truncate")._log({"run": 1})
+    collector = FerryLogCollector("test_truncate")
+    collector._log({"run": 2})
+    collector._log({"run": 2, "last": True})
+
+    with open(collector.log_file) as f:
+        assert [json.loads(line)["run"] for line in f] == [2, 2]
+
+
+def test_read_last_log_skips_partial_line(tmp_path):
+    log_file = tmp_path / "partial.jsonl"
+    log_file.write_text('{"complete":true}\n{"partial":')
+    assert read_last_log(str(log_file)) == {"complete": True}
+
+
+def test_progress_listener_receives_extract_rows(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ferry.src.log_collector.time.time", lambda: now[0])
+    events = []
+    collector = FerryLogCollector("test_progress", progress_listener=events.append)
+    collector("Extract orders")._start("Extract orders")
+    now[0] += 1.0
+    collector.update("orders", inc=10)
+    collector.update("orders", inc=5)
+
+    # Progress is reported with the snapshots, a second update within log_period is not
+    assert len(events) == 1
+    assert events[0].step == "extract"
+    assert events[0].tables[0].table_name == "orders"
+    assert events[0].tables[0].rows == 10
+    assert events[0].tables[0].rows_per_second == 10.0
+
+    now[0] += 1.0
+    collector.update("customers", inc=2)
+    assert {t.table_name: t.rows for t in events[1].tables} == {"orders": 15, "customers": 2}
+
+
+def test_snapshots_are_published_to_registry():
+    registry = mock.Mock()
+    collector = FerryLogCollector("test_registry", metrics_registry=registry)
+    collector("Extract orders")._start("Extract orders")
+    collector.update("orders", inc=10)
+    collector._stop()
+
+    registry.publish_live.assert_called_with("test_registry", "extract", {"orders": 10})
+
+
+def test_log_holds_only_the_latest_run_of_a_reused_collector(tmp_path, monkeypatch):
+    monkeypatch.setenv("DLT_DATA_DIR", str(tmp_path / "dlt"))
+    # Keeps dlt telemetry out of the runs
+    monkeypatch.setattr(trace, "TRACKING_MODULES", [])
+    collector = FerryLogCollector("test_reused", dump_system_stats=False)
+    pipeline = dlt.pipeline(
+        pipeline_name="test_reused",
+        destination=dlt.destinations.duckdb(str(tmp_path / "reused.duckdb")),
+        progress=collector,
+    )
+    pipeline.run([{"id": 1}], table_name="orders")
+    collector._log({"run": 1})
+
+    pipeline.run([{"id": 2}], table_name="orders")
+
     with open(collector.log_file) as f:
-        data = json.load(f)
-        normalized_files = data["normalize"].get("files_normalized", [])
-        assert isinstance(normalized_files, list)
+        lines = [json.loads(line) for line in f]
+    assert lines and all("run" not in line for line in lines)
+    assert any("extract" in line for line in lines)
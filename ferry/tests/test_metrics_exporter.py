@@ -0,0 +1,92 @@
+import urllib.request
+import dlt
+import pytest
+from unittest import mock
+from dlt.pipeline import trace
+from ferry.src.metrics_exporter import PrometheusExporter, start_metrics_server
+
+
+@pytest.fixture(autouse=True)
+def dlt_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DLT_DATA_DIR", str(tmp_path))
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Runs pipelines with only the exporter, keeping dlt telemetry out of the tests"""
+    exporter = PrometheusExporter()
+    monkeypatch.setattr(trace, "TRACKING_MODULES", [exporter])
+    return exporter
+
+
+def _run_pipeline(tmp_path, name, rows=3):
+    pipeline = dlt.pipeline(
+        pipeline_name=name,
+        destination=dlt.destinations.duckdb(str(tmp_path / f"{name}.duckdb")),
+    )
+    pipeline.run([{"id": i} for i in range(rows)], table_name="orders")
+
+
+def _samples(text):
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if not line.startswith("#")
+    }
+
+
+def test_counts_rows_bytes_and_runs(tmp_path, exporter):
+    _run_pipeline(tmp_path, "exported_pipeline")
+    _run_pipeline(tmp_path, "exported_pipeline")
+
+    samples = _samples(exporter.render())
+    labels = 'pipeline="exported_pipeline",step="{}",table="orders"'
+    for step in ("extract", "normalize", "load"):
+        assert samples[f"ferry_rows_total{{{labels.format(step)}}}"] == 6
+        assert samples[f"ferry_bytes_total{{{labels.format(step)}}}"] > 0
+    assert samples['ferry_runs_total{pipeline="exported_pipeline",status="completed"}'] == 2
+    assert samples['ferry_files_total{pipeline="exported_pipeline",table="orders"}'] == 2
+    assert (
+        samples[
+            'ferry_load_job_duration_seconds_count{pipeline="exported_pipeline",table="orders"}'
+        ]
+        == 2
+    )
+    assert 'ferry_step_duration_seconds{pipeline="exported_pipeline",step="load"}' in samples
+    assert 'ferry_last_run_timestamp_seconds{pipeline="exported_pipeline"}' in samples
+
+
+def test_render_declares_every_metric(exporter):
+    text = exporter.render()
+    assert "# TYPE ferry_rows_total counter" in text
+    assert "# TYPE ferry_load_job_duration_seconds summary" in text
+    assert "# TYPE ferry_rows_in_progress gauge" in text
+
+
+def test_rows_in_progress_from_registry(exporter):
+    registry = mock.Mock()
+    registry.pipelines.return_value = ["live"]
+    registry.get.return_value = {
+        "metrics": {
+            "extract": {
+                "status": "processing",
+                "resource_metrics": [{"name": 'or"ders', "row_count": 7}],
+            },
+            "load": {"status": "pending", "resource_metrics": []},
+        }
+    }
+    with mock.patch("ferry.src.metrics_exporter.get_metrics_registry", return_value=registry):
+        samples = _samples(exporter.render())
+
+    assert samples['ferry_rows_in_progress{pipeline="live",step="extract",table="or\\"ders"}'] == 7
+
+
+def test_metrics_server():
+    server = start_metrics_server(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "# TYPE ferry_rows_total counter" in response.read().decode()
+    finally:
+        server.shutdown()
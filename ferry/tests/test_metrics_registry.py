@@ -0,0 +1,81 @@
+import dlt
+import pytest
+from unittest import mock
+from dlt.pipeline import trace
+from ferry.src.metrics_registry import MetricsRegistry, get_pipeline_metrics
+
+
+@pytest.fixture(autouse=True)
+def dlt_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DLT_DATA_DIR", str(tmp_path))
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Runs pipelines with only the registry, keeping dlt telemetry out of the tests"""
+    registry = MetricsRegistry()
+    monkeypatch.setattr(trace, "TRACKING_MODULES", [registry])
+    return registry
+
+
+def _run_pipeline(tmp_path, name, data):
+    pipeline = dlt.pipeline(
+        pipeline_name=name,
+        destination=dlt.destinations.duckdb(str(tmp_path / f"{name}.duckdb")),
+    )
+    pipeline.run(data, table_name="orders")
+
+
+def test_metrics_of_completed_run(tmp_path, registry):
+    _run_pipeline(tmp_path, "registry_pipeline", [{"id": i} for i in range(3)])
+
+    metrics = registry.get("registry_pipeline")
+    assert metrics["status"] == "completed"
+    assert metrics["destination_type"] == "duckdb"
+    for step in ("extract", "normalize", "load"):
+        assert metrics["metrics"][step]["status"] == "completed"
+    normalized = metrics["metrics"]["normalize"]["resource_metrics"][0]
+    assert (normalized["name"], normalized["row_count"]) == ("orders", 3)
+
+
+def test_metrics_while_running(tmp_path, registry):
+    seen = {}
+
+    def orders():
+        yield {"id": 1}
+        registry.publish_live("live_pipeline", "extract", {"orders": 1})
+        seen.update(registry.get("live_pipeline"))
+        yield {"id": 2}
+
+    _run_pipeline(tmp_path, "live_pipeline", orders())
+
+    assert seen["status"] == "processing"
+    assert seen["metrics"]["extract"]["status"] == "processing"
+    assert seen["metrics"]["extract"]["resource_metrics"] == [{"name": "orders", "row_count": 1}]
+    assert seen["metrics"]["load"]["status"] == "pending"
+
+
+def test_publish_live_ignores_steps_not_running(registry):
+    registry.publish_live("unknown_pipeline", "extract", {"orders": 1})
+    assert registry.get("unknown_pipeline") is None
+
+
+def test_get_returns_copy(tmp_path, registry):
+    _run_pipeline(tmp_path, "copy_pipeline", [{"id": 1}])
+    registry.get("copy_pipeline")["status"] = "changed"
+    assert registry.get("copy_pipeline")["status"] == "completed"
+
+
+def test_get_pipeline_metrics_falls_back_to_disk():
+    with (
+        mock.patch("ferry.src.metrics_registry.get_metrics_registry") as get_registry,
+        mock.patch("ferry.src.metrics_registry.PipelineMetrics") as pipeline_metrics,
+    ):
+        get_registry.return_value.get.return_value = None
+        pipeline_metrics.return_value.generate_metrics.return_value = {"status": "completed"}
+        assert get_pipeline_metrics("disk_pipeline") == {"status": "completed"}
+        pipeline_metrics.assert_called_once_with(name="disk_pipeline")
+
+        get_registry.return_value.get.return_value = {"status": "processing"}
+        assert get_pipeline_metrics("disk_pipeline") == {"status": "processing"}
+        pipeline_metrics.assert_called_once()
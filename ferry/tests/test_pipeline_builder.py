@@ -1,7 +1,9 @@
+import os
 import pytest
 from unittest.mock import patch, MagicMock, call, ANY
 from dlt.common.pipeline import LoadInfo
-from ferry.src.data_models.ingest_model import IngestModel
+from ferry.src.data_models.ingest_model import IngestModel, RunMode
+from ferry.src.data_models.performance_config_model import PerformanceConfig
 from ferry.src.pipeline_builder import PipelineBuilder
 
 @pytest.fixture
@@ -109,3 +111,53 @@ def test_run_pipeline_multiple_sources(mock_dlt_pipeline, ingest_data_multiple_s
 
     
     mock_pipeline.run.assert_called_once()
+
+
+@patch('dlt.pipeline')
+def test_run_pipeline_shared_source(mock_dlt_pipeline, ingest_data_multiple_sources):
+    """Test if run() builds a single source holding all resources by default"""
+    mock_pipeline = MagicMock()
+    mock_dlt_pipeline.return_value = mock_pipeline
+
+    builder = PipelineBuilder(ingest_data_multiple_sources)
+    builder.pipeline = mock_pipeline
+    builder.source.dlt_source_system = MagicMock(return_value="mock_source")
+
+    builder.run()
+
+    builder.source.dlt_source_system.assert_called_once_with(
+        uri=ingest_data_multiple_sources.source_uri,
+        resources=ingest_data_multiple_sources.resources,
+        identity=ingest_data_multiple_sources.identity
+    )
+    mock_pipeline.run.assert_called_once_with(data=["mock_source"])
+
+
+@patch('dlt.pipeline')
+def test_run_pipeline_per_resource(mock_dlt_pipeline, ingest_data_multiple_sources):
+    """Test if run() builds one source per resource in per_resource mode"""
+    mock_pipeline = MagicMock()
+    mock_dlt_pipeline.return_value = mock_pipeline
+
+    ingest_data_multiple_sources.run_mode = RunMode.PER_RESOURCE
+    builder = PipelineBuilder(ingest_data_multiple_sources)
+    builder.pipeline = mock_pipeline
+    builder.source.dlt_source_system = MagicMock(side_effect=lambda **kwargs: kwargs['resources'][0])
+
+    builder.run()
+
+    assert builder.source.dlt_source_system.call_count == 3
+    mock_pipeline.run.assert_called_once_with(data=ingest_data_multiple_sources.resources)
+
+
+@patch('dlt.pipeline')
+def test_build_applies_performance_config(mock_dlt_pipeline, ingest_data, monkeypatch):
+    """Test if build() scopes performance settings to the pipeline and clears unset ones"""
+    monkeypatch.setenv("TEST_PIPELINE__NORMALIZE__WORKERS", "8")
+    ingest_data.performance = PerformanceConfig(load_workers=16)
+
+    PipelineBuilder(ingest_data).build()
+
+    assert os.environ["TEST_PIPELINE__LOAD__WORKERS"] == "16"
+    assert "TEST_PIPELINE__NORMALIZE__WORKERS" not in os.environ
+    monkeypatch.delenv("TEST_PIPELINE__LOAD__WORKERS")
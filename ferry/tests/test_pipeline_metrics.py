@@ -1,4 +1,3 @@
-import json
 from unittest import mock
 from ferry.src.pipeline_metrics import PipelineMetrics
 
@@ -30,10 +29,7 @@ def test_load_live_metrics_from_log_success():
     }
 
     with (
-        mock.patch(
-            "ferry.src.pipeline_metrics.open", mock.mock_open(read_data=json.dumps(log_content))
-        ),
-        mock.patch("ferry.src.pipeline_metrics.json.load", return_value=log_content),
+        mock.patch("ferry.src.pipeline_metrics.read_last_log", return_value=log_content),
         mock.patch("ferry.src.pipeline_metrics.dlt.pipeline") as mock_pipeline,
     ):
         mock_pipeline.return_value.last_trace = None
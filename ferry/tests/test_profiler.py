@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import pytest
+from dlt.pipeline import trace
+from ferry.src.data_models.ingest_model import IngestModel
+from ferry.src.data_models.profile_config_model import ProfileConfig, Profiler
+from ferry.src.data_models.progress_model import ProgressEvent
+from ferry.src.data_models.response_models import JobStatus
+from ferry.src.pipeline_builder import PipelineBuilder
+from ferry.src.profiler import RunProfiler
+from ferry.src.progress_tracker import get_progress_tracker
+
+
+@pytest.fixture(autouse=True)
+def dlt_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DLT_DATA_DIR", str(tmp_path / "dlt"))
+    # The runs' collector logs are written under the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    """Runs pipelines with only the progress tracker, keeping dlt telemetry out of the tests"""
+    tracker = get_progress_tracker()
+    monkeypatch.setattr(trace, "TRACKING_MODULES", [tracker])
+    return tracker
+
+
+def _consume(profiler, items):
+    reads = profiler.track_reads("orders", items)
+    return list(profiler.track_resource("orders", (item for item in reads)))
+
+
+def test_tracks_items_and_rows_per_resource():
+    profiler = RunProfiler("orders_pipeline")
+
+    items = _consume(profiler, [{"id": 1}, [{"id": 2}, {"id": 3}], {"id": 4}])
+
+    assert len(items) == 3
+    resource = profiler.report().resources["orders"]
+    assert (resource.items, resource.rows) == (3, 4)
+    assert resource.read_wall_seconds >= 0
+    assert resource.transform_wall_seconds >= 0
+
+
+def test_closes_source_iterator():
+    closed = []
+
+    def rows():
+        try:
+            yield {"id": 1}
+            yield {"id": 2}
+        finally:
+            closed.append(True)
+
+    profiler = RunProfiler("orders_pipeline")
+    items = profiler.track_resource("orders", iter(profiler.track_reads("orders", rows())))
+    next(items)
+    items.close()
+
+    assert closed == [True]
+
+
+def test_times_steps_from_progress_events():
+    profiler = RunProfiler("orders_pipeline")
+
+    profiler.on_progress(ProgressEvent(identity="p", step="extract", status=JobStatus.RUNNING))
+    profiler.on_progress(ProgressEvent(identity="p", step="extract", status=JobStatus.RUNNING))
+    profiler.on_progress(ProgressEvent(identity="p", step="extract", status=JobStatus.COMPLETED))
+    profiler.on_progress(ProgressEvent(identity="p", status=JobStatus.COMPLETED))
+
+    assert list(profiler.report().steps) == ["extract"]
+
+
+def test_writes_cprofile_output(tmp_path):
+    profiler = RunProfiler("orders_pipeline", Profiler.CPROFILE)
+    _consume(profiler, [{"id": i} for i in range(10)])
+
+    path = profiler.write_report(str(tmp_path / "profile"))
+
+    with open(path) as f:
+        report = json.load(f)
+    assert report["profiler"] == "cprofile"
+    assert report["profile_files"] == ["resources.prof", "resources.txt"]
+    assert os.path.exists(tmp_path / "profile" / "resources.prof")
+    with open(tmp_path / "profile" / "resources.txt") as f:
+        assert "track_reads" in f.read()
+
+
+def test_writes_report_without_profiled_items(tmp_path):
+    profiler = RunProfiler("orders_pipeline", Profiler.CPROFILE)
+
+    path = profiler.write_report(str(tmp_path / "profile"))
+
+    assert os.listdir(tmp_path / "profile") == ["report.json"]
+    with open(path) as f:
+        assert json.load(f)["profile_files"] == []
+
+
+def test_profiled_pipeline_run(tmp_path, tracker):
+    source = tmp_path / "source.db"
+    with sqlite3.connect(source) as conn:
+        conn.execute("CREATE TABLE orders (id INTEGER, email TEXT)")
+        conn.executemany("INSERT INTO orders VALUES (?, ?)", [(i, f"{i}@x.io") for i in range(50)])
+    conn.close()
+    model = IngestModel(
+        identity="profiled_pipeline",
+        source_uri=f"sqlite:///{source}",
+        destination_uri=f"duckdb:///{tmp_path / 'destination.duckdb'}",
+        resources=[
+            {
+                "source_table_name": "orders",
+                "column_rules": {"pseudonymizing_columns": ["email"]},
+            }
+        ],
+        profile=ProfileConfig(profiler=Profiler.CPROFILE),
+    )
+
+    builder = PipelineBuilder(model).build()
+    builder.run()
+
+    assert builder.profile_report_path == os.path.join(
+        builder.pipeline.working_dir, "profile", "report.json"
+    )
+    with open(builder.profile_report_path) as f:
+        report = json.load(f)
+    assert set(report["steps"]) == {"extract", "normalize", "load"}
+    assert report["resources"]["orders"]["rows"] == 50
+    assert report["profile_files"] == ["resources.prof", "resources.txt"]
+
+
+def test_pyinstrument_must_be_installed(monkeypatch):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+
+    with pytest.raises(ValueError, match="pyinstrument is not installed"):
+        ProfileConfig(profiler=Profiler.PYINSTRUMENT)
@@ -0,0 +1,66 @@
+import dlt
+import pytest
+from dlt.pipeline import trace
+from ferry.src.data_models.response_models import JobStatus
+from ferry.src.progress_tracker import ProgressTracker, get_progress_tracker
+
+
+@pytest.fixture(autouse=True)
+def dlt_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DLT_DATA_DIR", str(tmp_path))
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    """Runs pipelines with only the progress tracker, keeping dlt telemetry out of the tests"""
+    tracker = get_progress_tracker()
+    monkeypatch.setattr(trace, "TRACKING_MODULES", [tracker])
+    return tracker
+
+
+def _run_pipeline(tmp_path, name, rows=3):
+    pipeline = dlt.pipeline(
+        pipeline_name=name,
+        destination=dlt.destinations.duckdb(str(tmp_path / f"{name}.duckdb")),
+    )
+    pipeline.run([{"id": i} for i in range(rows)], table_name="orders")
+
+
+def test_reports_steps_of_subscribed_pipeline(tmp_path, tracker):
+    events = []
+    tracker.subscribe("progress_pipeline", events.append)
+    try:
+        _run_pipeline(tmp_path, "progress_pipeline")
+    finally:
+        tracker.unsubscribe("progress_pipeline")
+
+    assert [(e.step, e.status) for e in events] == [
+        ("extract", JobStatus.RUNNING),
+        ("extract", JobStatus.COMPLETED),
+        ("normalize", JobStatus.RUNNING),
+        ("normalize", JobStatus.COMPLETED),
+        ("load", JobStatus.RUNNING),
+        ("load", JobStatus.COMPLETED),
+    ]
+    for event in events[1::2]:
+        assert [t.table_name for t in event.tables] == ["orders"]
+        assert event.tables[0].rows == 3
+        assert event.tables[0].bytes > 0
+
+
+def test_ignores_pipelines_without_subscription(tmp_path, tracker):
+    events = []
+    tracker.subscribe("other_pipeline", events.append)
+    try:
+        _run_pipeline(tmp_path, "unsubscribed_pipeline")
+    finally:
+        tracker.unsubscribe("other_pipeline")
+
+    assert events == []
+
+
+def test_tracker_is_registered_once():
+    tracker = get_progress_tracker()
+    assert get_progress_tracker() is tracker
+    assert trace.TRACKING_MODULES.count(tracker) == 1
+    assert isinstance(tracker, ProgressTracker)